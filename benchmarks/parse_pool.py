@@ -0,0 +1,110 @@
+"""
+Benchmark in-loop parsing against parsing in a process pool of ScrapeSession workers.
+While pages are parsed, a heartbeat task measures how long the event loop is stalled,
+which is the time network I/O of other locations could not make progress.
+
+Usage:
+    python benchmarks/parse_pool.py --pages "data/pages/*.html" --workers 0 2 4
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import time
+
+# Spawned parse workers inherit the environment, keep their per-page logs quiet
+os.environ.setdefault("LOGURU_LEVEL", "WARNING")
+
+from loguru import logger as log  # noqa: E402
+
+from tripadvisor.scrape.core import (  # noqa: E402
+    extract_reviews,
+    extract_source_page,
+)
+from tripadvisor.scrape.utils import PARSER_BACKENDS, ScrapeSession  # noqa: E402
+
+
+async def heartbeat(lags, interval=0.01):
+    """Record how late the event loop wakes up for a fixed-interval sleep."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def bench_workers(pages, workers, backend, repeat):
+    """Parse every page `repeat` times through a session with `workers` parse workers."""
+    async with ScrapeSession(parser_backend=backend, parse_workers=workers) as session:
+        # Warm up the pool so process start-up is not part of the measurement
+        await asyncio.gather(
+            *[session.extract(extract_reviews, page) for page in pages[: workers or 1]]
+        )
+
+        lags = []
+        monitor = asyncio.create_task(heartbeat(lags))
+        await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[
+                session.extract(extractor, page)
+                for _ in range(repeat)
+                for page in pages
+                for extractor in (extract_source_page, extract_reviews)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+
+        monitor.cancel()
+
+    return {
+        "workers": workers,
+        "pages_per_second": len(pages) * repeat / elapsed if elapsed else 0.0,
+        "max_loop_lag_ms": max(lags, default=elapsed) * 1000,
+        "mean_loop_lag_ms": (sum(lags) / len(lags) if lags else elapsed) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-loop vs process pool parsing")
+    parser.add_argument(
+        "--pages", default="data/pages/*.html", help="Glob of saved HTML pages"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[0, 2, os.cpu_count() or 4],
+        help="Parse worker counts to compare, 0 parses on the event loop",
+    )
+    parser.add_argument(
+        "--backend", default="html.parser", choices=PARSER_BACKENDS, help="Backend"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Times every page is parsed"
+    )
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.pages))
+    if not paths:
+        raise SystemExit(f"No pages found for {args.pages}, see benchmarks/parsers.py")
+
+    log.disable("tripadvisor")
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+
+    print(f"{len(pages)} pages x {args.repeat} repeats, backend={args.backend}")
+    print(f"{'workers':>8} {'pages/s':>10} {'max loop lag ms':>16} {'mean lag ms':>12}")
+    for workers in args.workers:
+        result = asyncio.run(bench_workers(pages, workers, args.backend, args.repeat))
+        print(
+            f"{result['workers']:>8} {result['pages_per_second']:>10.1f} "
+            f"{result['max_loop_lag_ms']:>16.1f} {result['mean_loop_lag_ms']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark the HTML parser backends on saved TripAdvisor restaurant and review pages.
+Every backend runs in its own process so peak memory is measured in isolation, and the
+extracted records are compared against the 'html.parser' baseline.
+
+Usage:
+    python benchmarks/parsers.py --save URL [URL ...]       # save pages to data/pages
+    python benchmarks/parsers.py --pages "data/pages/*.html" --repeat 3
+"""
+
+import argparse
+import asyncio
+import glob
+import multiprocessing
+import os
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+
+from loguru import logger as log
+
+from tripadvisor.scrape.core import extract_reviews, extract_source_info, is_source_page
+from tripadvisor.scrape.utils import PARSER_BACKENDS, ScrapeSession, make_soup
+
+BACKEND_MODULES = {"html.parser": "bs4", "lxml": "lxml", "lexbor": "selectolax"}
+
+
+def extract_page(markup, backend):
+    """Parse one page and return every record the scraper would extract from it."""
+    soup = make_soup(markup, backend)
+    try:
+        source_info = extract_source_info(soup) if is_source_page(soup) else None
+    except Exception:
+        source_info = None
+    return {"source_info": source_info, "reviews": extract_reviews(soup)}
+
+
+def bench_backend(backend, paths, repeat):
+    """Run in a fresh process: time every page `repeat` times, then measure peak memory."""
+    log.disable("tripadvisor")
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+
+    records = [extract_page(markup, backend) for markup in pages]
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for markup in pages:
+            extract_page(markup, backend)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for markup in pages:
+        extract_page(markup, backend)
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "pages_per_second": len(pages) * repeat / elapsed if elapsed else 0.0,
+        "heap_peak_mb": heap_peak / 1024**2,
+        "rss_growth_mb": (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+        )
+        / 1024,
+        "records": records,
+    }
+
+
+async def save_pages(urls, output_dir):
+    """Download pages through a ScrapeSession and save them for the benchmark."""
+    os.makedirs(output_dir, exist_ok=True)
+    async with ScrapeSession() as session:
+        for url in urls:
+            response = await session.get(url, follow_redirects=False)
+            response.raise_for_status()
+            file_name = url.rstrip("/").split("/")[-1].split("#")[0] or "index"
+            file_path = os.path.join(output_dir, file_name)
+            if not file_path.endswith(".html"):
+                file_path += ".html"
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(response.text)
+            log.success(f"Saved {url} to {file_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML parser backend benchmark")
+    parser.add_argument(
+        "--pages", default="data/pages/*.html", help="Glob of saved HTML pages"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Times every page is parsed"
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=list(PARSER_BACKENDS),
+        choices=PARSER_BACKENDS,
+        help="Backends to benchmark",
+    )
+    parser.add_argument("--save", nargs="+", help="Save these URLs instead")
+    args = parser.parse_args()
+
+    if args.save:
+        asyncio.run(save_pages(args.save, os.path.dirname(args.pages) or "."))
+        return
+
+    paths = sorted(glob.glob(args.pages))
+    if not paths:
+        raise SystemExit(f"No pages found for {args.pages}, save some with --save")
+
+    backends = [b for b in args.backends if find_spec(BACKEND_MODULES[b])]
+    for backend in set(args.backends) - set(backends):
+        log.warning(f"Skipping {backend}: {BACKEND_MODULES[backend]} not installed")
+
+    results = []
+    for backend in backends:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results.append(
+                executor.submit(bench_backend, backend, paths, args.repeat).result()
+            )
+
+    baseline = results[0]["records"] if results else None
+    print(f"{len(paths)} pages x {args.repeat} repeats")
+    print(
+        f"{'backend':<12} {'pages/s':>10} {'heap peak MB':>13} {'RSS growth MB':>14}  records"
+    )
+    for result in results:
+        identical = "identical" if result["records"] == baseline else "DIFFERENT"
+        print(
+            f"{result['backend']:<12} {result['pages_per_second']:>10.1f} "
+            f"{result['heap_peak_mb']:>13.1f} {result['rss_growth_mb']:>14.1f}  {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
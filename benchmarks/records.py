@@ -0,0 +1,118 @@
+"""
+Benchmark the memory of scraped locations held as per-row dictionaries against the slotted
+records of `tripadvisor.records`, and the time to build their Arrow table. Locations and
+reviews are synthetic, with the field sizes of a typical scrape.
+
+Usage:
+    python benchmarks/records.py --locations 2000 --reviews 45
+"""
+
+import argparse
+import gc
+import random
+import string
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import date
+
+from tripadvisor.records import Location, Review
+from tripadvisor.schema import SCRAPE_INFO_SCHEMA, build_table
+
+
+def random_text(rng, length):
+    return "".join(rng.choices(string.ascii_letters + " ", k=length))
+
+
+def make_locations(count, reviews, seed=0):
+    """Build `count` synthetic locations of `reviews` reviews each, as records."""
+    rng = random.Random(seed)
+    return [
+        Location(
+            url=f"https://www.tripadvisor.com/Restaurant_Review-g1-d{index}-Reviews.html",
+            address_from_url=random_text(rng, 40),
+            google_maps_link=f"https://maps.google.com/maps?q={index}",
+            lat=rng.uniform(-90, 90),
+            long=rng.uniform(-180, 180),
+            tel=f"+1 555 {index:07d}",
+            open_hour=random_text(rng, 20),
+            price_range="$$ - $$$",
+            cuisine=["Italian", "Pizza", "Vegetarian Friendly"],
+            ranking=rng.randint(1, 5000),
+            rating=rng.choice([3.5, 4.0, 4.5]),
+            review_count=reviews,
+            review_count_scraped=reviews,
+            reviews=[
+                Review(
+                    user=f"/Profile/user{index}_{position}",
+                    username=f"user{index}_{position}",
+                    country=random_text(rng, 12),
+                    title=random_text(rng, 30),
+                    text=random_text(rng, 300),
+                    rating=float(rng.randint(1, 5)),
+                    review_date=date(2024, 1, 1),
+                    review_type="Dine in",
+                )
+                for position in range(reviews)
+            ],
+            location_id=str(index),
+        )
+        for index in range(count)
+    ]
+
+
+def as_dicts(locations):
+    """Copy the locations as the per-row dictionaries the pipeline used to carry."""
+    return [
+        {**asdict(location), "location_url": location.url} for location in locations
+    ]
+
+
+def as_records(locations):
+    """Copy the locations as records, with records of their reviews."""
+    copies = []
+    for location in locations:
+        copy = Location.from_scrape_info(location.location_id, location)
+        copy.reviews = [Review(*review.astuple()) for review in location.reviews]
+        copies.append(copy)
+    return copies
+
+
+def measure(build, locations):
+    """Return the copies built by `build`, with the traced memory they hold and its peak."""
+    gc.collect()
+    tracemalloc.start()
+    objects = build(locations)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dictionaries vs slotted records")
+    parser.add_argument(
+        "--locations", type=int, default=2000, help="Number of synthetic locations"
+    )
+    parser.add_argument("--reviews", type=int, default=45, help="Reviews per location")
+    args = parser.parse_args()
+
+    # Text values are shared by both layouts, only the containers are measured
+    locations = make_locations(args.locations, args.reviews)
+
+    print(f"{args.locations} locations x {args.reviews} reviews")
+    print(f"{'layout':>8} {'held MiB':>10} {'peak MiB':>10} {'arrow s':>9}")
+    for layout, build in (("dict", as_dicts), ("record", as_records)):
+        rows, current, peak = measure(build, locations)
+
+        started = time.perf_counter()
+        build_table(rows, SCRAPE_INFO_SCHEMA)
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"{layout:>8} {current / 2**20:>10.1f} {peak / 2**20:>10.1f} {elapsed:>9.2f}"
+        )
+        del rows
+
+
+if __name__ == "__main__":
+    main()
@@ -23,4 +23,5 @@ fi
 # Run the main Python program (echo with green color)
 echo -e "\033[0;32mBackfill wrong API data from TripAdvisor in 3 seconds...\033[0m"
 sleep 3
-$PYTHON_EXEC tripadvisor/main.py --backfill
\ No newline at end of file
+# Migrate the tables to the registry schemas first, tables already migrated are left as is
+$PYTHON_EXEC tripadvisor/main.py --migrate --backfill
\ No newline at end of file
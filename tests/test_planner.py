@@ -0,0 +1,147 @@
+import asyncio
+import math
+import random
+
+from tripadvisor.api.planner import (
+    KM_PER_DEGREE_LAT,
+    CoverageCell,
+    CoveragePlanner,
+    distance_km,
+)
+
+# Slack for the flat-earth conversions between kilometres and degrees
+TOLERANCE_KM = 0.001
+
+
+class FakeNearbyAPI:
+    """Record nearby_search calls, returning a full page near the dense spots."""
+
+    def __init__(self, dense_spots=(), dense_radius_km=0.5, page_size=10):
+        self.dense_spots = dense_spots
+        self.dense_radius_km = dense_radius_km
+        self.page_size = page_size
+        self.calls = []
+
+    def is_full(self, center, radius):
+        return radius > self.dense_radius_km and any(
+            distance_km(center, spot) <= radius + 1 for spot in self.dense_spots
+        )
+
+    async def get_many_nearby(self, points, radius=1):
+        responses = []
+        for center in points:
+            full = self.is_full(center, radius)
+            self.calls.append((center, radius, full))
+            size = self.page_size if full else 1
+            responses.append({"data": [{"location_id": str(i)} for i in range(size)]})
+        return responses
+
+
+def offset(point, distance, angle):
+    """Move `point` by `distance` km in the direction `angle`."""
+    lat, long = point
+    return (
+        lat + distance * math.sin(angle) / KM_PER_DEGREE_LAT,
+        long
+        + distance
+        * math.cos(angle)
+        / (KM_PER_DEGREE_LAT * math.cos(math.radians(lat))),
+    )
+
+
+def disk_samples(point, radius):
+    """The centre of a disk with points on its boundary and half way to it."""
+    angles = [2 * math.pi * step / 16 for step in range(16)]
+    return [point] + [
+        offset(point, distance, angle)
+        for distance in (radius / 2, radius)
+        for angle in angles
+    ]
+
+
+def assert_covered(planner, api, points):
+    """Every naive disk must lie inside the calls that did not return a full page."""
+    complete = [(center, radius) for center, radius, full in api.calls if not full]
+    for point in points:
+        for sample in disk_samples(point, planner.point_radius_km):
+            assert any(
+                distance_km(center, sample) <= radius + TOLERANCE_KM
+                for center, radius in complete
+            ), f"{sample} of the disk around {point} is not covered"
+
+
+def random_points(count, seed=0, center=(10.7769, 106.7009), spread_km=15):
+    rng = random.Random(seed)
+    return [
+        offset(center, spread_km * math.sqrt(rng.random()), rng.uniform(0, 2 * math.pi))
+        for _ in range(count)
+    ]
+
+
+def test_plan_drops_only_points_whose_disk_is_covered():
+    planner = CoveragePlanner(radius_km=2, point_radius_km=1)
+    origin = (10.7769, 106.7009)
+    inside = offset(origin, 0.9, 0.3)
+    outside = offset(origin, 1.1, 0.3)
+
+    cells = planner.plan([origin, inside, outside])
+
+    assert len(cells) == 2
+    assert cells[CoverageCell(*origin, 2, 0)] == [origin, inside]
+
+
+def test_children_cover_the_parent_disk():
+    cell = CoverageCell(10.7769, 106.7009, 2, 0)
+    children = cell.children()
+
+    assert len(children) == 4
+    for sample in disk_samples(cell.center, cell.radius_km):
+        assert any(
+            distance_km(child.center, sample) <= child.radius_km for child in children
+        )
+
+
+def test_run_covers_every_point_of_sparse_areas():
+    planner = CoveragePlanner(radius_km=2, point_radius_km=1)
+    api = FakeNearbyAPI(page_size=planner.page_size)
+    points = random_points(300)
+
+    asyncio.run(planner.run(api, points))
+
+    assert len(api.calls) < len(points)
+    assert_covered(planner, api, points)
+
+
+def test_run_splits_every_quadrant_of_dense_cells():
+    planner = CoveragePlanner(
+        radius_km=2,
+        point_radius_km=1,
+        min_radius_km=0.125,
+        max_depth=5,
+        max_split_calls=100_000,
+    )
+    points = random_points(200, seed=1)
+    api = FakeNearbyAPI(dense_spots=points[:3], page_size=planner.page_size)
+
+    asyncio.run(planner.run(api, points))
+
+    full = [call for call in api.calls if call[2]]
+    split = [call for call in api.calls if call[1] < planner.radius_km]
+    assert full
+    assert len(split) == 4 * len(full)
+    assert_covered(planner, api, points)
+
+
+def test_run_caps_the_depth_and_the_budget_of_splits():
+    points = random_points(50, seed=2)
+    always_full = FakeNearbyAPI(dense_spots=points, dense_radius_km=0)
+
+    planner = CoveragePlanner(radius_km=2, point_radius_km=1, max_depth=2)
+    asyncio.run(planner.run(always_full, points))
+    top_level = planner.report(points)["planned_calls"]
+    assert len(always_full.calls) == top_level * (1 + 4 + 16)
+
+    always_full.calls = []
+    planner = CoveragePlanner(radius_km=2, point_radius_km=1, max_split_calls=30)
+    asyncio.run(planner.run(always_full, points))
+    assert len(always_full.calls) == top_level + 30
@@ -17,6 +17,103 @@ SCRAPE_ENCODING = "utf-8"
 SCRAPE_DELAY = float(3)
 SCRAPE_TIMEOUT = float(150.0)
 SCRAPE_MAX_REVIEWS = int(3000)  #! Should be divisible by 15, DEFAULT 200 PAGES
+SCRAPE_PARSER_BACKEND = "html.parser"  # "lxml", "lexbor" need the parsers extra
+SCRAPE_PARSE_WORKERS = int(0)  # Parse worker processes, 0 parses on the event loop
+
+"""
+SCRAPE POLITENESS BUDGET shared by every request to TripAdvisor, whatever the concurrency.
+!Not raise SCRAPE_REQUESTS_PER_SECOND above 1 / 2 (one request every 2 seconds)
+"""
+SCRAPE_CONCURRENCY = int(4)
+SCRAPE_REQUESTS_PER_SECOND = float(1 / SCRAPE_DELAY)
+SCRAPE_BURST = int(1)
+SCRAPE_PREFETCH_PAGES = int(3)  # Review pages kept in flight per location
+SCRAPE_REFRESH_KNOWN_REVIEWS = int(45)  # Newest stored reviews matched by a refresh
+SCRAPE_REFRESH_CHUNK_ROWS = int(200)  # Locations of the refresh work list held at once
+
+"""
+ADAPTIVE RATE (AIMD) between the floor and the ceiling, driven by TripAdvisor responses
+"""
+SCRAPE_MIN_REQUESTS_PER_SECOND = float(1 / 20)
+SCRAPE_MAX_REQUESTS_PER_SECOND = float(1 / 2)
+SCRAPE_RATE_INCREASE = float(0.01)  # req/s added every second of healthy responses
+SCRAPE_RATE_DECREASE = float(0.5)  # rate factor on 403, 429, 5xx, failures
+SCRAPE_LATENCY_SPIKE = float(3)  # slower than 3x the average latency backs off too
+SCRAPE_RATE_LOG_INTERVAL = float(60)
+
+"""
+RETRIES AND CIRCUIT BREAKER: exponential backoff with jitter, paused run on repeated 403s
+"""
+SCRAPE_RETRY_ATTEMPTS = int(5)
+SCRAPE_RETRY_BASE_DELAY = float(SCRAPE_DELAY)  # Backoff ceiling doubles every retry
+SCRAPE_RETRY_MAX_DELAY = float(60)
+SCRAPE_RETRY_BUDGET = float(5 * 60)  # Seconds a location may spend on retries
+SCRAPE_BREAKER_THRESHOLD = int(5)  # Consecutive 403s opening the circuit
+SCRAPE_BREAKER_COOLDOWN = float(5 * 60)
+SCRAPE_BREAKER_MAX_TRIPS = int(3)  # Consecutive openings stopping the run
+
+"""
+SCRAPE CHECKPOINT: scraped locations are streamed to Parquet part files under data/
+"""
+SCRAPE_CHECKPOINT_DIR = "data/checkpoints"
+SCRAPE_CHECKPOINT_ROWS = int(50)  # Flush a part file every N locations
+SCRAPE_CHECKPOINT_BYTES = int(64 * 1024**2)  # or every 64 MiB of buffered records
+
+"""
+REVIEWS BACKFILL: the work list is streamed and parsed in chunks, each appended to the _v2 table
+"""
+BACKFILL_CHUNK_ROWS = int(200)  # Locations parsed concurrently per chunk
+# Append early once parsed rows reach 256 MiB
+BACKFILL_MAX_BUFFER_BYTES = 256 * 1024**2
+
+"""
+REVIEW TABLE: one row per review, appended in batches while review pages are parsed
+"""
+REVIEW_BATCH_ROWS = int(500)
+REVIEW_SYNC_BATCHES = int(8)  # Wait for the acknowledgements every N appended batches
+
+"""
+LOCATION URL INDEX: location_id -> canonical Restaurant_Review URL, kept next to data/
+"""
+LOCATION_INDEX_PATH = "data/location_index.sqlite"
+LOCATION_INDEX_TTL = float(30 * 24 * 60 * 60)  # 30 days
+
+"""
+HTTP RESPONSE CACHE for TripAdvisor pages and Content API responses (TTL in seconds)
+"""
+HTTP_CACHE_PATH = "data/http_cache.sqlite"
+HTTP_CACHE_MAX_BYTES = int(2 * 1024**3)  # 2 GiB of compressed bodies
+HTTP_CACHE_TTLS = {
+    "restaurant_page": float(24 * 60 * 60),
+    "review_page": float(24 * 60 * 60),
+    "location_details": float(7 * 24 * 60 * 60),
+    "nearby_search": float(7 * 24 * 60 * 60),
+    "default": float(24 * 60 * 60),
+}
+
+"""
+QUERY RESULT CACHE for BigQuery reads, invalidated when a referenced table is modified
+"""
+QUERY_CACHE_PATH = "data/query_cache"
+QUERY_CACHE_MAX_BYTES = int(1024**3)  # 1 GiB of Parquet results
+
+
+"""
+CONTENT API CONFIG: request budget per API key and number of calls in flight
+"""
+API_REQUESTS_PER_SECOND = float(10)
+API_BURST = int(5)
+API_CONCURRENCY = int(16)
+API_TIMEOUT = float(30.0)
+API_RETRY_ATTEMPTS = int(4)
+API_RETRY_BASE_DELAY = float(1)
+API_RETRY_BUDGET = float(60)
+API_NEARBY_RADIUS_KM = float(2)  # Radius of the planned nearby_search calls
+API_NEARBY_POINT_RADIUS_KM = float(1)  # Radius a single call searched around each point
+API_NEARBY_MIN_RADIUS_KM = float(0.125)  # Dense cells are not split below this radius
+API_NEARBY_PAGE_SIZE = int(10)  # A full nearby_search page signals a dense area
+API_NEARBY_MAX_DEPTH = int(3)  # Dense cells are split at most this many times
+API_NEARBY_MAX_SPLIT_CALLS = int(2000)  # Budget of the calls of split cells per run
 
 
 """
@@ -1,19 +1,70 @@
+import asyncio
+import json
 import os
-import time
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import httpx
 import requests
+from loguru import logger as log
 
-from tripadvisor._constants import BASE_HEADERS
+from tripadvisor._constants import (
+    API_BURST,
+    API_CONCURRENCY,
+    API_REQUESTS_PER_SECOND,
+    API_RETRY_ATTEMPTS,
+    API_RETRY_BASE_DELAY,
+    API_RETRY_BUDGET,
+    API_TIMEOUT,
+    BASE_HEADERS,
+)
+from tripadvisor.cache import ResponseCache
+from tripadvisor.ratelimit import TokenBucket
+from tripadvisor.retry import RetryPolicy
+
+# Content API calls are retried on network errors, 429 and 5xx only
+API_RETRY_POLICY = RetryPolicy(
+    attempts=API_RETRY_ATTEMPTS,
+    base_delay=API_RETRY_BASE_DELAY,
+    budget=API_RETRY_BUDGET,
+)
 
 
 class TripAdvisorContentAPI:
     BASE_URL = "https://api.content.tripadvisor.com/api/v1/location"
     HEADERS = BASE_HEADERS
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, cache: ResponseCache = None):
         if not api_key:
             raise ValueError("API key is not set. Please provide a valid API key.")
         self.api_key = api_key
+        self.cache = cache
+        self.retry_policy = API_RETRY_POLICY
+
+    def _get_json(self, url):
+        """Get a JSON response, served from the response cache when one is set.
+
+        Args:
+            url (str): The API URL to request.
+
+        Returns:
+            dict: JSON response from the API
+        """
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return json.loads(cached.content)
+
+        def _request():
+            response = requests.get(url, headers=self.HEADERS, timeout=API_TIMEOUT)
+            response.raise_for_status()
+            return response
+
+        response = self.retry_policy.call(_request, name="Content API call")
+
+        if self.cache is not None:
+            self.cache.put(url, response.status_code, response.url, response.content)
+
+        return response.json()
 
     def get_location_details(self, location_id):
         """Get details of a location based on its ID.
@@ -28,54 +79,190 @@ class TripAdvisorContentAPI:
             url = (
                 f"{self.BASE_URL}/{location_id}/details?key={self.api_key}&language=vi"
             )
-            response = requests.get(url, headers=self.HEADERS)
-
-            if response.status_code != 200:
-                response.raise_for_status()
-
-            return response.json()
+            return self._get_json(url)
         except Exception as e:
             raise ValueError(f"An error occurred: {e}")
-        finally:
-            time.sleep(1)
 
-    def get_nearby_locations(self, lat, long):
+    def get_nearby_locations(self, lat, long, radius=1):
         """Get nearby locations based on latitude and longitude in a 1km radius.
 
         Args:
             lat (float): Latitude of the location
             long (float): Longitude of the location
+            radius (float, optional): Search radius in km. Defaults to 1.
+
+        Returns:
+            dict: JSON response from the API
+        """
+        url = f"{self.BASE_URL}/nearby_search?category=restaurants&radius={radius}&radiusUnit=km&latLong={lat},{long}&key={self.api_key}&language=vi"
+        return self._get_json(url)
+
+    def get_location_url(self, location_id):
+        """Get URL of a location on TripAdvisor, redirected to its full URL when opened
+
+        Args:
+            location_id (str): Location ID on TripAdvisor
+
+        Returns:
+            str: URL of the location
+        """
+        return f"https://www.tripadvisor.com/{location_id}"
+
+
+class AsyncTripAdvisorContentAPI:
+    """
+    Async TripAdvisor Content API client on a shared, pooled HTTP/2 httpx client.
+    Calls are paced by a token bucket shared by every client using the same API key,
+    instead of sleeping after each call, and batch helpers fan out many calls at once.
+    """
+
+    BASE_URL = TripAdvisorContentAPI.BASE_URL
+    HEADERS = BASE_HEADERS
+    _rate_limiters: Dict[str, TokenBucket] = {}
+
+    def __init__(
+        self,
+        api_key,
+        requests_per_second: float = API_REQUESTS_PER_SECOND,
+        concurrency: int = API_CONCURRENCY,
+        cache: ResponseCache = None,
+    ):
+        """
+        Initialize the AsyncTripAdvisorContentAPI.
+
+        Args:
+            api_key (str): TripAdvisor Content API key.
+            requests_per_second (float): Request budget of the API key. Default: API_REQUESTS_PER_SECOND.
+            concurrency (int): Maximum number of calls in flight. Default: API_CONCURRENCY.
+            cache (ResponseCache): Optional on-disk response cache, used for record/replay.
+        """
+        if not api_key:
+            raise ValueError("API key is not set. Please provide a valid API key.")
+
+        self.api_key = api_key
+        self.cache = cache
+        self.rate_limiter = self._rate_limiters.setdefault(
+            api_key, TokenBucket(requests_per_second, API_BURST)
+        )
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.client = httpx.AsyncClient(
+            http2=True,
+            headers=self.HEADERS,
+            timeout=httpx.Timeout(API_TIMEOUT),
+            limits=httpx.Limits(max_connections=concurrency),
+        )
+
+    async def _get_json(self, url) -> Dict:
+        """Get a JSON response, served from the response cache when one is set.
+
+        Args:
+            url (str): The API URL to request.
 
         Returns:
             dict: JSON response from the API
         """
-        url = f"{self.BASE_URL}/nearby_search?category=restaurants&radius=1&radiusUnit=km&latLong={lat},{long}&key={self.api_key}&language=vi"
-        response = requests.get(url, headers=self.HEADERS)
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return json.loads(cached.content)
+
+        async def _request() -> httpx.Response:
+            async with self.semaphore:
+                await self.rate_limiter.acquire()
+                response = await self.client.get(url)
 
-        if response.status_code != 200:
             response.raise_for_status()
+            return response
+
+        response = await API_RETRY_POLICY.run(_request, name="Content API call")
+
+        if self.cache is not None:
+            self.cache.put(
+                url, response.status_code, str(response.url), response.content
+            )
 
         return response.json()
 
-    def get_location_url(self, location_id, full=False):
-        """Get redirect URL of a location on TripAdvisor
+    async def get_location_details(self, location_id) -> Dict:
+        """Get details of a location based on its ID.
 
         Args:
             location_id (str): Location ID on TripAdvisor
-            full (bool, optional): If True, return the full URL. Defaults to False.
 
         Returns:
-            str: URL of the location
+            dict: JSON response from the API
         """
-        if full:
-            response = requests.get(
-                f"https://www.tripadvisor.com/{location_id}", headers=self.HEADERS
+        try:
+            url = (
+                f"{self.BASE_URL}/{location_id}/details?key={self.api_key}&language=vi"
             )
-            assert response.status_code != 403, "Blocked by TripAdvisor"
-            assert response.status_code != 404, "Location not found"
-            return response.url
+            return await self._get_json(url)
+        except Exception as e:
+            raise ValueError(f"An error occurred: {e}")
 
-        return f"https://www.tripadvisor.com/{location_id}"
+    async def get_nearby_locations(self, lat, long, radius=1) -> Dict:
+        """Get nearby locations based on latitude and longitude in a 1km radius.
+
+        Args:
+            lat (float): Latitude of the location
+            long (float): Longitude of the location
+            radius (float, optional): Search radius in km. Defaults to 1.
+
+        Returns:
+            dict: JSON response from the API
+        """
+        url = f"{self.BASE_URL}/nearby_search?category=restaurants&radius={radius}&radiusUnit=km&latLong={lat},{long}&key={self.api_key}&language=vi"
+        return await self._get_json(url)
+
+    async def get_many_location_details(
+        self, location_ids: Iterable
+    ) -> List[Optional[Dict]]:
+        """Get details of many locations concurrently.
+
+        Args:
+            location_ids (Iterable): Location IDs on TripAdvisor
+
+        Returns:
+            list: JSON responses in the order of `location_ids`, None for failed calls
+        """
+
+        async def _details(location_id):
+            try:
+                return await self.get_location_details(location_id)
+            except Exception as e:
+                log.error(f"Failed to fetch details for location ID {location_id}: {e}")
+
+        return await asyncio.gather(*[_details(id_) for id_ in location_ids])
+
+    async def get_many_nearby(
+        self, points: Iterable[Tuple[float, float]], radius=1
+    ) -> List[Optional[Dict]]:
+        """Get nearby locations of many points concurrently.
+
+        Args:
+            points (Iterable): `(lat, long)` tuples
+            radius (float, optional): Search radius in km. Defaults to 1.
+
+        Returns:
+            list: JSON responses in the order of `points`, None for failed calls
+        """
+
+        async def _nearby(lat, long):
+            try:
+                return await self.get_nearby_locations(lat, long, radius)
+            except Exception as e:
+                log.error(f"Failed to fetch nearby locations for {lat},{long}: {e}")
+
+        return await asyncio.gather(*[_nearby(lat, long) for lat, long in points])
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncTripAdvisorContentAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
 
 if __name__ == "__main__":
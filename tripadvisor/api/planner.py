@@ -0,0 +1,245 @@
+import math
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from loguru import logger as log
+
+from tripadvisor._constants import (
+    API_NEARBY_MAX_DEPTH,
+    API_NEARBY_MAX_SPLIT_CALLS,
+    API_NEARBY_MIN_RADIUS_KM,
+    API_NEARBY_PAGE_SIZE,
+    API_NEARBY_POINT_RADIUS_KM,
+    API_NEARBY_RADIUS_KM,
+)
+
+KM_PER_DEGREE_LAT = 111.32
+# Child disks are slightly enlarged to absorb the error of the flat-earth distances
+RADIUS_MARGIN = 1.01
+
+
+def distance_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """
+    Equirectangular distance between two `(lat, long)` points, accurate at city scale.
+
+    Args:
+        a (tuple): First `(lat, long)` point.
+        b (tuple): Second `(lat, long)` point.
+    """
+    lat_km = (a[0] - b[0]) * KM_PER_DEGREE_LAT
+    long_km = (
+        (a[1] - b[1]) * KM_PER_DEGREE_LAT * math.cos(math.radians((a[0] + b[0]) / 2))
+    )
+    return math.hypot(lat_km, long_km)
+
+
+class CoverageCell(NamedTuple):
+    """A disk queried with one nearby_search call centred on it."""
+
+    lat: float
+    long: float
+    radius_km: float
+    level: int
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return self.lat, self.long
+
+    def covers(self, lat: float, long: float, radius_km: float = 0) -> bool:
+        """Whether the disk of `radius_km` around a point lies entirely inside the cell."""
+        return distance_km(self.center, (lat, long)) <= self.radius_km - radius_km
+
+    def children(self) -> List["CoverageCell"]:
+        """
+        Split the cell in four disks centred on the quadrants of its bounding square.
+        Each has a radius of half the square diagonal, so together they cover the square
+        and thus the whole cell.
+        """
+        offset_km = self.radius_km / 2
+        lat_offset = offset_km / KM_PER_DEGREE_LAT
+        long_offset = offset_km / (
+            KM_PER_DEGREE_LAT * max(math.cos(math.radians(self.lat)), 1e-6)
+        )
+        radius_km = self.radius_km / math.sqrt(2) * RADIUS_MARGIN
+        return [
+            CoverageCell(
+                self.lat + lat_sign * lat_offset,
+                self.long + long_sign * long_offset,
+                radius_km,
+                self.level + 1,
+            )
+            for lat_sign in (-1, 1)
+            for long_sign in (-1, 1)
+        ]
+
+
+class CoveragePlanner:
+    """
+    Plan nearby_search calls for a set of points with as few Content API calls as possible.
+    Each point stands for the disk of `point_radius_km` a naive call would search around it.
+    Calls use the larger `radius_km`, and a point is dropped only when its whole disk fits
+    inside an already planned call, so the plan covers everything the naive calls did. A
+    call that returns a full page of results is too dense to be trusted, so its disk is
+    split in four smaller disks that together cover it, at most `max_depth` times and within
+    a budget of `max_split_calls` calls per run.
+    """
+
+    def __init__(
+        self,
+        radius_km: float = API_NEARBY_RADIUS_KM,
+        point_radius_km: float = API_NEARBY_POINT_RADIUS_KM,
+        min_radius_km: float = API_NEARBY_MIN_RADIUS_KM,
+        page_size: int = API_NEARBY_PAGE_SIZE,
+        max_depth: int = API_NEARBY_MAX_DEPTH,
+        max_split_calls: int = API_NEARBY_MAX_SPLIT_CALLS,
+    ):
+        """
+        Initialize the CoveragePlanner.
+
+        Args:
+            radius_km (float): Search radius of the planned calls. Default: API_NEARBY_RADIUS_KM.
+            point_radius_km (float): Radius to cover around each point. Default: API_NEARBY_POINT_RADIUS_KM.
+            min_radius_km (float): Dense cells are not split below this radius. Default: API_NEARBY_MIN_RADIUS_KM.
+            page_size (int): Number of results of a full nearby_search page. Default: API_NEARBY_PAGE_SIZE.
+            max_depth (int): Times a dense cell is split at most. Default: API_NEARBY_MAX_DEPTH.
+            max_split_calls (int): Calls of split cells per run at most. Default: API_NEARBY_MAX_SPLIT_CALLS.
+        """
+        if radius_km < point_radius_km:
+            raise ValueError(
+                f"radius_km={radius_km} is smaller than point_radius_km={point_radius_km}"
+            )
+        self.radius_km = radius_km
+        self.point_radius_km = point_radius_km
+        self.min_radius_km = min_radius_km
+        self.page_size = page_size
+        self.max_depth = max_depth
+        self.max_split_calls = max_split_calls
+
+    def plan(self, points: Iterable[Tuple[float, float]]) -> Dict[CoverageCell, list]:
+        """
+        Greedily plan one call per point whose disk is not covered by a call planned before.
+
+        Args:
+            points (Iterable): `(lat, long)` tuples.
+
+        Returns:
+            dict: The top-level cells to query, with the input points each one covers.
+        """
+        points = list(points)
+        if not points:
+            return {}
+
+        # Index planned cells by buckets of one radius, wide enough in longitude at the
+        # highest latitude so a covering cell is always in a neighbouring bucket
+        lat_step = self.radius_km / KM_PER_DEGREE_LAT
+        max_lat = min(max(abs(lat) for lat, _ in points), 89.0)
+        long_step = lat_step / math.cos(math.radians(max_lat))
+
+        cells, buckets = {}, {}
+        for lat, long in points:
+            row, col = math.floor(lat / lat_step), math.floor(long / long_step)
+            cell = next(
+                (
+                    candidate
+                    for row_offset in (-1, 0, 1)
+                    for col_offset in (-1, 0, 1)
+                    for candidate in buckets.get(
+                        (row + row_offset, col + col_offset), []
+                    )
+                    if candidate.covers(lat, long, self.point_radius_km)
+                ),
+                None,
+            )
+            if cell is None:
+                cell = CoverageCell(lat, long, self.radius_km, 0)
+                buckets.setdefault((row, col), []).append(cell)
+            cells.setdefault(cell, []).append((lat, long))
+        return cells
+
+    def report(self, points: Iterable[Tuple[float, float]]) -> Dict:
+        """
+        Dry-run report of planned versus naive call counts, without any API call.
+        Splits of dense cells are only known once the API answers, so `planned_calls` does not
+        include them; `max_split_calls` is their worst case, every cell split down to
+        `max_depth` within the run budget.
+
+        Args:
+            points (Iterable): `(lat, long)` tuples.
+        """
+        points = list(points)
+        cells = self.plan(points)
+        # Every cell split down to max_depth adds 4 + 16 + ... + 4^max_depth calls
+        split_calls = len(cells) * sum(
+            4**level for level in range(1, self.max_depth + 1)
+        )
+        report = {
+            "naive_calls": len(points),
+            "planned_calls": len(cells),
+            "max_split_calls": min(split_calls, self.max_split_calls),
+            "saved_calls": len(points) - len(cells),
+            "radius_km": self.radius_km,
+            "point_radius_km": self.point_radius_km,
+        }
+        log.info(f"Coverage plan, splits of dense cells not included: {report}")
+        return report
+
+    async def run(self, api, points: Iterable[Tuple[float, float]]) -> List[Dict]:
+        """
+        Query every planned cell, splitting dense cells level by level while the depth and
+        the budget of split calls allow it.
+
+        Args:
+            api (AsyncTripAdvisorContentAPI): The async Content API client.
+            points (Iterable): `(lat, long)` tuples.
+
+        Returns:
+            list: Location data dictionaries of every call, duplicates included.
+        """
+        points = list(points)
+        pending = list(self.plan(points))
+        locations, calls, split_calls = [], 0, 0
+
+        while pending:
+            if pending[0].level > 0:
+                budget = self.max_split_calls - split_calls
+                if len(pending) > budget:
+                    log.warning(
+                        f"Split call budget reached, {len(pending) - budget} dense cells "
+                        "are not searched."
+                    )
+                    pending = pending[:budget]
+                    if not pending:
+                        break
+                split_calls += len(pending)
+
+            radius_km = pending[0].radius_km
+            log.info(f"Querying {len(pending)} cells with radius={radius_km:.3f}km")
+            responses = await api.get_many_nearby(
+                [cell.center for cell in pending], radius=radius_km
+            )
+            calls += len(pending)
+
+            dense, saturated = [], 0
+            for cell, response in zip(pending, responses):
+                results = response["data"] if response else []
+                locations.extend(results)
+
+                if len(results) >= self.page_size:
+                    children = cell.children()
+                    if (
+                        cell.level < self.max_depth
+                        and children[0].radius_km >= self.min_radius_km
+                    ):
+                        dense.extend(children)
+                    else:
+                        saturated += 1
+
+            if saturated:
+                log.warning(
+                    f"{saturated} cells still return a full page and are not split further."
+                )
+            pending = dense
+
+        log.success(
+            f"Coverage run: {calls} calls instead of {len(points)} naive calls."
+        )
+        return locations
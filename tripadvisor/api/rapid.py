@@ -1,8 +1,10 @@
 import os
-from datetime import datetime
+from datetime import date
 
 import requests
 
+from tripadvisor.records import Review
+
 
 class TripAdvisorRapidAPI:
     """
@@ -28,16 +30,18 @@ class TripAdvisorRapidAPI:
 
     def parse_reviews(self, reviews):
         return [
-            {
-                "user": review["user"]["username"],
-                "title": review["title"],
-                "text": review["text"],
-                "rating": float(review["rating"]),
-                "review_date": datetime.strptime(
-                    review["creationDate"], "%Y-%m-%d"
-                ).strftime("%B %d, %Y"),
-                "review_type": review["tripInfo"]["tripType"],
-            }
+            Review(
+                user=review["user"]["username"],
+                title=review["title"],
+                text=review["text"],
+                rating=float(review["rating"])
+                if review.get("rating") is not None
+                else None,
+                review_date=date.fromisoformat(review["creationDate"])
+                if review.get("creationDate")
+                else None,
+                review_type=review["tripInfo"]["tripType"],
+            )
             for review in reviews
         ]
 
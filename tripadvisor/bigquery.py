@@ -1,23 +1,44 @@
+import io
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import sqlparse
-from google.api_core.exceptions import GoogleAPIError
-from google.cloud import bigquery
+from google.api_core.exceptions import GoogleAPIError, NotFound
+from google.cloud import bigquery, bigquery_storage, bigquery_storage_v1
+from google.cloud.bigquery_storage_v1 import types, writer
 from google.oauth2.service_account import Credentials
 from loguru import logger as log
 
+from tripadvisor.cache import QueryCache
+from tripadvisor.schema import bigquery_schema, migration_select, schema_matches
+
+# Fully qualified table references of the repo queries, e.g. `project.dataset.table`
+TABLE_REFERENCE = re.compile(r"`([\w-]+\.[\w-]+\.[\w$-]+)`")
+
 
 class BigQueryHandler:
     """
     BigQueryHandler for interacting with BigQuery, including table management, data upload, and fetching queries.
     """
 
-    def __init__(self, project_id: str, credentials_path: str = None):
+    def __init__(
+        self,
+        project_id: str,
+        credentials_path: str = None,
+        query_cache: Optional[QueryCache] = None,
+    ):
         """
         Initialize the BigQueryHandler with a specified project and dataset.
 
         Args:
             project_id (str): GCP project ID.
             credentials_path (str): Path to the service account JSON file.
+            query_cache (QueryCache): Local cache of query results. Default: None, disabled.
         """
         if not project_id:
             raise ValueError("Project ID is required to initialize BigQueryHandler.")
@@ -26,9 +47,14 @@ class BigQueryHandler:
             raise ValueError("Please provide a path to the service account JSON file")
 
         self.project_id = project_id
-        self.client = bigquery.Client(
-            credentials=Credentials.from_service_account_file(credentials_path),
-            project=self.project_id,
+        self.query_cache = query_cache
+        credentials = Credentials.from_service_account_file(credentials_path)
+        self.client = bigquery.Client(credentials=credentials, project=self.project_id)
+        # Storage Read API client, results are streamed as Arrow record batches over gRPC
+        self.read_client = bigquery_storage.BigQueryReadClient(credentials=credentials)
+        # Storage Write API client, rows are appended as Arrow record batches over gRPC
+        self.write_client = bigquery_storage_v1.BigQueryWriteClient(
+            credentials=credentials
         )
 
         log.success("Initialized BigQueryHandler for project: {}", project_id)
@@ -64,10 +90,131 @@ class BigQueryHandler:
             pd.DataFrame: DataFrame containing the query results.
         """
         try:
+            if self.query_cache is not None:
+                return self.fetch_arrow(query).to_pandas()
+
             _query = self.normalize_query(query)
-            dataframe = self.client.query(_query).to_dataframe()
+            return self.client.query(_query).to_dataframe(
+                bqstorage_client=self.read_client
+            )
+
+        except GoogleAPIError as api_error:
+            log.error("Google API Error during data fetch: {}", api_error)
+            raise
 
-            return pd.DataFrame(dataframe)
+        except Exception as e:
+            log.exception("An unexpected error occurred during data fetch.")
+            raise
+
+    def _table_versions(self, query: str) -> Optional[Dict[str, str]]:
+        """
+        Return the `modified` timestamp of every table a query reads, or None if the result
+        must not be cached: no table could be found in the query, or one of them has rows
+        still in its streaming buffer.
+
+        Args:
+            query (str): The normalized query.
+        """
+        table_versions = {}
+        for table_id in set(TABLE_REFERENCE.findall(query)):
+            try:
+                table = self.client.get_table(table_id)
+            except NotFound:
+                return None
+
+            if table.modified is None or table.streaming_buffer is not None:
+                return None
+            table_versions[table_id] = table.modified.isoformat()
+
+        return table_versions or None
+
+    def fetch_arrow(
+        self, query: str, job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> pa.Table:
+        """
+        Execute a query on a BigQuery table and return the results as an Arrow table,
+        read through the Storage Read API without a pandas copy.
+
+        Results are served from the query cache while the tables they read are unchanged,
+        except for parameterized queries.
+
+        Args:
+            query (str): The query to execute on the BigQuery table.
+            job_config (bigquery.QueryJobConfig): Query parameters and options. Default: None.
+
+        Returns:
+            pa.Table: Arrow table containing the query results.
+        """
+        try:
+            _query = self.normalize_query(query)
+
+            cache_key = None
+            if self.query_cache is not None and not (
+                job_config and job_config.query_parameters
+            ):
+                table_versions = self._table_versions(_query)
+                if table_versions:
+                    cache_key = self.query_cache.key_of(_query, table_versions)
+                    cached = self.query_cache.get(cache_key)
+                    if cached is not None:
+                        log.info("Query served from cache: {}", cache_key)
+                        return cached
+
+            result = self.client.query(_query, job_config=job_config).to_arrow(
+                bqstorage_client=self.read_client
+            )
+
+            if cache_key is not None:
+                self.query_cache.put(cache_key, result)
+            return result
+
+        except GoogleAPIError as api_error:
+            log.error("Google API Error during data fetch: {}", api_error)
+            raise
+
+        except Exception as e:
+            log.exception("An unexpected error occurred during data fetch.")
+            raise
+
+    def iter_record_batches(
+        self,
+        query: Optional[str] = None,
+        full_table_id: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        job_config: Optional[bigquery.QueryJobConfig] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream the results of a query, or the rows of a table, as Arrow record batches.
+        Reading a table directly skips the query job, only the selected columns are read.
+
+        Args:
+            query (str): The query to execute on the BigQuery table.
+            full_table_id (str): The table to read instead of a query, as 'dataset.table'
+                                 or 'project.dataset.table'.
+            columns (list): The columns to read from `full_table_id`. Default: all columns.
+            job_config (bigquery.QueryJobConfig): Query parameters and options. Default: None.
+
+        Yields:
+            pa.RecordBatch: The next batch of results.
+        """
+        if (query is None) == (full_table_id is None):
+            raise ValueError("Provide either a query or a full_table_id.")
+
+        try:
+            if query is not None:
+                rows = self.client.query(
+                    self.normalize_query(query), job_config=job_config
+                ).result()
+            else:
+                table = self.client.get_table(full_table_id)
+                selected_fields = (
+                    [field for field in table.schema if field.name in columns]
+                    if columns
+                    else None
+                )
+                rows = self.client.list_rows(table, selected_fields=selected_fields)
+
+            yield from rows.to_arrow_iterable(bqstorage_client=self.read_client)
 
         except GoogleAPIError as api_error:
             log.error("Google API Error during data fetch: {}", api_error)
@@ -77,8 +224,464 @@ class BigQueryHandler:
             log.exception("An unexpected error occurred during data fetch.")
             raise
 
+    def table_exists(self, full_table_id: str) -> bool:
+        """
+        Check whether a BigQuery table exists.
+
+        Args:
+            full_table_id (str): The table to look up.
+        """
+        try:
+            self.client.get_table(full_table_id)
+            return True
+        except NotFound:
+            return False
+
+    def _work_list_query(
+        self,
+        source_table_id: str,
+        done_table_id: Optional[str],
+        key: str = "location_id",
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        order_by: Optional[str] = None,
+        limit: int = -1,
+        qualify: Optional[str] = None,
+    ) -> Tuple[str, bigquery.QueryJobConfig]:
+        conditions = ["TRUE"]
+        join = ""
+        if done_table_id is not None and self.table_exists(done_table_id):
+            join = f"""
+            LEFT JOIN (SELECT DISTINCT {key} FROM `{done_table_id}`) AS done
+            ON source.{key} = done.{key}
+            """
+            conditions.append(f"done.{key} IS NULL")
+        elif done_table_id is not None:
+            log.warning(
+                "Table '{}' does not exist, nothing is done yet.", done_table_id
+            )
+
+        if where:
+            conditions.append(f"({where})")
+
+        query_parameters = []
+        if exclude:
+            conditions.append(f"source.{key} NOT IN UNNEST(@exclude)")
+            query_parameters.append(
+                bigquery.ArrayQueryParameter("exclude", "STRING", sorted(exclude))
+            )
+
+        query = f"""
+        SELECT {columns or f"DISTINCT source.{key}"}
+        FROM `{source_table_id}` AS source
+        {join}
+        WHERE {" AND ".join(conditions)}
+        {f"QUALIFY {qualify}" if qualify else ""}
+        ORDER BY {order_by or f"source.{key}"}
+        {f"LIMIT {int(limit)}" if limit != -1 else ""}
+        """
+        return query, bigquery.QueryJobConfig(query_parameters=query_parameters)
+
+    def fetch_work_list(
+        self,
+        source_table_id: str,
+        done_table_id: Optional[str],
+        key: str = "location_id",
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        order_by: Optional[str] = None,
+        limit: int = -1,
+        qualify: Optional[str] = None,
+    ) -> pa.Table:
+        """
+        Fetch the rows of a source table whose key is not in a done table yet. The anti-join,
+        ordering and limit run in BigQuery, so only the rows to work on are downloaded.
+
+        Args:
+            source_table_id (str): The full table ID of the work items.
+            done_table_id (str): The full table ID of the finished items. A missing table means
+                                 nothing is done yet, None skips the anti-join.
+            key (str): The column joining both tables. Default: 'location_id'.
+            columns (str): The select list, on the `source` alias. Default: the distinct keys.
+            where (str): An extra filter on the `source` alias. Default: None.
+            exclude (list): Keys to skip as well, e.g. finished locally but not loaded yet.
+            order_by (str): The ordering of the work list. Default: the key.
+            limit (int): Maximum rows to return, -1 for all.
+            qualify (str): A QUALIFY filter on the `source` alias, e.g. to dedupe keys.
+
+        Returns:
+            pa.Table: Arrow table of the work list.
+        """
+        query, job_config = self._work_list_query(
+            source_table_id,
+            done_table_id,
+            key,
+            columns,
+            where,
+            exclude,
+            order_by,
+            limit,
+            qualify,
+        )
+        work_list = self.fetch_arrow(query, job_config)
+
+        log.info("Work list of {} rows from '{}'", work_list.num_rows, source_table_id)
+        return work_list
+
+    def iter_work_list(
+        self,
+        source_table_id: str,
+        done_table_id: Optional[str],
+        key: str = "location_id",
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        order_by: Optional[str] = None,
+        limit: int = -1,
+        qualify: Optional[str] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream the work list of `fetch_work_list` as Arrow record batches through the Storage
+        Read API, so a large work list is never held in memory at once.
+
+        Args:
+            source_table_id (str): The full table ID of the work items.
+            done_table_id (str): The full table ID of the finished items. A missing table means
+                                 nothing is done yet, None skips the anti-join.
+            key (str): The column joining both tables. Default: 'location_id'.
+            columns (str): The select list, on the `source` alias. Default: the distinct keys.
+            where (str): An extra filter on the `source` alias. Default: None.
+            exclude (list): Keys to skip as well, e.g. finished locally but not loaded yet.
+            order_by (str): The ordering of the work list. Default: the key.
+            limit (int): Maximum rows to return, -1 for all.
+            qualify (str): A QUALIFY filter on the `source` alias, e.g. to dedupe keys.
+
+        Yields:
+            pa.RecordBatch: The next batch of the work list.
+        """
+        query, job_config = self._work_list_query(
+            source_table_id,
+            done_table_id,
+            key,
+            columns,
+            where,
+            exclude,
+            order_by,
+            limit,
+            qualify,
+        )
+        yield from self.iter_record_batches(query=query, job_config=job_config)
+
+    def _merge_staging(
+        self,
+        staging_table_id: str,
+        full_table_id: str,
+        key_columns: List[str],
+        order_by: Optional[str] = None,
+    ) -> int:
+        """
+        MERGE a staging table into a target table on key columns, then drop the staging table.
+        Staging rows sharing a key are deduped first, a MERGE matching several source rows
+        to one target row fails.
+
+        Args:
+            staging_table_id (str): The table holding the changed rows.
+            full_table_id (str): The table to upsert into.
+            key_columns (list): The columns identifying a row.
+            order_by (str): The ordering of the staging rows of a key, the first one is kept,
+                            e.g. 'scraped_at DESC'. Default: None, any of them.
+
+        Returns:
+            int: Number of target rows inserted or updated.
+        """
+        try:
+            staging = self.client.get_table(staging_table_id)
+            staging.expires = datetime.now(timezone.utc) + timedelta(hours=1)
+            self.client.update_table(staging, ["expires"])
+
+            target_columns = {
+                field.name for field in self.client.get_table(full_table_id).schema
+            }
+            columns = [
+                field.name for field in staging.schema if field.name in target_columns
+            ]
+            ignored = [
+                field.name
+                for field in staging.schema
+                if field.name not in target_columns
+            ]
+            if ignored:
+                log.warning(
+                    "Columns {} are not in '{}', ignored.", ignored, full_table_id
+                )
+
+            partition = ", ".join(f"`{key}`" for key in key_columns)
+            window = f"PARTITION BY {partition}" + (
+                f" ORDER BY {order_by}" if order_by else ""
+            )
+            on = " AND ".join(
+                f"target.`{key}` = staging.`{key}`" for key in key_columns
+            )
+            update = ", ".join(
+                f"`{column}` = staging.`{column}`"
+                for column in columns
+                if column not in key_columns
+            )
+            insert = ", ".join(f"`{column}`" for column in columns)
+            values = ", ".join(f"staging.`{column}`" for column in columns)
+
+            query = f"""
+            MERGE `{full_table_id}` AS target
+            USING (
+                SELECT * FROM `{staging_table_id}`
+                WHERE TRUE
+                QUALIFY ROW_NUMBER() OVER ({window}) = 1
+            ) AS staging
+            ON {on}
+            {f"WHEN MATCHED THEN UPDATE SET {update}" if update else ""}
+            WHEN NOT MATCHED THEN INSERT ({insert}) VALUES ({values})
+            """
+            merge_job = self.client.query(query)
+            merge_job.result()
+
+            log.success(
+                "Merged '{}' into '{}'. Rows affected: {}",
+                staging_table_id,
+                full_table_id,
+                merge_job.num_dml_affected_rows,
+            )
+            return merge_job.num_dml_affected_rows or 0
+
+        finally:
+            self.client.delete_table(staging_table_id, not_found_ok=True)
+
+    def upsert(
+        self,
+        df: Union[pa.Table, pd.DataFrame],
+        full_table_id: str,
+        key_columns: List[str],
+    ) -> int:
+        """
+        Insert or update the rows of a DataFrame in a BigQuery table. Only the rows of `df` are
+        loaded, into a staging table that is MERGEd server-side, so the cost scales with the change
+        and re-running the same upsert is idempotent.
+
+        Args:
+            df (pa.Table | pd.DataFrame): The changed rows. Later duplicates of a key win. An Arrow
+                                          table is loaded with its own schema.
+            full_table_id (str): The table to upsert into, created from `df` if missing.
+            key_columns (list): The columns identifying a row, e.g. ['location_id'].
+
+        Returns:
+            int: Number of target rows inserted or updated.
+        """
+        if isinstance(df, pa.Table):
+            return self._upsert_arrow(df, full_table_id, key_columns)
+
+        if df.empty:
+            log.info("Nothing to upsert into '{}'.", full_table_id)
+            return 0
+
+        df = df.drop_duplicates(subset=key_columns, keep="last")
+
+        try:
+            if not self.table_exists(full_table_id):
+                log.info("Creating '{}' from {} upserted rows.", full_table_id, len(df))
+                self.client.load_table_from_dataframe(df, full_table_id).result()
+                return len(df)
+
+            # Load with the target types, so the MERGE does not depend on type autodetection
+            target_schema = self.client.get_table(full_table_id).schema
+            job_config = bigquery.LoadJobConfig(
+                schema=[field for field in target_schema if field.name in df.columns],
+                write_disposition="WRITE_TRUNCATE",
+            )
+            staging_table_id = f"{full_table_id}__staging_{uuid.uuid4().hex}"
+            self.client.load_table_from_dataframe(
+                df, staging_table_id, job_config=job_config
+            ).result()
+
+            return self._merge_staging(staging_table_id, full_table_id, key_columns)
+
+        except GoogleAPIError as api_error:
+            log.error("Google API Error during upsert: {}", api_error)
+            raise
+        except Exception:
+            log.exception("An unexpected error occurred during upsert.")
+            raise
+
+    def _upsert_arrow(
+        self, table: pa.Table, full_table_id: str, key_columns: List[str]
+    ) -> int:
+        """Upsert an Arrow table, see `upsert`."""
+        if table.num_rows == 0:
+            log.info("Nothing to upsert into '{}'.", full_table_id)
+            return 0
+
+        # Keep the last row of every key
+        last_rows = {
+            key: index
+            for index, key in enumerate(
+                zip(*(table.column(column).to_pylist() for column in key_columns))
+            )
+        }
+        table = table.take(sorted(last_rows.values()))
+
+        if not self.table_exists(full_table_id):
+            log.info(
+                "Creating '{}' from {} upserted rows.", full_table_id, table.num_rows
+            )
+            self.upload_table(table, full_table_id, "WRITE_EMPTY", schema=table.schema)
+            return table.num_rows
+
+        staging_table_id = f"{full_table_id}__staging_{uuid.uuid4().hex}"
+        self.upload_table(
+            table, staging_table_id, "WRITE_TRUNCATE", schema=table.schema
+        )
+        return self._merge_staging(staging_table_id, full_table_id, key_columns)
+
+    def upsert_parquet(
+        self,
+        file_path: str,
+        full_table_id: str,
+        key_columns: List[str],
+        schema: Optional[pa.Schema] = None,
+        order_by: Optional[str] = None,
+    ) -> int:
+        """
+        Insert or update the rows of a Parquet file in a BigQuery table, like `upsert`.
+        Rows of the file sharing a key are deduped by `order_by`.
+
+        Args:
+            file_path (str): Path to the Parquet file of changed rows.
+            full_table_id (str): The table to upsert into, created from the schema, or from the
+                                 file without one, if missing.
+            key_columns (list): The columns identifying a row, e.g. ['location_id'].
+            schema (pa.Schema): The schema of the file, see `upload_parquet_to_bq`.
+            order_by (str): The row kept for a duplicated key, see `_merge_staging`.
+
+        Returns:
+            int: Number of target rows inserted or updated.
+        """
+        if not self.table_exists(full_table_id):
+            if schema is None:
+                self.upload_parquet_to_bq(
+                    file_path, full_table_id, "WRITE_EMPTY", schema
+                )
+                return self.client.get_table(full_table_id).num_rows
+            # Created empty, so even the first file goes through the deduping MERGE
+            self.create_table(full_table_id, bigquery_schema(schema))
+
+        staging_table_id = f"{full_table_id}__staging_{uuid.uuid4().hex}"
+        try:
+            self.upload_parquet_to_bq(
+                file_path, staging_table_id, "WRITE_TRUNCATE", schema
+            )
+            return self._merge_staging(
+                staging_table_id, full_table_id, key_columns, order_by
+            )
+
+        except GoogleAPIError as api_error:
+            log.error("Google API Error during upsert: {}", api_error)
+            raise
+
+    def write_updated_copy(
+        self,
+        table: pa.Table,
+        source_table_id: str,
+        full_table_id: str,
+        key_columns: List[str],
+    ) -> int:
+        """
+        Overwrite a table with a copy of a source table whose rows are updated by the rows of
+        `table` sharing their key. Rows of the source sharing a key are deduped, and the non-null
+        values of `table` overwrite the source values of its columns. Only `table` is loaded, into
+        a staging table joined server-side, and the source table is left untouched.
+
+        Args:
+            table (pa.Table): The updated rows, loaded with their own schema.
+            source_table_id (str): The table to copy.
+            full_table_id (str): The table written with WRITE_TRUNCATE.
+            key_columns (list): The columns identifying a row, e.g. ['location_id'].
+
+        Returns:
+            int: Number of rows written.
+        """
+        staging_table_id = f"{full_table_id}__staging_{uuid.uuid4().hex}"
+        try:
+            self.upload_table(
+                table, staging_table_id, "WRITE_TRUNCATE", schema=table.schema
+            )
+
+            source_columns = {
+                field.name for field in self.client.get_table(source_table_id).schema
+            }
+            replace = ", ".join(
+                f"COALESCE(updates.`{column}`, source.`{column}`) AS `{column}`"
+                for column in table.column_names
+                if column in source_columns and column not in key_columns
+            )
+            partition = ", ".join(f"`{key}`" for key in key_columns)
+
+            query = f"""
+            SELECT source.* {f"REPLACE ({replace})" if replace else ""}
+            FROM (
+                SELECT * FROM `{source_table_id}`
+                WHERE TRUE
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY {partition}) = 1
+            ) AS source
+            LEFT JOIN (
+                SELECT * FROM `{staging_table_id}`
+                WHERE TRUE
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY {partition}) = 1
+            ) AS updates
+            USING ({partition})
+            """
+            job_config = bigquery.QueryJobConfig(
+                destination=full_table_id, write_disposition="WRITE_TRUNCATE"
+            )
+            rows = self.client.query(query, job_config=job_config).result().total_rows
+
+            log.success(
+                "Wrote '{}' to '{}' with the updated rows. Rows written: {}",
+                source_table_id,
+                full_table_id,
+                rows,
+            )
+            return rows or 0
+
+        except GoogleAPIError as api_error:
+            log.error("Google API Error during copy: {}", api_error)
+            raise
+        finally:
+            self.client.delete_table(staging_table_id, not_found_ok=True)
+
+    @staticmethod
+    def _parquet_load_config(
+        write_disposition: str, schema: Optional[pa.Schema] = None
+    ) -> bigquery.LoadJobConfig:
+        """Load job config of a Parquet file, with an explicit schema when one is given."""
+        parquet_options = bigquery.ParquetOptions()
+        # Parquet LIST columns load as REPEATED fields, not as nested list.element records
+        parquet_options.enable_list_inference = True
+
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=write_disposition,
+            parquet_options=parquet_options,
+        )
+        if schema is not None:
+            job_config.schema = bigquery_schema(schema)
+        return job_config
+
     def upload_parquet_to_bq(
-        self, file_path: str, full_table_id: str, write_disposition="WRITE_TRUNCATE"
+        self,
+        file_path: str,
+        full_table_id: str,
+        write_disposition="WRITE_TRUNCATE",
+        schema: Optional[pa.Schema] = None,
     ) -> None:
         """
         Upload a Parquet file to a specified BigQuery table.
@@ -89,6 +692,8 @@ class BigQueryHandler:
             write_disposition (str): Defines the write behavior when data already exists.
                                         Options: 'WRITE_TRUNCATE', 'WRITE_APPEND', 'WRITE_EMPTY'.
                                         Default: 'WRITE_TRUNCATE'.
+            schema (pa.Schema): The Arrow schema of the file, from `tripadvisor.schema`, loaded
+                                as the table schema. Default: None, autodetected.
         """
         try:
             log.info(
@@ -97,10 +702,7 @@ class BigQueryHandler:
                 full_table_id,
             )
 
-            job_config = bigquery.LoadJobConfig(
-                source_format=bigquery.SourceFormat.PARQUET,
-                write_disposition=write_disposition,
-            )
+            job_config = self._parquet_load_config(write_disposition, schema)
 
             with open(file_path, "rb") as file:
                 load_job = self.client.load_table_from_file(
@@ -125,13 +727,94 @@ class BigQueryHandler:
             log.exception("An unexpected error occurred during file upload.")
             raise
 
-    def create_table(self, full_table_id: str, schema: list) -> None:
+    def upload_table(
+        self,
+        data: Union[pa.Table, pd.DataFrame],
+        full_table_id: str,
+        write_disposition="WRITE_APPEND",
+        schema: Optional[pa.Schema] = None,
+    ) -> None:
+        """
+        Upload an Arrow table or a DataFrame to a BigQuery table, serialised to an in-memory
+        Parquet buffer, without a local file.
+
+        Args:
+            data (pa.Table | pd.DataFrame): The rows to upload.
+            full_table_id (str): The table name where the data will be uploaded.
+            write_disposition (str): Defines the write behavior when data already exists.
+                                        Options: 'WRITE_TRUNCATE', 'WRITE_APPEND', 'WRITE_EMPTY'.
+                                        Default: 'WRITE_APPEND'.
+            schema (pa.Schema): The Arrow schema from `tripadvisor.schema` the rows are cast to
+                                and loaded with. Default: None, autodetected.
+        """
+        try:
+            if isinstance(data, pd.DataFrame):
+                data = pa.Table.from_pandas(data, preserve_index=False)
+            if schema is not None:
+                data = data.select(schema.names).cast(schema)
+
+            log.info(
+                "Starting upload of {} rows to BigQuery table '{}'",
+                data.num_rows,
+                full_table_id,
+            )
+
+            buffer = io.BytesIO()
+            pq.write_table(data, buffer)
+            buffer.seek(0)
+
+            job_config = self._parquet_load_config(write_disposition, schema)
+            load_job = self.client.load_table_from_file(
+                buffer, full_table_id, job_config=job_config
+            )
+
+            load_job.result()  # Wait for the job to complete.
+            log.success(
+                "Successfully uploaded to table '{}'. Rows loaded: {}",
+                full_table_id,
+                load_job.output_rows,
+            )
+
+        except GoogleAPIError as api_error:
+            log.error("Google API Error during upload: {}", api_error)
+            raise
+        except Exception:
+            log.exception("An unexpected error occurred during upload.")
+            raise
+
+    def open_append_stream(self, full_table_id: str) -> "ArrowAppendStream":
+        """
+        Open a Storage Write API stream appending Arrow record batches to an existing table.
+
+        Args:
+            full_table_id (str): The table to append to, as 'project.dataset.table'.
+        """
+        project_id, dataset_id, table_id = full_table_id.split(".")
+        stream_name = (
+            f"{self.write_client.table_path(project_id, dataset_id, table_id)}"
+            "/streams/_default"
+        )
+        # The Arrow schema BigQuery reads the table with is the one appends must match
+        table = self.client.get_table(full_table_id)
+        schema = self.client.list_rows(table, max_results=0).to_arrow().schema
+        return ArrowAppendStream(self.write_client, stream_name, schema)
+
+    def create_table(
+        self,
+        full_table_id: str,
+        schema: list,
+        partition_field: Optional[str] = None,
+        clustering_fields: Optional[List[str]] = None,
+    ) -> None:
         """
         Creates a BigQuery table with a specified schema.
 
         Args:
             full_table_id (str): The table name to create.
             schema (list): List of bigquery.SchemaField objects defining the table schema.
+            partition_field (str): DATE or TIMESTAMP column partitioning the table by day.
+                                   Default: None, not partitioned.
+            clustering_fields (list): Columns clustering the table. Default: None.
         """
         try:
             log.info(
@@ -141,6 +824,12 @@ class BigQueryHandler:
             )
 
             table = bigquery.Table(full_table_id, schema=schema)
+            if partition_field:
+                table.time_partitioning = bigquery.TimePartitioning(
+                    type_=bigquery.TimePartitioningType.DAY, field=partition_field
+                )
+            if clustering_fields:
+                table.clustering_fields = clustering_fields
             table = self.client.create_table(table)
 
             log.success("Created table '{}'", full_table_id)
@@ -151,3 +840,183 @@ class BigQueryHandler:
         except Exception as e:
             log.exception("An unexpected error occurred during table creation.")
             raise
+
+    def needs_migration(self, full_table_id: str, schema: pa.Schema) -> bool:
+        """
+        Whether an existing table is not in the layout of a registry schema yet, e.g. a table
+        created by an autodetected load. Loads with the registry schema are rejected by it.
+
+        Args:
+            full_table_id (str): The table to check, missing tables need no migration.
+            schema (pa.Schema): The schema from `tripadvisor.schema` written to the table.
+        """
+        try:
+            table = self.client.get_table(full_table_id)
+        except NotFound:
+            return False
+        return not schema_matches(table.schema, schema)
+
+    def migrate_table(self, full_table_id: str, schema: pa.Schema) -> bool:
+        """
+        Rewrite a table into the layout of a registry schema: list columns stored as
+        `list.element` records become REPEATED fields, string review dates become dates and
+        missing fields are added as nulls. The table is copied to a `__backup_<timestamp>`
+        table first, and keeps its partitioning and clustering.
+
+        Args:
+            full_table_id (str): The table to migrate.
+            schema (pa.Schema): The schema from `tripadvisor.schema` written to the table.
+
+        Returns:
+            bool: Whether the table was migrated, False if it was up to date or missing.
+        """
+        if not self.needs_migration(full_table_id, schema):
+            log.info("Table '{}' is up to date.", full_table_id)
+            return False
+
+        try:
+            table = self.client.get_table(full_table_id)
+            backup_table_id = (
+                f"{full_table_id}__backup_{datetime.now(timezone.utc):%Y%m%d%H%M%S}"
+            )
+            self.client.copy_table(full_table_id, backup_table_id).result()
+            log.info("Backed up '{}' to '{}'", full_table_id, backup_table_id)
+
+            options = []
+            partitioning = table.time_partitioning
+            if partitioning is not None and partitioning.field:
+                partition_type = next(
+                    field.field_type
+                    for field in table.schema
+                    if field.name == partitioning.field
+                )
+                options.append(
+                    f"PARTITION BY {partitioning.field}"
+                    if partition_type == "DATE"
+                    else f"PARTITION BY DATE({partitioning.field})"
+                )
+            if table.clustering_fields:
+                options.append(f"CLUSTER BY {', '.join(table.clustering_fields)}")
+
+            query = f"""
+            CREATE OR REPLACE TABLE `{full_table_id}`
+            {" ".join(options)}
+            AS {migration_select(full_table_id, table.schema, schema)}
+            """
+            self.client.query(query).result()
+
+            log.success("Migrated '{}' to the registry schema.", full_table_id)
+            return True
+
+        except GoogleAPIError as api_error:
+            log.error("Google API Error during migration: {}", api_error)
+            raise
+
+
+class ArrowAppendStream:
+    """
+    Append Arrow record batches to a BigQuery table through the default stream of the Storage
+    Write API. Appended rows are committed as soon as each request is acknowledged, so rows can
+    be written as they are produced, without a load job or a local file. The batches must match
+    the table column types.
+    """
+
+    # Requests are capped at 10 MB, keep some room for the request envelope
+    MAX_REQUEST_BYTES = 8 * 1024**2
+
+    def __init__(
+        self,
+        write_client: bigquery_storage_v1.BigQueryWriteClient,
+        stream_name: str,
+        schema: pa.Schema,
+    ):
+        """
+        Initialize the ArrowAppendStream. The connection is opened on the first append.
+
+        Args:
+            write_client (BigQueryWriteClient): The Storage Write API client.
+            stream_name (str): The write stream, e.g. the `_default` stream of a table.
+            schema (pa.Schema): The Arrow schema of the table.
+        """
+        self.write_client = write_client
+        self.stream_name = stream_name
+        self.schema = schema
+        self.rows_appended = 0
+        # First failed append, raised by every later flush since its rows are lost
+        self.error: Optional[BaseException] = None
+        self._stream: Optional[writer.AppendRowsStream] = None
+        self._futures: List[writer.AppendRowsFuture] = []
+
+    def _open(self):
+        template = types.AppendRowsRequest(
+            write_stream=self.stream_name,
+            arrow_rows=types.AppendRowsRequest.ArrowData(
+                writer_schema=types.ArrowSchema(
+                    serialized_schema=self.schema.serialize().to_pybytes()
+                )
+            ),
+        )
+        self._stream = writer.AppendRowsStream(self.write_client, template)
+
+    def _split(self, batch: pa.RecordBatch) -> Iterator[pa.RecordBatch]:
+        if batch.nbytes <= self.MAX_REQUEST_BYTES or batch.num_rows == 1:
+            yield batch
+            return
+
+        half = batch.num_rows // 2
+        yield from self._split(batch.slice(0, half))
+        yield from self._split(batch.slice(half))
+
+    def append(self, data: Union[pa.Table, pa.RecordBatch]):
+        """
+        Send rows to the stream without waiting for their acknowledgement.
+
+        Args:
+            data (pa.Table | pa.RecordBatch): The rows to append, cast to the table schema.
+        """
+        if self._stream is None:
+            self._open()
+
+        data = data.select(self.schema.names).cast(self.schema)
+        batches = data.to_batches() if isinstance(data, pa.Table) else [data]
+        for batch in batches:
+            for chunk in self._split(batch):
+                request = types.AppendRowsRequest(
+                    arrow_rows=types.AppendRowsRequest.ArrowData(
+                        rows=types.ArrowRecordBatch(
+                            serialized_record_batch=chunk.serialize().to_pybytes(),
+                            row_count=chunk.num_rows,
+                        )
+                    )
+                )
+                self._futures.append(self._stream.send(request))
+                self.rows_appended += chunk.num_rows
+
+    def flush(self):
+        """Wait for every pending append, raising the first failure of the stream."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                self.error = self.error or e
+
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Wait for the pending appends and close the connection."""
+        try:
+            self.flush()
+            log.success(
+                "Appended {} rows to '{}'", self.rows_appended, self.stream_name
+            )
+        finally:
+            if self._stream is not None:
+                self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,317 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger as log
+
+from tripadvisor._constants import (
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_PATH,
+    HTTP_CACHE_TTLS,
+    QUERY_CACHE_MAX_BYTES,
+    QUERY_CACHE_PATH,
+)
+
+# Query parameters that never change the response, e.g. the Content API key
+IGNORED_QUERY_PARAMS = {"key"}
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a request is not in the response cache."""
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    url: str
+    content: bytes
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL into its cache key form: lowercase scheme and host, no fragment
+    (it is never sent to the server), sorted query and no credentials in the query.
+
+    Args:
+        url (str): The URL to normalize.
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in IGNORED_QUERY_PARAMS
+    )
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), "")
+    )
+
+
+def endpoint_of(url: str) -> str:
+    """
+    Classify a URL into one of the HTTP_CACHE_TTLS endpoints.
+
+    Args:
+        url (str): The URL to classify.
+    """
+    path = urlsplit(url).path
+    if path.endswith("/nearby_search"):
+        return "nearby_search"
+    if path.endswith("/details"):
+        return "location_details"
+    if re.search(r"-Reviews-or\d+-", path):
+        return "review_page"
+    if "Restaurant_Review" in path:
+        return "restaurant_page"
+    return "default"
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of compressed HTTP response bodies.
+    Entries are keyed by the hash of the normalized URL, expire after a per-endpoint TTL and
+    are evicted least-recently-used once the cache grows over `max_bytes`.
+    In replay mode every request must be served from the cache, TTLs are ignored and a
+    miss raises CacheMiss instead of going to the network.
+    """
+
+    def __init__(
+        self,
+        path: str = HTTP_CACHE_PATH,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        replay: bool = False,
+    ):
+        """
+        Initialize the ResponseCache.
+
+        Args:
+            path (str): Path to the SQLite cache file. Default: HTTP_CACHE_PATH.
+            max_bytes (int): Maximum size of the compressed bodies. Default: HTTP_CACHE_MAX_BYTES.
+            replay (bool): Serve requests only from the cache.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS response (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                final_url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS response_accessed_at ON response (accessed_at);
+            """
+        )
+        self.connection.commit()
+        # Running size of the stored bodies, so a put does not scan the whole table
+        self.total_bytes = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM response"
+        ).fetchone()[0]
+
+    @staticmethod
+    def key_of(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Return the cached response of a URL, or None if it is missing or expired.
+
+        Args:
+            url (str): The requested URL.
+
+        Raises:
+            CacheMiss: In replay mode, if the URL is not cached.
+        """
+        key = self.key_of(url)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT status_code, final_url, body, stored_at FROM response WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            ttl = HTTP_CACHE_TTLS.get(endpoint_of(url), HTTP_CACHE_TTLS["default"])
+            if row is None or (not self.replay and row[3] + ttl < time.time()):
+                self.misses += 1
+                if self.replay:
+                    raise CacheMiss(f"Not in response cache: {url}")
+                return None
+
+            self.hits += 1
+            self.connection.execute(
+                "UPDATE response SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self.connection.commit()
+
+        return CachedResponse(row[0], row[1], zlib.decompress(row[2]))
+
+    def put(self, url: str, status_code: int, final_url: str, content: bytes) -> None:
+        """
+        Store a response body, then evict the least recently used entries if needed.
+
+        Args:
+            url (str): The requested URL.
+            status_code (int): The HTTP status of the response.
+            final_url (str): The URL after redirects.
+            content (bytes): The response body.
+        """
+        body = zlib.compress(content)
+        key = self.key_of(url)
+        now = time.time()
+        with self._lock:
+            replaced = self.connection.execute(
+                "SELECT size FROM response WHERE key = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    normalize_url(url),
+                    endpoint_of(url),
+                    status_code,
+                    final_url,
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self.total_bytes += len(body) - (replaced[0] if replaced else 0)
+            self._evict()
+            self.connection.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        evicted = 0
+        while self.total_bytes > self.max_bytes:
+            # Oldest entries first, read through the accessed_at index a few at a time
+            rows = self.connection.execute(
+                "SELECT key, size FROM response ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self.connection.execute("DELETE FROM response WHERE key = ?", (key,))
+                self.total_bytes -= size
+                evicted += 1
+
+        if evicted:
+            log.debug(f"Evicted {evicted} entries from the response cache.")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "replay": self.replay}
+
+    def close(self) -> None:
+        log.info("Closed response cache: {}", self.stats())
+        self.connection.close()
+
+
+class QueryCache:
+    """
+    On-disk cache of BigQuery query results, one Parquet file per entry.
+    Entries are keyed by the hash of the normalized SQL and the `modified` timestamps of the
+    tables it reads, so a result is reused until one of its tables changes. Entries are evicted
+    least-recently-used once the cache grows over `max_bytes`.
+    """
+
+    def __init__(
+        self, path: str = QUERY_CACHE_PATH, max_bytes: int = QUERY_CACHE_MAX_BYTES
+    ):
+        """
+        Initialize the QueryCache.
+
+        Args:
+            path (str): Directory of the cached results. Default: QUERY_CACHE_PATH.
+            max_bytes (int): Maximum size of the cached results. Default: QUERY_CACHE_MAX_BYTES.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_of(query: str, table_versions: Dict[str, str]) -> str:
+        versions = "\n".join(
+            f"{table}@{table_versions[table]}" for table in sorted(table_versions)
+        )
+        return hashlib.sha256(f"{query}\n{versions}".encode()).hexdigest()
+
+    def _path_of(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.parquet")
+
+    def get(self, key: str) -> Optional[pa.Table]:
+        """
+        Return the cached result of a key, or None if it is missing.
+
+        Args:
+            key (str): The key from `key_of`.
+        """
+        path = self._path_of(key)
+        try:
+            table = pq.read_table(path)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        os.utime(path)  # Mark as recently used
+        return table
+
+    def put(self, key: str, table: pa.Table) -> None:
+        """
+        Store a query result, then evict the least recently used entries if needed.
+
+        Args:
+            key (str): The key from `key_of`.
+            table (pa.Table): The query result.
+        """
+        path = self._path_of(key)
+        pq.write_table(table, f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".parquet"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            evicted += 1
+
+        if evicted:
+            log.debug(f"Evicted {evicted} entries from the query cache.")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger as log
+
+from tripadvisor._constants import SCRAPE_CHECKPOINT_BYTES, SCRAPE_CHECKPOINT_ROWS
+from tripadvisor.schema import build_table
+
+
+class ParquetCheckpoint:
+    """
+    Stream records to Parquet part files as they complete, so a crash only loses the records
+    buffered since the last flush. Each flush writes one row group to its own part file, renamed
+    into place once complete, and appends a line to an append-only journal. A run restarted on the
+    same directory replays the journal, skips the keys it already holds and resumes after the last
+    committed part.
+    """
+
+    JOURNAL = "journal.jsonl"
+
+    def __init__(
+        self,
+        directory: str,
+        key: str = "location_id",
+        flush_rows: int = SCRAPE_CHECKPOINT_ROWS,
+        flush_bytes: int = SCRAPE_CHECKPOINT_BYTES,
+        schema: Optional[pa.Schema] = None,
+        before_commit: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize the ParquetCheckpoint, resuming from the journal of `directory` if any.
+
+        Args:
+            directory (str): Directory of the part files and the journal.
+            key (str): Record field identifying a finished unit of work. Default: 'location_id'.
+            flush_rows (int): Flush after this many buffered records. Default: SCRAPE_CHECKPOINT_ROWS.
+            flush_bytes (int): Flush after this many buffered bytes, estimated from the text size
+                               of the records. Default: SCRAPE_CHECKPOINT_BYTES.
+            schema (pa.Schema): Schema of the part files, from `tripadvisor.schema`, so every
+                                part has the same column types. Default: None, inferred.
+            before_commit (Callable): Called before a part is written, e.g. to wait until data
+                                      the records depend on is stored. If it raises, the records
+                                      stay buffered and are not committed. Default: None.
+        """
+        self.directory = directory
+        self.key = key
+        self.flush_rows = flush_rows
+        self.flush_bytes = flush_bytes
+        self.schema = schema
+        self.before_commit = before_commit
+
+        self.done: Set[str] = set()
+        self.parts: List[str] = []
+        self.uploaded: Set[str] = set()
+        self._buffer: List = []
+        self._buffer_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._replay()
+
+        if self.parts:
+            log.info(
+                f"Resuming checkpoint {directory}: {len(self.parts)} parts, {len(self.done)} records done."
+            )
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _replay(self):
+        """Rebuild the committed parts from the journal, dropping a torn last line."""
+        if not os.path.exists(self._path(self.JOURNAL)):
+            return
+
+        with open(self._path(self.JOURNAL), "r+b") as journal:
+            lines = journal.read().split(b"\n")
+            if lines[-1]:
+                log.warning(f"Dropping a torn journal line in {self.directory}")
+                journal.truncate(journal.tell() - len(lines[-1]))
+
+            for line in lines[:-1]:
+                entry = json.loads(line)
+                if entry["event"] == "commit" and os.path.exists(
+                    self._path(entry["part"])
+                ):
+                    self.parts.append(entry["part"])
+                    self.done.update(entry["keys"])
+                elif entry["event"] == "upload":
+                    self.uploaded.add(entry["part"])
+
+    def _append_journal(self, entry: Dict):
+        with open(self._path(self.JOURNAL), "a", encoding="utf-8") as journal:
+            journal.write(json.dumps(entry) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def _key_of(self, record) -> str:
+        if isinstance(record, dict):
+            return str(record[self.key])
+        return str(getattr(record, self.key))
+
+    def write(self, record):
+        """
+        Buffer a record and flush a part file once a threshold is reached.
+
+        Args:
+            record (Location | dict): The record, holding its `key` field.
+        """
+        self._buffer.append(record)
+        # Records are sized from their repr, which is about as long as their JSON
+        self._buffer_bytes += len(
+            json.dumps(record, default=str)
+            if isinstance(record, dict)
+            else repr(record)
+        )
+
+        if (
+            len(self._buffer) >= self.flush_rows
+            or self._buffer_bytes >= self.flush_bytes
+        ):
+            self.flush()
+
+    def flush(self) -> Optional[str]:
+        """
+        Write the buffered records as one part file and commit it in the journal.
+
+        Returns:
+            str: The committed part file name, None if the buffer was empty.
+        """
+        if not self._buffer:
+            return None
+
+        if self.before_commit is not None:
+            self.before_commit()
+
+        part = f"part-{len(self.parts):05d}.parquet"
+        tmp_path = self._path(f"{part}.tmp")
+        table = (
+            build_table(self._buffer, self.schema)
+            if self.schema is not None
+            else pa.Table.from_pylist(self._buffer)
+        )
+
+        with pq.ParquetWriter(tmp_path, table.schema) as writer:
+            writer.write_table(table, row_group_size=len(self._buffer))
+        with open(tmp_path, "rb") as file:
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self._path(part))
+
+        keys = [self._key_of(record) for record in self._buffer]
+        self._append_journal({"event": "commit", "part": part, "keys": keys})
+        self.parts.append(part)
+        self.done.update(keys)
+
+        log.info(f"Checkpointed {len(keys)} records to {self._path(part)}")
+        self._buffer, self._buffer_bytes = [], 0
+        return part
+
+    def pending_uploads(self) -> Iterator[str]:
+        """Yield the paths of the committed parts not uploaded yet."""
+        for part in self.parts:
+            if part not in self.uploaded:
+                yield self._path(part)
+
+    def mark_uploaded(self, path: str):
+        """
+        Record in the journal that a part file was loaded downstream.
+
+        Args:
+            path (str): Path of the part file, from `pending_uploads`.
+        """
+        part = os.path.basename(path)
+        self._append_journal({"event": "upload", "part": part})
+        self.uploaded.add(part)
+
+    def close(self):
+        """Flush the buffered records."""
+        self.flush()
+
+    def remove(self):
+        """Delete the checkpoint directory once every part was uploaded."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __len__(self):
+        return len(self.done) + len(self._buffer)
@@ -1,18 +1,66 @@
 import asyncio
 import os
 import warnings
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import fsspec
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from loguru import logger as log
 
-from tripadvisor._constants import AWS_CREDENTIALS, AWS_S3_BUCKET, SCRAPE_DELAY
-from tripadvisor.api.content import TripAdvisorContentAPI
+from tripadvisor._constants import (
+    API_CONCURRENCY,
+    API_NEARBY_RADIUS_KM,
+    AWS_CREDENTIALS,
+    AWS_S3_BUCKET,
+    BACKFILL_CHUNK_ROWS,
+    BACKFILL_MAX_BUFFER_BYTES,
+    HTTP_CACHE_PATH,
+    LOCATION_INDEX_PATH,
+    QUERY_CACHE_PATH,
+    SCRAPE_BURST,
+    SCRAPE_CHECKPOINT_BYTES,
+    SCRAPE_CHECKPOINT_DIR,
+    SCRAPE_CHECKPOINT_ROWS,
+    SCRAPE_CONCURRENCY,
+    SCRAPE_MAX_REQUESTS_PER_SECOND,
+    SCRAPE_MIN_REQUESTS_PER_SECOND,
+    SCRAPE_PARSE_WORKERS,
+    SCRAPE_PARSER_BACKEND,
+    SCRAPE_PREFETCH_PAGES,
+    SCRAPE_REFRESH_CHUNK_ROWS,
+    SCRAPE_REQUESTS_PER_SECOND,
+)
+from tripadvisor.api.content import AsyncTripAdvisorContentAPI
+from tripadvisor.api.planner import CoveragePlanner
 from tripadvisor.api.rapid import TripAdvisorRapidAPI
 from tripadvisor.bigquery import BigQueryHandler
+from tripadvisor.cache import QueryCache, ResponseCache
+from tripadvisor.checkpoint import ParquetCheckpoint
 from tripadvisor.parser import TripAdvisorParser
-from tripadvisor.scrape.core import parse_reviews, scrape_url
+from tripadvisor.ratelimit import AdaptiveRateLimiter
+from tripadvisor.records import Location, Review
+from tripadvisor.retry import CircuitBreaker, CircuitOpen
+from tripadvisor.reviews import ReviewSink, ReviewTableWriter, fetch_latest_fingerprints
+from tripadvisor.schema import (
+    API_INFO_SCHEMA,
+    LOCATION_SUMMARY_SCHEMA,
+    REVIEW_ROW_SCHEMA,
+    SCRAPE_INFO_SCHEMA,
+    bigquery_schema,
+    build_table,
+)
+from tripadvisor.scrape.core import (
+    ReviewHistory,
+    merge_reviews,
+    parse_reviews,
+    resolve_location_url,
+    scrape_url,
+)
+from tripadvisor.scrape.engine import ScrapeEngine
+from tripadvisor.scrape.index import LocationIndex
+from tripadvisor.scrape.utils import LocationNotFound, ScrapeSession
 
 
 class TripAdvisorDataFetcher:
@@ -24,6 +72,15 @@ class TripAdvisorDataFetcher:
         credentials_path: str,
         api_key_env_var: str,
         rapid_api_key_env: str,
+        location_index_path: str = LOCATION_INDEX_PATH,
+        http_cache: bool = False,
+        replay: bool = False,
+        http_cache_path: str = HTTP_CACHE_PATH,
+        query_cache: bool = False,
+        query_cache_path: str = QUERY_CACHE_PATH,
+        requests_per_second: float = SCRAPE_REQUESTS_PER_SECOND,
+        min_requests_per_second: float = SCRAPE_MIN_REQUESTS_PER_SECOND,
+        max_requests_per_second: float = SCRAPE_MAX_REQUESTS_PER_SECOND,
     ):
         """
         Initialize the TripAdvisorDataFetcher.
@@ -35,6 +92,15 @@ class TripAdvisorDataFetcher:
             credentials_path (str): Path to service account JSON key file.
             api_key_env_var (str): env name for TripAdvisor API key.
             rapid_api_key_env (str): env name for RapidAPI key.
+            location_index_path (str): Path to the location_id -> URL index file.
+            http_cache (bool): Record TripAdvisor pages and API responses in the response cache.
+            replay (bool): Serve every request from the response cache, without network.
+            http_cache_path (str): Path to the response cache file.
+            query_cache (bool): Reuse BigQuery query results while their tables are unchanged.
+            query_cache_path (str): Directory of the query result cache.
+            requests_per_second (float): Initial request rate to TripAdvisor.
+            min_requests_per_second (float): Floor of the adaptive request rate.
+            max_requests_per_second (float): Ceiling of the adaptive request rate.
         """
         log.info("Initializing TripAdvisorDataFetcher...")
 
@@ -43,18 +109,36 @@ class TripAdvisorDataFetcher:
         else:
             self.project_id = project_id
 
-        self.bigquery = BigQueryHandler(self.project_id, credentials_path)
+        self.bigquery = BigQueryHandler(
+            self.project_id,
+            credentials_path,
+            query_cache=QueryCache(query_cache_path) if query_cache else None,
+        )
         self.geo_dataset_id = geo_dataset_id
         self.geo_table_id = geo_table_id
         self.api_key = os.getenv(api_key_env_var)
         self.rapid_api_key = os.getenv(rapid_api_key_env)
+        self.location_index = LocationIndex(location_index_path)
+        self.cache = (
+            ResponseCache(http_cache_path, replay=replay)
+            if http_cache or replay
+            else None
+        )
+
+        # Every request to the TripAdvisor website shares one adaptive budget
+        self.rate_limiter = AdaptiveRateLimiter(
+            requests_per_second,
+            SCRAPE_BURST,
+            min_rate=min_requests_per_second,
+            max_rate=max_requests_per_second,
+        )
+        # and one breaker pausing them all when TripAdvisor keeps answering 403
+        self.breaker = CircuitBreaker()
 
         if self.rapid_api_key:
             self.tripadvisor_rapid = TripAdvisorRapidAPI(self.rapid_api_key)
 
-        if self.api_key:
-            self.tripadvisor = TripAdvisorContentAPI(self.api_key)
-        else:
+        if not self.api_key:
             log.error(f"API key not found in env: {api_key_env_var}")
             raise ValueError(f"API key not found in env: {api_key_env_var}")
 
@@ -81,30 +165,40 @@ class TripAdvisorDataFetcher:
             log.exception(e)
             raise
 
-    def fetch_scraped_locations(self, scraper_dataset_id, scraper_table_id) -> list:
+    def seed_location_index(self, scraper_dataset_id, scraper_table_id) -> int:
         """
-        Fetch scraped location data from BigQuery.
+        Seed the location URL index with the URLs of previously scraped locations.
 
         Args:
             scraper_dataset_id (str): BigQuery dataset ID containing scraped data.
             scraper_table_id (str): BigQuery table ID containing scraped data.
 
         Returns:
-            list: List of scraped location IDs.
+            int: Number of new entries in the index.
         """
         try:
-            log.info(f"Fetch scraped location: {scraper_dataset_id}.{scraper_table_id}")
+            log.info(
+                f"Seed location URL index from: {scraper_dataset_id}.{scraper_table_id}"
+            )
             query = f"""
-            SELECT DISTINCT location_id
+            SELECT DISTINCT location_id, location_url
             FROM `{self.project_id}.{scraper_dataset_id}.{scraper_table_id}`
+            WHERE location_url IS NOT NULL
             """
-            dataframe = self.bigquery.fetch_bigquery(query)
-            location_list = dataframe["location_id"].tolist()
-            log.success(f"Fetched {len(location_list)} scraped location IDs.")
-            return location_list
-        except:
-            log.error("Failed to fetch scraped data from BigQuery.")
-            return []
+            seeded = 0
+            for batch in self.bigquery.iter_record_batches(query):
+                seeded += self.location_index.put_many(
+                    zip(
+                        batch.column("location_id").to_pylist(),
+                        batch.column("location_url").to_pylist(),
+                    )
+                )
+            log.success(f"Seeded {seeded} location URLs into the index.")
+            return seeded
+        except Exception as e:
+            log.error("Failed to seed the location URL index.")
+            log.exception(e)
+            return 0
 
     def fetch_wrong_location(self, dataset_id, table_id) -> list:
         """
@@ -124,8 +218,7 @@ class TripAdvisorDataFetcher:
             FROM `{self.project_id}.{dataset_id}.{table_id}`
             WHERE REGEXP_CONTAINS(address_obj.address_string, r'_') OR REGEXP_CONTAINS(name, r'_')
             """
-            dataframe = self.bigquery.fetch_bigquery(query)
-            location_list = dataframe["location_id"].tolist()
+            location_list = self.bigquery.fetch_arrow(query)["location_id"].to_pylist()
 
             log.success(f"Fetched {len(location_list)} wrong location IDs.")
             return location_list
@@ -134,364 +227,567 @@ class TripAdvisorDataFetcher:
             log.exception(e)
             return []
 
-    def fetch_location_details(self, location_id) -> dict:
+    async def fetch_location_details(self, location_ids, api) -> list:
         """
-        Fetch location details from TripAdvisor API.
+        Fetch location details of many locations from TripAdvisor API.
 
         Args:
-            location_id (str): The location ID to fetch.
+            location_ids (list): The location IDs to fetch.
+            api (AsyncTripAdvisorContentAPI): The async Content API client.
 
         Returns:
-            dict: Location details dictionary.
+            list: Location details dictionaries of the locations fetched successfully.
         """
-        try:
-            log.info(f"Fetching location details for location ID: {location_id}")
-            location_details = self.tripadvisor.get_location_details(location_id)
+        log.info(f"Fetching location details for {len(location_ids)} location IDs")
+        location_details = await api.get_many_location_details(location_ids)
 
-            return {
+        return [
+            {
                 "location_id": location_id,
-                "name": location_details["name"],
+                "name": details["name"],
                 "distance": "0.00000000000000000",
                 "bearing": "none",
-                "address_obj": location_details["address_obj"],
+                "address_obj": details["address_obj"],
             }
+            for location_id, details in zip(location_ids, location_details)
+            if details
+        ]
 
-        except Exception as e:
-            log.error(
-                f"Failed to fetch location details for location ID: {location_id}"
-            )
-            log.exception(e)
-
-    def backfill_wrong_location(self, dataset_id, table_id, wrong_location_list):
+    async def backfill_wrong_location(
+        self,
+        dataset_id,
+        table_id,
+        wrong_location_list,
+        concurrency: int = API_CONCURRENCY,
+    ):
         """
-        Backfill wrong location data from BigQuery.
+        Backfill wrong location data from BigQuery. The table, with the details of the wrong
+        locations fetched again, is written to a `_v2` table, replacing its content.
 
         Args:
             dataset_id (str): BigQuery dataset ID containing wrong location data.
             table_id (str): BigQuery table ID containing wrong location data.
             wrong_location_list (list): List of wrong location IDs.
+            concurrency (int): Number of Content API calls in flight.
         """
+        location_results = []
         try:
             log.info(f"Backfill wrong location list from: {dataset_id}.{table_id}")
-            query = f"""
-            SELECT *
-            FROM `{self.project_id}.{dataset_id}.{table_id}`
-            """
-            original_df = self.bigquery.fetch_bigquery(query)
-            original_df.drop_duplicates(
-                subset=["location_id"], keep="first", inplace=True
-            )
-            backfill_df = original_df[
-                original_df["location_id"].isin(wrong_location_list)
-            ]
 
-            if backfill_df.empty:
+            if not wrong_location_list:
                 log.info("No wrong location to backfill.")
                 return
 
-            location_results = []
-            for location_id in wrong_location_list:
-                location_data = self.fetch_location_details(location_id)
-                location_results.append(location_data)
+            async with AsyncTripAdvisorContentAPI(
+                self.api_key, concurrency=concurrency, cache=self.cache
+            ) as api:
+                location_results = await self.fetch_location_details(
+                    wrong_location_list, api
+                )
 
         except Exception as e:
             log.error("Failed to backfill wrong location data.")
             log.exception(e)
         finally:
             if location_results and len(location_results) > 0:
-                location_df = original_df.set_index("location_id")
-                backfill_df = pd.DataFrame(location_results).set_index("location_id")
-                location_df.update(backfill_df, overwrite=True)
-
-                location_df.reset_index(inplace=True)
-                location_df.to_parquet(
-                    f"data/tripadvisor__backfill_{datetime.now().strftime('%Y%m%d')}.parquet",
-                    index=False,
-                )
-                self.bigquery.upload_parquet_to_bq(
-                    file_path=f"data/tripadvisor__backfill_{datetime.now().strftime('%Y%m%d')}.parquet",
-                    full_table_id=f"{dataset_id}.{table_id}_v2",
-                    write_disposition="WRITE_TRUNCATE",
+                # Only the fixed rows are sent, the source table is copied server-side
+                self.bigquery.write_updated_copy(
+                    build_table(location_results, API_INFO_SCHEMA),
+                    source_table_id=f"{self.project_id}.{dataset_id}.{table_id}",
+                    full_table_id=f"{self.project_id}.{dataset_id}.{table_id}_v2",
+                    key_columns=["location_id"],
                 )
 
                 log.success(f"Backfilled {len(location_results)} wrong locations.")
 
-    async def backfill_reviews(self, dataset_id, table_id):
+    async def backfill_reviews(
+        self,
+        dataset_id,
+        table_id,
+        concurrency: int = SCRAPE_CONCURRENCY,
+        prefetch_pages: int = SCRAPE_PREFETCH_PAGES,
+        parser_backend: str = SCRAPE_PARSER_BACKEND,
+        parse_workers: int = SCRAPE_PARSE_WORKERS,
+        stream_writes: bool = False,
+        keep_local: bool = False,
+        chunk_rows: int = BACKFILL_CHUNK_ROWS,
+        max_buffer_bytes: int = BACKFILL_MAX_BUFFER_BYTES,
+    ):
         """
-        Backfill reviews for locations in a BigQuery table. The function fetches data from a source table,
-        identifies locations needing review data updates, parses reviews, and appends the backfilled data
-        to a `_v2` table with a nested reviews column.
+        Backfill reviews for locations in a BigQuery table into a `_v2` table with a nested
+        reviews column. The locations not in the `_v2` table yet are streamed from BigQuery
+        and parsed in chunks, each chunk appended to the `_v2` table as it completes, so an
+        interrupted backfill resumes where it stopped. Locations without reviews are carried
+        over with null reviews.
 
         Args:
             dataset_id (str): BigQuery dataset ID containing location data.
             table_id (str): BigQuery table ID containing location data.
+            concurrency (int): Number of locations parsed at the same time.
+            prefetch_pages (int): Number of review pages kept in flight per location.
+            parser_backend (str): HTML parser backend: 'html.parser', 'lxml' or 'lexbor'.
+            parse_workers (int): Worker processes parsing pages, 0 parses on the event loop.
+            stream_writes (bool): Append chunks through the Storage Write API instead of
+                                  load jobs.
+            keep_local (bool): Also save the backfilled data to a local Parquet file.
+            chunk_rows (int): Locations parsed per chunk. Default: BACKFILL_CHUNK_ROWS.
+            max_buffer_bytes (int): Append early once the parsed rows of a chunk reach this
+                                    Arrow size. Default: BACKFILL_MAX_BUFFER_BYTES.
         """
-        parsed_reviews = []
-
-        try:
-            log.info(f"Starting backfill for {dataset_id}.{table_id}")
+        backfill_table_id = f"{self.project_id}.{dataset_id}.{table_id}_v2"
+        buffer, buffer_bytes = [], 0
+        backfilled = 0
+        append_stream = None
+        local_writer = None
+
+        # Runs in a worker thread, so uploads do not stall the parsing tasks
+        def _append_buffer():
+            nonlocal buffer, buffer_bytes, backfilled, local_writer
+            if not buffer:
+                return
 
-            backfill_table_id = f"{table_id}_v2"
-            try:
-                query = f"""
-                SELECT location_id
-                FROM `{self.project_id}.{dataset_id}.{backfill_table_id}`
-                """
-                backfilled_df = self.bigquery.fetch_bigquery(query)
-                backfilled_ids = set(backfilled_df["location_id"])
-                log.info(
-                    f"Found {len(backfilled_ids)} backfilled locations in {backfill_table_id}."
+            chunk = pa.concat_tables(buffer).combine_chunks()
+            buffer, buffer_bytes = [], 0
+            if append_stream:
+                append_stream.append(chunk)
+                # Wait for the acknowledgement, so a resumed run skips these locations
+                append_stream.flush()
+            else:
+                self.bigquery.upload_table(
+                    chunk,
+                    full_table_id=backfill_table_id,
+                    write_disposition="WRITE_APPEND",
+                    schema=SCRAPE_INFO_SCHEMA,
                 )
-            except Exception:
-                log.warning(
-                    f"{backfill_table_id} does not exist. Proceeding with full backfill."
+
+            if keep_local:
+                local_writer = local_writer or pq.ParquetWriter(
+                    f"data/tripadvisor__backfill_{datetime.now().strftime('%Y%m%d')}.parquet",
+                    SCRAPE_INFO_SCHEMA,
                 )
-                backfilled_ids = set()
+                local_writer.write_table(chunk)
 
-            query = f"""
-            SELECT * EXCEPT (reviews)
-            FROM `{self.project_id}.{dataset_id}.{table_id}`
-            WHERE review_count_scraped > 0
-            """
-            original_df = self.bigquery.fetch_bigquery(query)
+            backfilled += chunk.num_rows
+            log.info(f"Backfilled {backfilled} locations so far.")
 
-            # Identify locations not backfilled
-            original_ids = set(original_df["location_id"])
-            locations_to_backfill = original_ids - backfilled_ids
+        async def _backfill_location(location: Location) -> Location:
+            if not location.review_count_scraped:
+                location.reviews = None
+                return location
 
-            if not locations_to_backfill:
-                log.info("No new locations to backfill reviews.")
-                return
+            try:
+                log.info(f"Parsing reviews for location_id={location.location_id}")
+                location.reviews = await parse_reviews(
+                    location.location_url, location.review_count, session
+                )
+                return location
+            except CircuitOpen:
+                raise
+            except Exception as e:
+                # Not appended, so the next run parses it again
+                log.error(
+                    f"Error parsing reviews of location ID: {location.location_id}"
+                )
+                log.exception(e)
+                return None
 
-            log.info(f"Found {len(locations_to_backfill)} locations to backfill.")
+        if self._tables_to_migrate(dataset_id, {f"{table_id}_v2": SCRAPE_INFO_SCHEMA}):
+            return
 
-            locations_to_parse = original_df[
-                original_df["location_id"].isin(locations_to_backfill)
-            ]
-            for _, row in locations_to_parse.iterrows():
-                location_id = row["location_id"]
-                location_url = row["location_url"]
-                review_count = row["review_count"]
-                log.info(f"Parsing reviews for location_id={location_id}")
-                parsed_data = await parse_reviews(location_url, review_count)
+        try:
+            log.info(f"Starting backfill for {dataset_id}.{table_id}")
 
-                parsed_reviews.append(
-                    {**row.to_dict(), "reviews": parsed_data if parsed_data else []}
+            if not self.bigquery.table_exists(backfill_table_id):
+                self.bigquery.create_table(
+                    backfill_table_id, bigquery_schema(SCRAPE_INFO_SCHEMA)
                 )
+            if stream_writes:
+                append_stream = self.bigquery.open_append_stream(backfill_table_id)
+
+            # Locations that are not in the _v2 table yet, streamed batch by batch
+            work_list = self.bigquery.iter_work_list(
+                source_table_id=f"{self.project_id}.{dataset_id}.{table_id}",
+                done_table_id=backfill_table_id,
+                columns="source.* EXCEPT (reviews)",
+            )
 
-                await asyncio.sleep(SCRAPE_DELAY)
-
+            engine = ScrapeEngine(concurrency)
+            async with ScrapeSession(
+                rate_limiter=self.rate_limiter,
+                breaker=self.breaker,
+                prefetch_pages=prefetch_pages,
+                parser_backend=parser_backend,
+                parse_workers=parse_workers,
+                cache=self.cache,
+            ) as session:
+                # Batches are downloaded off the event loop, between chunks
+                while (
+                    batch := await asyncio.to_thread(next, work_list, None)
+                ) is not None:
+                    for offset in range(0, batch.num_rows, chunk_rows):
+                        locations = [
+                            Location.from_dict(row)
+                            for row in batch.slice(offset, chunk_rows).to_pylist()
+                        ]
+                        async for _, location in engine.map(
+                            locations, _backfill_location
+                        ):
+                            if location is None:
+                                continue
+
+                            # Parsed rows are held as Arrow, not as review records
+                            table = build_table([location], SCRAPE_INFO_SCHEMA)
+                            buffer.append(table)
+                            buffer_bytes += table.nbytes
+                            if buffer_bytes >= max_buffer_bytes:
+                                await asyncio.to_thread(_append_buffer)
+
+                        await asyncio.to_thread(_append_buffer)
+
+        except CircuitOpen:
+            log.error("Blocked by TripAdvisor. Stopping the backfill.")
         except Exception as e:
             log.error("An error occurred during the backfill process.")
             log.exception(e)
         finally:
-            if parsed_reviews and len(parsed_reviews) > 0:
-                backfilled_data_df = pd.DataFrame(parsed_reviews)
-
-                if not backfilled_ids:
-                    query = f"""
-                    SELECT * EXCEPT (reviews)
-                    FROM `{self.project_id}.{dataset_id}.{table_id}`
-                    WHERE review_count_scraped = 0
-                    """
-
-                    original_df = self.bigquery.fetch_bigquery(query)
-                    original_df["reviews"] = [None] * len(original_df)
-                    backfilled_data_df = pd.concat([backfilled_data_df, original_df])
-
-                parquet_file_path = f"data/tripadvisor__backfill_{datetime.now().strftime('%Y%m%d')}.parquet"
-                backfilled_data_df.to_parquet(parquet_file_path, index=False)
-                await asyncio.sleep(SCRAPE_DELAY)
-
-                self.bigquery.upload_parquet_to_bq(
-                    file_path=parquet_file_path,
-                    full_table_id=f"{dataset_id}.{backfill_table_id}",
-                    write_disposition="WRITE_APPEND",
-                )
-
-                log.success(f"Backfilled {len(parsed_reviews)} location reviews.")
+            try:
+                await asyncio.to_thread(_append_buffer)
+            finally:
+                if append_stream:
+                    append_stream.close()
+                if local_writer:
+                    local_writer.close()
+
+            if backfilled:
+                log.success(f"Backfilled {backfilled} location reviews.")
             else:
-                log.info("No reviews were parsed.")
+                log.info("No new locations to backfill reviews.")
 
-    def fetch_location_data(self, lat, long) -> list:
+    async def fetch_location_data(
+        self, geolocations, api, planner: CoveragePlanner
+    ) -> list:
         """
-        Fetch location data from TripAdvisor API for a given latitude and longitude.
+        Fetch location data from TripAdvisor API covering many latitude and longitude pairs.
 
         Args:
-            lat (float): Latitude.
-            long (float): Longitude.
+            geolocations (list): List of geolocation tuples (latitude, longitude).
+            api (AsyncTripAdvisorContentAPI): The async Content API client.
+            planner (CoveragePlanner): Plans the nearby_search calls covering the geolocations.
 
         Returns:
-            list: List of location data dictionaries.
+            list: List of location data dictionaries, duplicates included.
         """
-        try:
-            log.info(f"Fetching location data for latitude={lat}, longitude={long}...")
-            location_data = self.tripadvisor.get_nearby_locations(lat, long)
-            log.debug(f"Found {len(location_data['data'])} nearby locations.")
-            return location_data["data"]
-        except Exception as e:
-            log.error(
-                f"Failed to fetch location data for latitude={lat}, longitude={long}."
-            )
-            log.exception(e)
-            return []
+        log.info(f"Fetching location data for {len(geolocations)} geolocations...")
+        return await planner.run(api, geolocations)
 
-    def fetch_location_list(self, dataset_id, table_id) -> list:
+    def fetch_locations_to_scrape(
+        self,
+        dataset_id,
+        location_list_table_id,
+        scraper_table_id,
+        max_locations=-1,
+        exclude=None,
+    ) -> list:
         """
-        Fetch a list of locations from BigQuery.
+        Fetch the location IDs of the location list that are not scraped yet.
 
         Args:
-            dataset_id (str): BigQuery dataset ID containing location data.
-            table_id (str): BigQuery table ID containing location data.
+            dataset_id (str): BigQuery dataset ID containing both tables.
+            location_list_table_id (str): BigQuery table ID containing location data.
+            scraper_table_id (str): BigQuery table ID containing scraped data.
+            max_locations (int): Maximum locations to return, -1 for all.
+            exclude (set): Location IDs scraped but not loaded into BigQuery yet.
 
         Returns:
-            list: List of unique location IDs.
+            list: List of location IDs to scrape, in location ID order.
         """
         try:
-            log.info(f"Fetching location list from: {dataset_id}.{table_id}")
-            query = f"""
-            SELECT DISTINCT location_id
-            FROM `{self.project_id}.{dataset_id}.{table_id}`
-            """
-            dataframe = self.bigquery.fetch_bigquery(query)
-            location_list = dataframe["location_id"].tolist()
+            log.info(
+                f"Fetching locations of {dataset_id}.{location_list_table_id} not in {scraper_table_id}"
+            )
+            work_list = self.bigquery.fetch_work_list(
+                source_table_id=f"{self.project_id}.{dataset_id}.{location_list_table_id}",
+                done_table_id=f"{self.project_id}.{dataset_id}.{scraper_table_id}",
+                exclude=exclude,
+                limit=max_locations,
+            )
+            location_list = work_list["location_id"].to_pylist()
 
-            log.success(f"Fetched {len(location_list)} unique location IDs.")
+            log.success(f"Fetched {len(location_list)} location IDs to scrape.")
             return location_list
         except Exception as e:
             log.error("No location list found in BigQuery.")
             log.exception(e)
             return []
 
-    async def scrape_location(self, location) -> dict:
+    def iter_locations_to_refresh(
+        self,
+        dataset_id,
+        scraper_table_id,
+        max_locations=-1,
+        exclude=None,
+        review_table_id=None,
+        chunk_rows=SCRAPE_REFRESH_CHUNK_ROWS,
+    ):
+        """
+        Stream the scraped locations to refresh incrementally, least recently scraped first,
+        in chunks of `chunk_rows`. The work list is read through the Storage Read API, so only
+        one chunk of stored reviews is held in memory at a time. Locations stored more than
+        once by earlier appends are refreshed once, from their latest row.
+
+        Args:
+            dataset_id (str): BigQuery dataset ID containing the scraped data.
+            scraper_table_id (str): BigQuery table ID containing scraped data.
+            max_locations (int): Maximum locations to return, -1 for all.
+            exclude (set): Location IDs refreshed but not loaded into BigQuery yet.
+            review_table_id (str): BigQuery table ID of the review rows. The fingerprints of
+                                   the newest reviews are read from it instead of the nested
+                                   reviews column, which is then not read at all.
+            chunk_rows (int): Locations per chunk. Default: SCRAPE_REFRESH_CHUNK_ROWS.
+
+        Yields:
+            list: Dictionaries with location_id, review_count and either reviews, as Review
+                  records, or review_count_scraped and fingerprints.
+        """
+        log.info(f"Fetching locations of {dataset_id}.{scraper_table_id} to refresh")
+        columns = "source.location_id, source.review_count, source.review_count_scraped"
+        work_list = self.bigquery.iter_work_list(
+            source_table_id=f"{self.project_id}.{dataset_id}.{scraper_table_id}",
+            done_table_id=None,
+            columns=columns if review_table_id else f"{columns}, source.reviews",
+            exclude=exclude,
+            order_by="source.scraped_at ASC NULLS FIRST, source.location_id",
+            limit=max_locations,
+            qualify=(
+                "ROW_NUMBER() OVER (PARTITION BY source.location_id "
+                "ORDER BY source.scraped_at DESC, source.review_count_scraped DESC) = 1"
+            ),
+        )
+
+        full_review_table_id = f"{self.project_id}.{dataset_id}.{review_table_id}"
+        review_table_exists = review_table_id and self.bigquery.table_exists(
+            full_review_table_id
+        )
+        fetched = 0
+        for batch in work_list:
+            for offset in range(0, batch.num_rows, chunk_rows):
+                chunk = batch.slice(offset, chunk_rows).to_pylist()
+
+                if review_table_exists:
+                    fingerprints = fetch_latest_fingerprints(
+                        self.bigquery,
+                        full_review_table_id,
+                        [row["location_id"] for row in chunk],
+                    )
+                    for row in chunk:
+                        row["fingerprints"] = fingerprints.get(
+                            row["location_id"], set()
+                        )
+                elif review_table_id:
+                    for row in chunk:
+                        row["fingerprints"] = set()
+                else:
+                    for row in chunk:
+                        row["reviews"] = [
+                            Review.from_dict(review) for review in row["reviews"] or []
+                        ]
+
+                fetched += len(chunk)
+                log.info(f"Fetched {fetched} locations to refresh.")
+                yield chunk
+
+    async def scrape_location_url(
+        self,
+        location_id,
+        session: ScrapeSession,
+        history: ReviewHistory = None,
+        sink: ReviewSink = None,
+    ) -> tuple:
+        """
+        Scrape a location from its indexed URL, or resolve the URL through its redirect first.
+        An indexed URL that returns 404 is invalidated and resolved again.
+
+        Args:
+            location_id (str): The location ID to scrape.
+            session (ScrapeSession): The run-scoped session shared by every page request.
+            history (ReviewHistory): What the last run stored for the location, to only scrape
+                                     its new reviews.
+            sink (ReviewSink): Receives the reviews page by page instead of the result.
+
+        Returns:
+            tuple: The location URL and the information scraped from it.
+        """
+        location_url = self.location_index.get(location_id)
+
+        if location_url:
+            try:
+                return location_url, await scrape_url(
+                    location_url, session, history=history, sink=sink
+                )
+            except LocationNotFound:
+                log.warning(f"Indexed URL of location ID {location_id} is gone.")
+                self.location_index.invalidate(location_id)
+
+        location_url, content = await session.retry_policy.run(
+            resolve_location_url, location_id, session, name=f"resolve {location_id}"
+        )
+        self.location_index.put(location_id, location_url)
+        return location_url, await scrape_url(
+            location_url, session, content, history=history, sink=sink
+        )
+
+    async def scrape_location(self, location, session: ScrapeSession) -> Location:
         """
         Scrape detailed information for a given location.
 
         Args:
             location (dict): A dictionary containing location information.
+            session (ScrapeSession): The run-scoped session shared by every page request.
 
         Returns:
-            dict: Scraped information for the location.
+            Location: Scraped information for the location, None on error.
         """
         try:
             location_id = location["location_id"]
-            location_url = self.tripadvisor.get_location_url(location_id, full=True)
             log.info(f"Scraping reviews for location ID: {location_id}...")
-            scrape_info = await scrape_url(location_url)
+            location_url, scrape_info = await self.scrape_location_url(
+                location_id, session
+            )
 
-            if (
-                scrape_info["review_count_scraped"] == 0
-                and scrape_info["review_count"] > 0
-            ):
+            if scrape_info.review_count_scraped == 0 and scrape_info.review_count > 0:
                 log.warning(
                     f"No reviews scraped for location ID: {location_id}. Falling back to RapidAPI..."
                 )
-                reviews = self.tripadvisor_rapid.get_parsed_restaurant_reviews(
-                    location_url
+                scrape_info.reviews = await asyncio.to_thread(
+                    self.tripadvisor_rapid.get_parsed_restaurant_reviews, location_url
                 )
-                scrape_info["reviews"] = reviews
 
-            return {
-                "location_id": location_id,
-                "location_url": location_url,
-                "address_from_url": scrape_info["address_from_url"],
-                "google_maps_link": scrape_info["google_maps_link"],
-                "lat": scrape_info["lat"],
-                "long": scrape_info["long"],
-                "price_range": scrape_info["price_range"],
-                "cuisine": scrape_info["cuisine"],
-                "ranking": scrape_info["ranking"],
-                "rating": scrape_info["rating"],
-                "review_count": scrape_info["review_count"],
-                "review_count_scraped": scrape_info["review_count_scraped"],
-                "reviews": scrape_info["reviews"],
-            }
+            return Location.from_scrape_info(location_id, scrape_info)
+        except CircuitOpen:
+            raise
         except Exception as e:
             log.error(f"Error scraping location: {location}")
             log.exception(e)
-            return {}
+            return None
 
-    async def scrape_location_by_id(self, location_id) -> dict:
+    async def scrape_location_by_id(
+        self,
+        location_id,
+        session: ScrapeSession,
+        previous: dict = None,
+        review_writer: ReviewTableWriter = None,
+    ) -> Location:
         """
         Scrape detailed information for a given location by ID.
 
         Args:
             location_id (str): The location ID to scrape.
+            session (ScrapeSession): The run-scoped session shared by every page request.
+            previous (dict): The work-list row of the location, with review_count and reviews.
+                             Only the reviews posted since are scraped, then merged with the
+                             stored ones.
+            review_writer (ReviewTableWriter): Writes the reviews to the review table as they
+                                               are parsed. The returned row then only keeps
+                                               the review counts.
 
         Returns:
-            dict: Scraped information for the location.
+            Location: Scraped information for the location, None on error.
         """
         try:
             log.info(f"Scraping reviews for location ID: {location_id}...")
-            location_url = self.tripadvisor.get_location_url(location_id, full=True)
-            scrape_info = await scrape_url(location_url)
+            sink = ReviewSink(review_writer, location_id) if review_writer else None
+            if previous and "fingerprints" in previous:
+                history = ReviewHistory(
+                    previous["review_count"] or 0, set(previous["fingerprints"])
+                )
+            elif previous:
+                history = ReviewHistory.from_reviews(
+                    previous["review_count"], previous["reviews"]
+                )
+            else:
+                history = None
+
+            location_url, scrape_info = await self.scrape_location_url(
+                location_id, session, history=history, sink=sink
+            )
 
-            if (
-                scrape_info["review_count_scraped"] == 0
-                and scrape_info["review_count"] > 1
-            ):
+            if sink is not None:
+                log.info(f"Wrote {len(sink)} reviews for location ID: {location_id}")
+                scrape_info.review_count_scraped = len(sink) + (
+                    (previous or {}).get("review_count_scraped") or 0
+                )
+            elif previous:
+                log.info(
+                    f"Found {len(scrape_info.reviews)} new reviews for location ID: {location_id}"
+                )
+                scrape_info.reviews = merge_reviews(
+                    scrape_info.reviews, previous["reviews"]
+                )
+                scrape_info.review_count_scraped = len(scrape_info.reviews)
+
+            if scrape_info.review_count_scraped == 0 and scrape_info.review_count > 1:
                 log.warning(
                     f"No reviews scraped for location ID: {location_id}. Falling back to RapidAPI..."
                 )
-                reviews = self.tripadvisor_rapid.get_parsed_restaurant_reviews(
-                    location_url
+                reviews = await asyncio.to_thread(
+                    self.tripadvisor_rapid.get_parsed_restaurant_reviews, location_url
                 )
-                scrape_info["reviews"] = reviews
-
-            return {
-                "location_id": location_id,
-                "location_url": location_url,
-                "address_from_url": scrape_info["address_from_url"],
-                "google_maps_link": scrape_info["google_maps_link"],
-                "lat": scrape_info["lat"],
-                "long": scrape_info["long"],
-                "tel": scrape_info["tel"],
-                "open_hour": scrape_info["open_hour"],
-                "price_range": scrape_info["price_range"],
-                "cuisine": scrape_info["cuisine"],
-                "ranking": scrape_info["ranking"],
-                "rating": scrape_info["rating"],
-                "review_count": scrape_info["review_count"],
-                "review_count_scraped": scrape_info["review_count_scraped"],
-                "reviews": scrape_info["reviews"],
-            }
+                if sink is not None:
+                    sink(reviews)
+                else:
+                    scrape_info.reviews = reviews
+
+            # With a review table the reviews are already written, the row keeps the counts
+            if sink is not None:
+                scrape_info.reviews = None
+            return Location.from_scrape_info(location_id, scrape_info)
+        except CircuitOpen:
+            log.warning("Need to reschedule scraping due to TripAdvisor blocking.")
+            raise
         except Exception as e:
             log.error(f"Error scraping location ID: {location_id}")
             log.exception(e)
-            return {}
-        except AssertionError:
-            log.warning("Need to reschedule scraping due to TripAdvisor blocking.")
-            raise AssertionError("Get blocked by TripAdvisor. Stopping scraping.")
+            return None
 
-    async def fetch_api_workflow(self, geolocations, max_workers=4) -> pd.DataFrame:
+    async def fetch_api_workflow(
+        self,
+        geolocations,
+        concurrency: int = API_CONCURRENCY,
+        radius_km: float = API_NEARBY_RADIUS_KM,
+        plan_only: bool = False,
+    ) -> pa.Table:
         """
         Fetch and scrape data for multiple geolocations.
 
         Args:
             geolocations (list): List of geolocation tuples (latitude, longitude).
-            max_workers (int): Number of concurrent threads for fetching.
+            concurrency (int): Number of Content API calls in flight.
+            radius_km (float): Search radius of the planned nearby_search calls.
+            plan_only (bool): Only report planned versus naive call counts, without API calls.
 
         Returns:
-            pd.DataFrame: DataFrame containing scraped information.
+            pa.Table: Table of the unique locations found, empty with `plan_only`.
         """
         log.info(f"Fetching for {len(geolocations)} geolocations...")
+        planner = CoveragePlanner(radius_km=radius_km)
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            loop = asyncio.get_event_loop()
-            location_results = await asyncio.gather(
-                *[
-                    loop.run_in_executor(executor, self.fetch_location_data, lat, long)
-                    for lat, long in geolocations
-                ]
-            )
+        if plan_only:
+            planner.report(geolocations)
+            return API_INFO_SCHEMA.empty_table()
 
-        api_results = pd.DataFrame(
-            [location for locations in location_results for location in locations]
-        )
+        async with AsyncTripAdvisorContentAPI(
+            self.api_key, concurrency=concurrency, cache=self.cache
+        ) as api:
+            location_results = await self.fetch_location_data(
+                geolocations, api, planner
+            )
 
-        api_results.drop_duplicates(subset=["location_id"], inplace=True, keep="first")
+        # Overlapping cells return the same locations, keep the first of each
+        unique_locations = {}
+        for location in location_results:
+            unique_locations.setdefault(location["location_id"], location)
 
-        return api_results
+        return build_table(unique_locations.values(), API_INFO_SCHEMA)
 
     async def fetch_scraper_and_write(
         self,
@@ -499,71 +795,206 @@ class TripAdvisorDataFetcher:
         location_list_table_id: str,
         scraper_table_id: str,
         max_locations: int,
+        concurrency: int = SCRAPE_CONCURRENCY,
+        prefetch_pages: int = SCRAPE_PREFETCH_PAGES,
+        parser_backend: str = SCRAPE_PARSER_BACKEND,
+        parse_workers: int = SCRAPE_PARSE_WORKERS,
+        checkpoint_rows: int = SCRAPE_CHECKPOINT_ROWS,
+        checkpoint_bytes: int = SCRAPE_CHECKPOINT_BYTES,
+        refresh: bool = False,
+        review_table_id: str = None,
     ):
         """
-        Fetch location data, scrape it, and write to BigQuery.
+        Fetch location data, scrape it, and write to BigQuery. Scraped locations are checkpointed
+        to Parquet part files as they complete, so a restarted run resumes where the last one stopped.
+        With `refresh`, the already scraped locations are scraped again incrementally instead.
 
         Args:
             dataset_id (str): BigQuery dataset ID containing two tables.
             location_list_table_id (str): BigQuery table ID containing location data.
             scraper_table_id (str): BigQuery table ID to write scraped data.
+            max_locations (int): Maximum locations to scrape, -1 for all.
+            concurrency (int): Number of locations scraped at the same time.
+            prefetch_pages (int): Number of review pages kept in flight per location.
+            parser_backend (str): HTML parser backend: 'html.parser', 'lxml' or 'lexbor'.
+            parse_workers (int): Worker processes parsing pages, 0 parses on the event loop.
+            checkpoint_rows (int): Flush a part file every N scraped locations.
+            checkpoint_bytes (int): Flush a part file every M bytes of scraped locations.
+            refresh (bool): Refresh the scraped locations, stopping at their known reviews and
+                            skipping the ones whose review count did not change.
+            review_table_id (str): BigQuery table ID where reviews are appended as rows while
+                                   they are parsed, instead of a nested column of the
+                                   scraper table.
         """
-        scrape_info = []
+        # With a review table, the location rows do not carry the nested reviews
+        schema = LOCATION_SUMMARY_SCHEMA if review_table_id else SCRAPE_INFO_SCHEMA
+        tables = {scraper_table_id: schema}
+        if review_table_id:
+            tables[review_table_id] = REVIEW_ROW_SCHEMA
+        if self._tables_to_migrate(dataset_id, tables):
+            return
+
+        checkpoint = ParquetCheckpoint(
+            os.path.join(SCRAPE_CHECKPOINT_DIR, f"{dataset_id}.{scraper_table_id}"),
+            key="location_id",
+            flush_rows=checkpoint_rows,
+            flush_bytes=checkpoint_bytes,
+            schema=schema,
+        )
+        review_writer = None
         try:
-            location_list = self.fetch_location_list(
-                dataset_id=dataset_id, table_id=location_list_table_id
-            )
-            scraped_locations_list = self.fetch_scraped_locations(
-                scraper_dataset_id=dataset_id, scraper_table_id=scraper_table_id
-            )
-
-            # Remove already scraped locations
-            location_list = list(set(location_list) - set(scraped_locations_list))
-
-            if max_locations != -1:
-                location_list = location_list[:max_locations]
+            # Skip already scraped locations, including the checkpointed ones of a crashed run
+            if refresh:
+                location_chunks = self.iter_locations_to_refresh(
+                    dataset_id=dataset_id,
+                    scraper_table_id=scraper_table_id,
+                    max_locations=max_locations,
+                    exclude=checkpoint.done,
+                    review_table_id=review_table_id,
+                )
+            else:
+                location_chunks = iter(
+                    [
+                        [
+                            {"location_id": location_id}
+                            for location_id in self.fetch_locations_to_scrape(
+                                dataset_id=dataset_id,
+                                location_list_table_id=location_list_table_id,
+                                scraper_table_id=scraper_table_id,
+                                max_locations=max_locations,
+                                exclude=checkpoint.done,
+                            )
+                        ]
+                    ]
+                )
 
-            for location_id in location_list:
-                await asyncio.sleep(SCRAPE_DELAY)
-                scrape_result = await self.scrape_location_by_id(location_id)
+            if len(self.location_index) == 0:
+                self.seed_location_index(
+                    scraper_dataset_id=dataset_id, scraper_table_id=scraper_table_id
+                )
 
-                if scrape_result:
-                    scrape_info.append(scrape_result)
+            if review_table_id:
+                review_writer = ReviewTableWriter(
+                    self.bigquery, f"{self.project_id}.{dataset_id}.{review_table_id}"
+                )
+                # A location is only journaled done once its reviews are committed
+                checkpoint.before_commit = review_writer.sync
+
+            engine = ScrapeEngine(concurrency)
+            async with ScrapeSession(
+                rate_limiter=self.rate_limiter,
+                breaker=self.breaker,
+                prefetch_pages=prefetch_pages,
+                parser_backend=parser_backend,
+                parse_workers=parse_workers,
+                cache=self.cache,
+            ) as session:
+                # Refresh chunks are read off the event loop, one at a time
+                while (
+                    location_list := await asyncio.to_thread(
+                        next, location_chunks, None
+                    )
+                ) is not None:
+                    async for _, scrape_result in engine.map(
+                        location_list,
+                        lambda location: self.scrape_location_by_id(
+                            location["location_id"],
+                            session,
+                            previous=location if refresh else None,
+                            review_writer=review_writer,
+                        ),
+                    ):
+                        if scrape_result:
+                            checkpoint.write(scrape_result)
+
+        except CircuitOpen:
+            log.error("Blocked by TripAdvisor. Stopping scraping.")
 
         except Exception as e:
             log.error("Failed to fetch and write data.")
             log.exception(e)
 
-        except AssertionError as e:
-            log.error("Blocked by TripAdvisor. Stopping scraping.")
-
         finally:
-            if scrape_info and len(scrape_info) > 0:
-                scrape_df = pd.DataFrame(scrape_info)
-                parquet_file_path = f"data/tripadvisor__scrape_info_{datetime.now().strftime('%Y%m%d')}.parquet"
-
-                if not os.path.exists("data"):
-                    os.makedirs("data")
-
-                self.save_to_parquet(scrape_df, parquet_file_path)
-                self.bigquery.upload_parquet_to_bq(
-                    file_path=parquet_file_path,
-                    full_table_id=f"{dataset_id}.{scraper_table_id}",
-                    write_disposition="WRITE_APPEND",
+            # Reviews are committed before the location rows that count them
+            reviews_committed = True
+            if review_writer is not None:
+                try:
+                    review_writer.close()
+                except Exception as e:
+                    # The buffered locations are not committed, the next run scrapes them again
+                    reviews_committed = False
+                    log.error("Failed to append reviews to BigQuery.")
+                    log.exception(e)
+            if reviews_committed:
+                checkpoint.close()
+
+            for part_path in checkpoint.pending_uploads():
+                self.bigquery.upsert_parquet(
+                    file_path=part_path,
+                    full_table_id=f"{self.project_id}.{dataset_id}.{scraper_table_id}",
+                    key_columns=["location_id"],
+                    schema=schema,
+                    order_by="scraped_at DESC",
                 )
+                checkpoint.mark_uploaded(part_path)
 
+            if checkpoint.parts:
+                checkpoint.remove()
                 log.success("Data fetched, scraped, and written to BigQuery.")
 
+    def migrate_tables(self, dataset_id, scraper_table_id, review_table_id=None):
+        """
+        Rewrite the tables written by the scraper into the layout of their registry schemas,
+        see `BigQueryHandler.migrate_table`. Tables created by autodetected loads hold list
+        columns as `list.element` records and string review dates, which registry loads and
+        MERGEs do not match.
+
+        Args:
+            dataset_id (str): BigQuery dataset ID containing the scraped data.
+            scraper_table_id (str): BigQuery table ID containing scraped data.
+            review_table_id (str): BigQuery table ID of the review rows. Default: None.
+        """
+        tables = {
+            scraper_table_id: SCRAPE_INFO_SCHEMA,
+            f"{scraper_table_id}_v2": SCRAPE_INFO_SCHEMA,
+        }
+        if review_table_id:
+            tables[review_table_id] = REVIEW_ROW_SCHEMA
+
+        for table_id, schema in tables.items():
+            self.bigquery.migrate_table(
+                f"{self.project_id}.{dataset_id}.{table_id}", schema
+            )
+
+    def _tables_to_migrate(self, dataset_id, tables: dict) -> list:
+        """Return the tables of `tables` (table ID -> schema) that need `--migrate` first."""
+        to_migrate = [
+            table_id
+            for table_id, schema in tables.items()
+            if self.bigquery.needs_migration(
+                f"{self.project_id}.{dataset_id}.{table_id}", schema
+            )
+        ]
+        if to_migrate:
+            log.error(
+                f"Tables {to_migrate} are not in the registry layout, run with --migrate first."
+            )
+        return to_migrate
+
     def save_to_parquet(self, dataframe, parquet_file_path):
         """
-        Save a DataFrame to a Parquet file.
+        Save a DataFrame or an Arrow table to a Parquet file.
 
         Args:
-            dataframe (pd.DataFrame): The DataFrame to save.
+            dataframe (pd.DataFrame | pa.Table): The rows to save.
             parquet_file_path (str): The path to the Parquet file.
         """
         try:
-            dataframe.to_parquet(parquet_file_path)
+            os.makedirs(os.path.dirname(parquet_file_path) or ".", exist_ok=True)
+            if isinstance(dataframe, pa.Table):
+                pq.write_table(dataframe, parquet_file_path)
+            else:
+                dataframe.to_parquet(parquet_file_path, index=False)
             log.success(f"Data saved to {parquet_file_path}.")
             return parquet_file_path
         except Exception as e:
@@ -572,25 +1003,35 @@ class TripAdvisorDataFetcher:
 
     def backup_to_parquet(self, dataset_id, table_id, parquet_file_path, **kwargs):
         """
-        Backup a BigQuery table to a Parquet file.
+        Backup a BigQuery table to a Parquet file, streamed batch by batch so the table
+        never has to fit in memory.
 
         Args:
             dataset_id (str): BigQuery dataset ID.
             table_id (str): BigQuery table ID.
-            parquet_file_path (str): The path to the Parquet file.
-            **kwargs: Additional arguments for the to_parquet method.
+            parquet_file_path (str): The path to the Parquet file, local or remote (e.g. s3://).
+            **kwargs: `storage_options` for the filesystem of `parquet_file_path`.
         """
         try:
-            query = f"""
-            SELECT *
-            FROM `{self.project_id}.{dataset_id}.{table_id}`
-            """
-
-            dataframe = self.bigquery.fetch_bigquery(query)
-            log.info(f"Fetch total {len(dataframe)} records for backup")
-
-            dataframe.to_parquet(parquet_file_path, index=False, **kwargs)
-
+            batches = self.bigquery.iter_record_batches(
+                full_table_id=f"{self.project_id}.{dataset_id}.{table_id}"
+            )
+            records, writer = 0, None
+
+            with fsspec.open(
+                parquet_file_path, "wb", **kwargs.get("storage_options", {})
+            ) as file:
+                try:
+                    for batch in batches:
+                        if writer is None:
+                            writer = pq.ParquetWriter(file, batch.schema)
+                        writer.write_batch(batch)
+                        records += batch.num_rows
+                finally:
+                    if writer is not None:
+                        writer.close()
+
+            log.info(f"Fetch total {records} records for backup")
             log.success(f"Data backed up to {parquet_file_path}.")
             return parquet_file_path
         except Exception as e:
@@ -604,6 +1045,7 @@ async def run(
     run_backfill=False,
     run_backup=False,
     run_backfill_reviews=False,
+    run_migrate=False,
 ):
     log.info("Starting TripAdvisor data fetcher script...")
     try:
@@ -614,26 +1056,50 @@ async def run(
             credentials_path=args.credentials_path,
             api_key_env_var=args.api_key_env_var,
             rapid_api_key_env=args.rapid_api_key_env,
+            location_index_path=args.location_index_path,
+            http_cache=args.http_cache,
+            replay=args.replay,
+            http_cache_path=args.http_cache_path,
+            query_cache=args.query_cache,
+            query_cache_path=args.query_cache_path,
+            requests_per_second=args.requests_per_second,
+            min_requests_per_second=args.min_requests_per_second,
+            max_requests_per_second=args.max_requests_per_second,
         )
 
+        if run_migrate:
+            tripadvisor.migrate_tables(
+                dataset_id=args.dataset_id,
+                scraper_table_id=args.scraper_table_id,
+                review_table_id=args.review_table_id,
+            )
+
         if run_api:
             geolocations = tripadvisor.fetch_geolocation()
 
             tripadvisor__api_results = await tripadvisor.fetch_api_workflow(
-                geolocations=geolocations[["latitude", "longitude"]].values.tolist()
+                geolocations=geolocations[["latitude", "longitude"]].values.tolist(),
+                radius_km=args.radius_km,
+                plan_only=args.plan_only,
             )
-            tripadvisor__api_results.to_parquet("data/tripadvisor__api_results.parquet")
-            tripadvisor.bigquery.upload_parquet_to_bq(
-                file_path="data/tripadvisor__api_results.parquet",
+            if args.plan_only:
+                return
+            if args.keep_local:
+                tripadvisor.save_to_parquet(
+                    tripadvisor__api_results, "data/tripadvisor__api_results.parquet"
+                )
+            tripadvisor.bigquery.upload_table(
+                tripadvisor__api_results,
                 full_table_id=f"{args.dataset_id}.{args.location_list_table_id}_v2",
                 write_disposition="WRITE_TRUNCATE",
+                schema=API_INFO_SCHEMA,
             )
 
         if run_backfill:
             wrong_location_list = tripadvisor.fetch_wrong_location(
                 dataset_id=args.dataset_id, table_id=args.location_list_table_id
             )
-            tripadvisor.backfill_wrong_location(
+            await tripadvisor.backfill_wrong_location(
                 dataset_id=args.dataset_id,
                 table_id=args.location_list_table_id,
                 wrong_location_list=wrong_location_list,
@@ -645,6 +1111,14 @@ async def run(
                 location_list_table_id=args.location_list_table_id,
                 scraper_table_id=args.scraper_table_id,
                 max_locations=args.max_locations,
+                concurrency=args.concurrency,
+                prefetch_pages=args.prefetch_pages,
+                parser_backend=args.parser_backend,
+                parse_workers=args.parse_workers,
+                checkpoint_rows=args.checkpoint_rows,
+                checkpoint_bytes=int(args.checkpoint_mb * 1024**2),
+                refresh=args.refresh,
+                review_table_id=args.review_table_id,
             )
 
         if run_backup:
@@ -667,7 +1141,16 @@ async def run(
 
         if run_backfill_reviews:
             await tripadvisor.backfill_reviews(
-                dataset_id=args.dataset_id, table_id=args.scraper_table_id
+                dataset_id=args.dataset_id,
+                table_id=args.scraper_table_id,
+                concurrency=args.concurrency,
+                prefetch_pages=args.prefetch_pages,
+                parser_backend=args.parser_backend,
+                parse_workers=args.parse_workers,
+                stream_writes=args.stream_writes,
+                keep_local=args.keep_local,
+                chunk_rows=args.backfill_chunk_rows,
+                max_buffer_bytes=int(args.backfill_max_mb * 1024**2),
             )
 
         log.info("TripAdvisor data fetcher script completed successfully!")
@@ -680,5 +1163,12 @@ if __name__ == "__main__":
     warnings.filterwarnings("ignore")
     args = TripAdvisorParser.parse_arguments()
     asyncio.run(
-        run(args.api, args.scrape, args.backfill, args.backup, args.backfill_reviews)
+        run(
+            args.api,
+            args.scrape,
+            args.backfill,
+            args.backup,
+            args.backfill_reviews,
+            args.migrate,
+        )
     )
@@ -1,5 +1,23 @@
 import argparse
 
+from tripadvisor._constants import (
+    API_NEARBY_RADIUS_KM,
+    BACKFILL_CHUNK_ROWS,
+    BACKFILL_MAX_BUFFER_BYTES,
+    HTTP_CACHE_PATH,
+    LOCATION_INDEX_PATH,
+    QUERY_CACHE_PATH,
+    SCRAPE_CHECKPOINT_BYTES,
+    SCRAPE_CHECKPOINT_ROWS,
+    SCRAPE_CONCURRENCY,
+    SCRAPE_MAX_REQUESTS_PER_SECOND,
+    SCRAPE_MIN_REQUESTS_PER_SECOND,
+    SCRAPE_PARSE_WORKERS,
+    SCRAPE_PARSER_BACKEND,
+    SCRAPE_PREFETCH_PAGES,
+    SCRAPE_REQUESTS_PER_SECOND,
+)
+
 
 class TripAdvisorParser:
     @staticmethod
@@ -50,6 +68,129 @@ class TripAdvisorParser:
             default=-1,
             help="Maximum locations to fetch",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=SCRAPE_CONCURRENCY,
+            help="Number of locations scraped at the same time",
+        )
+        parser.add_argument(
+            "--requests_per_second",
+            type=float,
+            default=SCRAPE_REQUESTS_PER_SECOND,
+            help="Initial request rate to TripAdvisor shared by every location",
+        )
+        parser.add_argument(
+            "--min_requests_per_second",
+            type=float,
+            default=SCRAPE_MIN_REQUESTS_PER_SECOND,
+            help="Floor the request rate backs off to on 403, 429, 5xx or slow responses",
+        )
+        parser.add_argument(
+            "--max_requests_per_second",
+            type=float,
+            default=SCRAPE_MAX_REQUESTS_PER_SECOND,
+            help="Ceiling the request rate grows to while TripAdvisor is healthy",
+        )
+        parser.add_argument(
+            "--prefetch_pages",
+            type=int,
+            default=SCRAPE_PREFETCH_PAGES,
+            help="Number of review pages kept in flight per location",
+        )
+        parser.add_argument(
+            "--parser_backend",
+            choices=["html.parser", "lxml", "lexbor"],
+            default=SCRAPE_PARSER_BACKEND,
+            help="HTML parser backend, lxml and lexbor need the parsers extra",
+        )
+        parser.add_argument(
+            "--parse_workers",
+            type=int,
+            default=SCRAPE_PARSE_WORKERS,
+            help="Worker processes parsing pages off the event loop, 0 to disable",
+        )
+        parser.add_argument(
+            "--checkpoint_rows",
+            type=int,
+            default=SCRAPE_CHECKPOINT_ROWS,
+            help="Checkpoint scraped locations to a Parquet part file every N locations",
+        )
+        parser.add_argument(
+            "--checkpoint_mb",
+            type=float,
+            default=SCRAPE_CHECKPOINT_BYTES / 1024**2,
+            help="Checkpoint scraped locations to a Parquet part file every M megabytes",
+        )
+        parser.add_argument(
+            "--query_cache",
+            action="store_true",
+            default=False,
+            help="Reuse BigQuery query results while the tables they read are unchanged",
+        )
+        parser.add_argument(
+            "--query_cache_path",
+            default=QUERY_CACHE_PATH,
+            help="Directory of the query result cache",
+        )
+        parser.add_argument(
+            "--stream_writes",
+            action="store_true",
+            default=False,
+            help="Append backfilled rows through the BigQuery Storage Write API as they are parsed",
+        )
+        parser.add_argument(
+            "--backfill_chunk_rows",
+            type=int,
+            default=BACKFILL_CHUNK_ROWS,
+            help="Locations parsed per chunk of the reviews backfill, each appended as it completes",
+        )
+        parser.add_argument(
+            "--backfill_max_mb",
+            type=float,
+            default=BACKFILL_MAX_BUFFER_BYTES / 1024**2,
+            help="Append backfilled rows early once M megabytes are buffered",
+        )
+        parser.add_argument(
+            "--keep_local",
+            action="store_true",
+            default=False,
+            help="Also save uploaded data to a local Parquet file in data/",
+        )
+        parser.add_argument(
+            "--radius_km",
+            type=float,
+            default=API_NEARBY_RADIUS_KM,
+            help="Search radius of the planned nearby_search calls",
+        )
+        parser.add_argument(
+            "--plan_only",
+            action="store_true",
+            default=False,
+            help="Report planned versus naive nearby_search calls without calling the API",
+        )
+        parser.add_argument(
+            "--location_index_path",
+            default=LOCATION_INDEX_PATH,
+            help="Path to the location_id -> URL index file",
+        )
+        parser.add_argument(
+            "--http_cache",
+            action="store_true",
+            default=False,
+            help="Record TripAdvisor pages and API responses in the response cache",
+        )
+        parser.add_argument(
+            "--replay",
+            action="store_true",
+            default=False,
+            help="Serve every request from the response cache, without network",
+        )
+        parser.add_argument(
+            "--http_cache_path",
+            default=HTTP_CACHE_PATH,
+            help="Path to the response cache file",
+        )
         parser.add_argument(
             "--api",
             action="store_true",
@@ -74,11 +215,28 @@ class TripAdvisorParser:
             default=False,
             help="Run the backup",
         )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            default=False,
+            help="Scrape the already scraped locations again, only for their new reviews",
+        )
+        parser.add_argument(
+            "--review_table_id",
+            default=None,
+            help="Append scraped reviews as rows of this table, the scraper table keeps the counts",
+        )
         parser.add_argument(
             "--backfill_reviews",
             action="store_true",
             default=False,
             help="Run the reviews backfill",
         )
+        parser.add_argument(
+            "--migrate",
+            action="store_true",
+            default=False,
+            help="Rewrite the scraper, backfill and review tables into the registry schemas",
+        )
 
         return parser.parse_args()
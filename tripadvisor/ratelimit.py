@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from loguru import logger as log
+
+from tripadvisor._constants import (
+    SCRAPE_LATENCY_SPIKE,
+    SCRAPE_MAX_REQUESTS_PER_SECOND,
+    SCRAPE_MIN_REQUESTS_PER_SECOND,
+    SCRAPE_RATE_DECREASE,
+    SCRAPE_RATE_INCREASE,
+    SCRAPE_RATE_LOG_INTERVAL,
+)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by every request sent to the same host.
+    Tokens refill at `rate` per second up to `burst`; a caller that finds the bucket empty
+    reserves the next token and waits for it, so concurrent callers are served in order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate (float): Number of requests allowed per second.
+            burst (int): Maximum number of requests allowed back to back.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0 requests per second.")
+
+        if burst < 1:
+            raise ValueError("Burst must be at least 1 request.")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return the number of seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self.rate
+
+    def _release(self) -> None:
+        """Give back a reserved token that will not be used."""
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + 1)
+
+    async def acquire(self) -> float:
+        """
+        Wait asynchronously for a token. Returns the time spent waiting.
+        A caller cancelled while waiting gives its token back to the bucket.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._release()
+                raise
+        return delay
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket whose rate follows server feedback with AIMD (additive increase, multiplicative
+    decrease). Every healthy response raises the rate so that it grows by `increase` requests
+    per second every second; a 403, 429, 5xx, failed request or latency spike cuts it by
+    `decrease`, at most once per request interval so one burst of errors counts once.
+    The rate always stays between `min_rate` and `max_rate`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        min_rate: float = SCRAPE_MIN_REQUESTS_PER_SECOND,
+        max_rate: float = SCRAPE_MAX_REQUESTS_PER_SECOND,
+        increase: float = SCRAPE_RATE_INCREASE,
+        decrease: float = SCRAPE_RATE_DECREASE,
+        latency_spike: float = SCRAPE_LATENCY_SPIKE,
+    ):
+        """
+        Initialize the AdaptiveRateLimiter.
+
+        Args:
+            rate (float): Initial number of requests allowed per second.
+            burst (int): Maximum number of requests allowed back to back.
+            min_rate (float): Floor of the rate. Default: SCRAPE_MIN_REQUESTS_PER_SECOND.
+            max_rate (float): Ceiling of the rate. Default: SCRAPE_MAX_REQUESTS_PER_SECOND.
+            increase (float): Requests per second added every second of healthy responses.
+            decrease (float): Factor applied to the rate on congestion, between 0 and 1.
+            latency_spike (float): A response slower than this many times the average latency
+                                   counts as congestion.
+        """
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("Rate limits must satisfy 0 < min_rate <= max_rate.")
+
+        if not 0 < decrease < 1:
+            raise ValueError("Decrease factor must be between 0 and 1.")
+
+        super().__init__(min(max(rate, min_rate), max_rate), burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_spike = latency_spike
+        self.latency = None  # Moving average of healthy response times
+        self._decreased = 0.0
+        self._logged = time.monotonic()
+
+    def _set_rate(self, rate: float) -> None:
+        # Settle the tokens earned at the previous rate before switching
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+
+    def record(self, status_code: Optional[int], latency: float) -> None:
+        """
+        Feed the outcome of a request back into the rate.
+
+        Args:
+            status_code (int): HTTP status of the response, None if the request failed.
+            latency (float): Seconds between sending the request and receiving the response.
+        """
+        with self._lock:
+            now = time.monotonic()
+            spike = (
+                self.latency is not None and latency > self.latency * self.latency_spike
+            )
+            congested = (
+                status_code is None
+                or status_code in (403, 429)
+                or status_code >= 500
+                or spike
+            )
+
+            if congested:
+                if now - self._decreased >= 1 / self.rate:
+                    self._set_rate(self.rate * self.decrease)
+                    self._decreased = now
+                    log.warning(
+                        f"Backing off to {self.rate:.3f} req/s "
+                        f"(status={status_code}, latency={latency:.2f}s)"
+                    )
+            else:
+                self.latency = (
+                    latency
+                    if self.latency is None
+                    else 0.8 * self.latency + 0.2 * latency
+                )
+                self._set_rate(self.rate + self.increase / self.rate)
+
+            if now - self._logged >= SCRAPE_RATE_LOG_INTERVAL:
+                self._logged = now
+                log.info(
+                    f"Request rate: {self.rate:.3f} req/s, "
+                    f"average latency: {self.latency or 0:.2f}s"
+                )
@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Union
+
+"""
+Slotted records flowing through the scrape pipeline. Millions of reviews can be in flight at
+once, and a slotted record holds its values without the per-row dict of repeated keys.
+The field order of each record matches its schema in `tripadvisor.schema`.
+"""
+
+
+@dataclass(slots=True)
+class Review:
+    """A review, as extracted from a review page or returned by the RapidAPI fallback."""
+
+    user: Optional[str] = None
+    username: Optional[str] = None
+    country: Optional[str] = None
+    title: Optional[str] = None
+    text: Optional[str] = None
+    rating: Optional[float] = None
+    review_date: Optional[date] = None
+    review_type: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, review: Dict) -> "Review":
+        """Build a review from a stored row, ignoring the columns that are not review fields.
+        Rows stored before dates and ratings were typed are converted."""
+        record = cls(*(review.get(name) for name in REVIEW_FIELDS))
+        record.review_date = _as_date(record.review_date)
+        if record.rating is not None and record.rating < 0:
+            record.rating = None
+        return record
+
+    def astuple(self) -> tuple:
+        """Return the field values in schema order, as Arrow struct arrays take them."""
+        return tuple(getattr(self, name) for name in REVIEW_FIELDS)
+
+
+@dataclass(slots=True)
+class ScrapeInfo:
+    """The details and reviews scraped from the restaurant page of a location."""
+
+    url: Optional[str] = None
+    address_from_url: Optional[str] = None
+    google_maps_link: Optional[str] = None
+    lat: Optional[float] = None
+    long: Optional[float] = None
+    tel: Optional[str] = None
+    open_hour: Optional[str] = None
+    price_range: Optional[str] = None
+    cuisine: List[str] = field(default_factory=list)
+    ranking: Optional[int] = None
+    rating: Optional[float] = None
+    review_count: int = 0
+    review_count_scraped: int = 0
+    reviews: Optional[List[Review]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Location(ScrapeInfo):
+    """A row of the scraper table: the scrape of a location, identified by its location ID."""
+
+    location_id: Optional[str] = None
+    scraped_at: Optional[datetime] = None
+
+    @property
+    def location_url(self) -> Optional[str]:
+        return self.url
+
+    @classmethod
+    def from_scrape_info(cls, location_id: str, info: ScrapeInfo) -> "Location":
+        """Identify a scrape, made now, by its location ID. The reviews list is shared, not
+        copied."""
+        return cls(
+            *(getattr(info, name) for name in SCRAPE_INFO_FIELDS),
+            location_id=location_id,
+            scraped_at=datetime.now(timezone.utc),
+        )
+
+    @classmethod
+    def from_dict(cls, row: Dict) -> "Location":
+        """Build a location from a stored row, e.g. of a BigQuery work list."""
+        location = cls(
+            *(row.get(name) for name in SCRAPE_INFO_FIELDS),
+            location_id=row.get("location_id"),
+            scraped_at=row.get("scraped_at"),
+        )
+        location.url = row.get("location_url")
+        location.cuisine = location.cuisine or []
+        location.reviews = (
+            [Review.from_dict(review) for review in row["reviews"]]
+            if row.get("reviews") is not None
+            else None
+        )
+        return location
+
+
+def _as_date(value: Union[date, str, None]) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    for date_format in ("%Y-%m-%d", "%B %d, %Y"):
+        try:
+            return datetime.strptime(value.strip(), date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+REVIEW_FIELDS = tuple(record_field.name for record_field in fields(Review))
+SCRAPE_INFO_FIELDS = tuple(record_field.name for record_field in fields(ScrapeInfo))
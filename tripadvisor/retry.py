@@ -0,0 +1,227 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+import httpx
+import requests
+from loguru import logger as log
+
+from tripadvisor._constants import (
+    SCRAPE_BREAKER_COOLDOWN,
+    SCRAPE_BREAKER_MAX_TRIPS,
+    SCRAPE_BREAKER_THRESHOLD,
+    SCRAPE_RETRY_ATTEMPTS,
+    SCRAPE_RETRY_BASE_DELAY,
+    SCRAPE_RETRY_BUDGET,
+    SCRAPE_RETRY_MAX_DELAY,
+)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying, every other 4xx is permanent
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class Blocked(Exception):
+    """Raised when TripAdvisor answers 403, i.e. the scraper is being blocked."""
+
+
+class CircuitOpen(Exception):
+    """Raised when the circuit breaker gave up on the run after repeated blocking."""
+
+
+class CircuitBreaker:
+    """
+    Run-wide circuit breaker on consecutive 403s. After `threshold` blocked responses in a row
+    the circuit opens and every worker pauses for `cooldown` seconds instead of failing on its
+    own; the next response closes it again, or reopens it if TripAdvisor is still blocking.
+    After `max_trips` openings in a row the whole run stops with CircuitOpen.
+    """
+
+    def __init__(
+        self,
+        threshold: int = SCRAPE_BREAKER_THRESHOLD,
+        cooldown: float = SCRAPE_BREAKER_COOLDOWN,
+        max_trips: int = SCRAPE_BREAKER_MAX_TRIPS,
+    ):
+        """
+        Initialize the CircuitBreaker.
+
+        Args:
+            threshold (int): Consecutive 403s opening the circuit. Default: SCRAPE_BREAKER_THRESHOLD.
+            cooldown (float): Seconds paused while the circuit is open. Default: SCRAPE_BREAKER_COOLDOWN.
+            max_trips (int): Consecutive openings stopping the run, 0 to pause forever.
+                             Default: SCRAPE_BREAKER_MAX_TRIPS.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_trips = max_trips
+        self.failures = 0
+        self.trips = 0
+        self.opened_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def stopped(self) -> bool:
+        return bool(self.max_trips) and self.trips >= self.max_trips
+
+    def _remaining(self) -> float:
+        if self.stopped:
+            raise CircuitOpen(
+                f"Blocked by TripAdvisor {self.trips} times in a row. Stopping the run."
+            )
+        return self.opened_until - time.monotonic()
+
+    async def wait(self) -> None:
+        """Wait asynchronously while the circuit is open. Raises CircuitOpen once stopped."""
+        remaining = self._remaining()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+            self._remaining()
+
+    def record(self, status_code: Optional[int]) -> None:
+        """
+        Feed the status of a response to TripAdvisor into the breaker.
+
+        Args:
+            status_code (int): HTTP status of the response, None if the request failed.
+        """
+        if status_code is None:
+            return
+
+        with self._lock:
+            if status_code != 403:
+                self.failures = 0
+                self.trips = 0
+                return
+
+            self.failures += 1
+            if self.failures < self.threshold or time.monotonic() < self.opened_until:
+                return
+
+            self.failures = 0
+            self.trips += 1
+            self.opened_until = time.monotonic() + self.cooldown
+            log.error(
+                f"Circuit opened after {self.threshold} consecutive 403s "
+                f"(trip {self.trips}/{self.max_trips or 'inf'}), pausing {self.cooldown}s."
+            )
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """Return the HTTP status carried by an httpx or requests error, if any."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code
+    return None
+
+
+class RetryPolicy:
+    """
+    Retry policy with capped exponential backoff, full jitter and a time budget per operation.
+    Permanent errors (the `permanent` types, HTTP errors with a non-transient status and
+    CircuitOpen) are raised at once; other errors are retried until the attempts or the
+    budget run out.
+    """
+
+    def __init__(
+        self,
+        attempts: int = SCRAPE_RETRY_ATTEMPTS,
+        base_delay: float = SCRAPE_RETRY_BASE_DELAY,
+        max_delay: float = SCRAPE_RETRY_MAX_DELAY,
+        budget: float = SCRAPE_RETRY_BUDGET,
+        permanent: Tuple[Type[BaseException], ...] = (),
+    ):
+        """
+        Initialize the RetryPolicy.
+
+        Args:
+            attempts (int): Maximum number of attempts. Default: SCRAPE_RETRY_ATTEMPTS.
+            base_delay (float): Backoff ceiling of the first retry, doubled every retry.
+                                Default: SCRAPE_RETRY_BASE_DELAY.
+            max_delay (float): Cap of the backoff ceiling. Default: SCRAPE_RETRY_MAX_DELAY.
+            budget (float): Seconds an operation may spend across its attempts.
+                            Default: SCRAPE_RETRY_BUDGET.
+            permanent (tuple): Exception types never retried.
+        """
+        if attempts < 1:
+            raise ValueError("A retry policy needs at least 1 attempt.")
+
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.permanent = permanent
+
+    def is_transient(self, error: BaseException) -> bool:
+        """Whether an error is worth another attempt."""
+        if isinstance(error, (CircuitOpen, *self.permanent)):
+            return False
+
+        status_code = status_code_of(error)
+        return status_code is None or status_code in TRANSIENT_STATUS_CODES
+
+    def backoff(self, attempt: int) -> float:
+        """Return a jittered delay before the retry following attempt `attempt` (from 1)."""
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    def _next_delay(
+        self, error: BaseException, attempt: int, started: float, name: str
+    ) -> float:
+        """Return the delay before the next attempt, or raise `error` if it is not retried."""
+        if not self.is_transient(error):
+            raise error
+
+        delay = self.backoff(attempt)
+        if attempt >= self.attempts or time.monotonic() - started + delay > self.budget:
+            log.error(f"Giving up {name} after {attempt} attempts: {error}")
+            raise error
+
+        log.info(
+            f"Error on {name} attempt {attempt}/{self.attempts}: {error}. "
+            f"Retrying in {delay:.1f}s..."
+        )
+        return delay
+
+    async def run(
+        self,
+        func: Callable[..., Awaitable[T]],
+        *args,
+        name: str = "operation",
+        **kwargs,
+    ) -> T:
+        """
+        Await `func(*args, **kwargs)` until it succeeds or the policy gives up.
+
+        Args:
+            func (Callable): Coroutine function to run.
+            name (str): Name of the operation in the logs.
+        """
+        started = time.monotonic()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._next_delay(e, attempt, started, name))
+
+    def call(
+        self, func: Callable[..., T], *args, name: str = "operation", **kwargs
+    ) -> T:
+        """
+        Call `func(*args, **kwargs)` until it succeeds or the policy gives up.
+
+        Args:
+            func (Callable): Function to call.
+            name (str): Name of the operation in the logs.
+        """
+        started = time.monotonic()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                time.sleep(self._next_delay(e, attempt, started, name))
@@ -0,0 +1,218 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import pyarrow as pa
+from google.cloud import bigquery
+from loguru import logger as log
+
+from tripadvisor._constants import (
+    REVIEW_BATCH_ROWS,
+    REVIEW_SYNC_BATCHES,
+    SCRAPE_REFRESH_KNOWN_REVIEWS,
+)
+from tripadvisor.bigquery import ArrowAppendStream, BigQueryHandler
+from tripadvisor.records import REVIEW_FIELDS, Review
+from tripadvisor.schema import REVIEW_ROW_SCHEMA, bigquery_schema
+from tripadvisor.scrape.core import review_fingerprint
+
+
+class ReviewTableWriter:
+    """
+    Append reviews to an append-only review table, one row per review, in batches written as
+    review pages are parsed. The table is created on first use, partitioned by scrape day and
+    clustered by location, so loads and reads scale with the new reviews only.
+
+    Appends are at-least-once: a location scraped again after a crash appends its reviews again,
+    so readers dedupe on (location_id, fingerprint), keeping the latest `scraped_at`.
+    """
+
+    def __init__(
+        self,
+        bigquery_handler: BigQueryHandler,
+        full_table_id: str,
+        batch_rows: int = REVIEW_BATCH_ROWS,
+        sync_batches: int = REVIEW_SYNC_BATCHES,
+    ):
+        """
+        Initialize the ReviewTableWriter, creating the review table if it does not exist.
+
+        Args:
+            bigquery_handler (BigQueryHandler): The handler of the project holding the table.
+            full_table_id (str): The review table, as 'project.dataset.table'.
+            batch_rows (int): Append a batch every N buffered reviews. Default: REVIEW_BATCH_ROWS.
+            sync_batches (int): Wait for the acknowledgements every N appended batches, so
+                                failures surface early and pending appends stay bounded.
+                                Default: REVIEW_SYNC_BATCHES.
+        """
+        if not bigquery_handler.table_exists(full_table_id):
+            bigquery_handler.create_table(
+                full_table_id,
+                bigquery_schema(REVIEW_ROW_SCHEMA),
+                partition_field="scraped_at",
+                clustering_fields=["location_id"],
+            )
+
+        self.full_table_id = full_table_id
+        self.batch_rows = batch_rows
+        self.sync_batches = sync_batches
+        self._unsynced_batches = 0
+        self.stream: ArrowAppendStream = bigquery_handler.open_append_stream(
+            full_table_id
+        )
+        # Row keys and reviews of the buffered rows, turned into columns on flush
+        self._keys: List[Tuple[str, str, int, datetime]] = []
+        self._reviews: List[Review] = []
+
+    def write(
+        self,
+        location_id: str,
+        reviews: List[Review],
+        position: int = 0,
+        scraped_at: Optional[datetime] = None,
+    ):
+        """
+        Buffer the reviews of a location and append a batch once `batch_rows` are buffered.
+
+        Args:
+            location_id (str): The location the reviews belong to.
+            reviews (list): Reviews as returned by `extract_reviews`, newest first.
+            position (int): Rank of the first review within the scrape of the location.
+            scraped_at (datetime): Start of the scrape of the location, shared by all its
+                                   reviews so `position` orders them. Default: now.
+        """
+        scraped_at = scraped_at or datetime.now(timezone.utc)
+        for offset, review in enumerate(reviews):
+            self._keys.append(
+                (
+                    str(location_id),
+                    review_fingerprint(review),
+                    position + offset,
+                    scraped_at,
+                )
+            )
+            self._reviews.append(review)
+
+        if len(self._reviews) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Append the buffered reviews, waiting for the acknowledgements of the pending batches
+        every `sync_batches` batches only.
+        """
+        if not self._reviews:
+            return
+
+        columns = [
+            *zip(*self._keys),
+            *(
+                [getattr(review, name) for review in self._reviews]
+                for name in REVIEW_FIELDS
+            ),
+        ]
+        self.stream.append(
+            pa.Table.from_arrays(
+                [
+                    pa.array(column, type=field.type)
+                    for column, field in zip(columns, REVIEW_ROW_SCHEMA)
+                ],
+                schema=REVIEW_ROW_SCHEMA,
+            )
+        )
+        self._keys, self._reviews = [], []
+
+        self._unsynced_batches += 1
+        if self._unsynced_batches >= self.sync_batches:
+            self.sync()
+
+    def sync(self):
+        """Append the buffered reviews and wait until every batch is committed."""
+        self.flush()
+        self.stream.flush()
+        self._unsynced_batches = 0
+
+    def close(self):
+        """Append the buffered reviews and wait until every batch is committed."""
+        self.flush()
+        self.stream.close()
+        log.success(
+            f"Appended {self.stream.rows_appended} reviews to {self.full_table_id}"
+        )
+
+    def __enter__(self) -> "ReviewTableWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReviewSink:
+    """
+    Collect the reviews of one location for a ReviewTableWriter, passed as the `sink` of
+    `parse_reviews`. Reviews already written for the location in this run, e.g. by an attempt
+    that was retried, are not written twice.
+    """
+
+    def __init__(self, writer: ReviewTableWriter, location_id: str):
+        self.writer = writer
+        self.location_id = location_id
+        self.scraped_at = datetime.now(timezone.utc)
+        self.fingerprints = set()
+
+    def __call__(self, reviews: List[Review]):
+        position = len(self.fingerprints)
+        new_reviews = []
+        for review in reviews:
+            fingerprint = review_fingerprint(review)
+            if fingerprint not in self.fingerprints:
+                self.fingerprints.add(fingerprint)
+                new_reviews.append(review)
+
+        self.writer.write(
+            self.location_id, new_reviews, position=position, scraped_at=self.scraped_at
+        )
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+
+def fetch_latest_fingerprints(
+    bigquery_handler: BigQueryHandler,
+    full_table_id: str,
+    location_ids: List[str],
+    newest: int = SCRAPE_REFRESH_KNOWN_REVIEWS,
+) -> Dict[str, Set[str]]:
+    """
+    Fetch the fingerprints of the newest stored reviews of each location.
+
+    Args:
+        bigquery_handler (BigQueryHandler): The handler of the project holding the table.
+        full_table_id (str): The review table, as 'project.dataset.table'.
+        location_ids (list): The locations to read.
+        newest (int): Number of reviews per location. Default: SCRAPE_REFRESH_KNOWN_REVIEWS.
+
+    Returns:
+        dict: Location ID -> fingerprints of its newest reviews.
+    """
+    query = f"""
+    SELECT location_id, fingerprint
+    FROM `{full_table_id}`
+    WHERE location_id IN UNNEST(@location_ids)
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY location_id ORDER BY scraped_at DESC, position
+    ) <= {int(newest)}
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ArrayQueryParameter(
+                "location_ids",
+                "STRING",
+                [str(location_id) for location_id in location_ids],
+            )
+        ]
+    )
+
+    fingerprints: Dict[str, Set[str]] = {}
+    for row in bigquery_handler.fetch_arrow(query, job_config).to_pylist():
+        fingerprints.setdefault(row["location_id"], set()).add(row["fingerprint"])
+    return fingerprints
@@ -0,0 +1,326 @@
+from typing import Iterable, List
+
+import pyarrow as pa
+from google.cloud import bigquery
+
+"""
+Arrow schemas of every record written by the fetcher. Tables are built from the scraper and API
+output with these schemas, so column types do not depend on what a batch happens to hold, and
+BigQuery loads get an explicit schema instead of autodetecting one.
+"""
+
+# Content API nearby_search / location details record
+ADDRESS = pa.struct(
+    [
+        ("street1", pa.string()),
+        ("street2", pa.string()),
+        ("city", pa.string()),
+        ("state", pa.string()),
+        ("country", pa.string()),
+        ("postalcode", pa.string()),
+        ("address_string", pa.string()),
+    ]
+)
+
+API_INFO_SCHEMA = pa.schema(
+    [
+        ("location_id", pa.string()),
+        ("name", pa.string()),
+        ("distance", pa.string()),
+        ("bearing", pa.string()),
+        ("address_obj", ADDRESS),
+    ]
+)
+
+# A review as returned by `extract_reviews` or the RapidAPI fallback
+REVIEW_FIELDS = [
+    pa.field("user", pa.string()),
+    pa.field("username", pa.string()),
+    pa.field("country", pa.string()),
+    pa.field("title", pa.string()),
+    pa.field("text", pa.string()),
+    pa.field("rating", pa.float64()),
+    pa.field("review_date", pa.date32()),
+    pa.field("review_type", pa.string()),
+]
+REVIEW = pa.struct(REVIEW_FIELDS)
+
+# Location row of the scraper table, with its reviews nested
+SCRAPE_INFO_SCHEMA = pa.schema(
+    [
+        ("location_id", pa.string()),
+        ("location_url", pa.string()),
+        ("address_from_url", pa.string()),
+        ("google_maps_link", pa.string()),
+        ("lat", pa.float64()),
+        ("long", pa.float64()),
+        ("tel", pa.string()),
+        ("open_hour", pa.string()),
+        ("price_range", pa.string()),
+        ("cuisine", pa.list_(pa.string())),
+        ("ranking", pa.int64()),
+        ("rating", pa.float64()),
+        ("review_count", pa.int64()),
+        ("review_count_scraped", pa.int64()),
+        ("reviews", pa.list_(REVIEW)),
+        # When the location was last scraped, refreshes start with the oldest
+        ("scraped_at", pa.timestamp("us", tz="UTC")),
+    ]
+)
+
+# Location row of the scraper table when reviews live in the review table
+LOCATION_SUMMARY_SCHEMA = SCRAPE_INFO_SCHEMA.remove(
+    SCRAPE_INFO_SCHEMA.get_field_index("reviews")
+)
+
+# Row of the append-only review table, keyed by (location_id, fingerprint)
+REVIEW_ROW_SCHEMA = pa.schema(
+    [
+        pa.field("location_id", pa.string(), nullable=False),
+        pa.field("fingerprint", pa.string(), nullable=False),
+        pa.field("position", pa.int64()),
+        pa.field("scraped_at", pa.timestamp("us", tz="UTC"), nullable=False),
+        *REVIEW_FIELDS,
+    ]
+)
+
+BIGQUERY_TYPES = {
+    pa.string(): "STRING",
+    pa.large_string(): "STRING",
+    pa.bool_(): "BOOL",
+    pa.int32(): "INT64",
+    pa.int64(): "INT64",
+    pa.float32(): "FLOAT64",
+    pa.float64(): "FLOAT64",
+    pa.date32(): "DATE",
+    pa.binary(): "BYTES",
+}
+
+
+def _column(records: List, field: pa.Field) -> pa.Array:
+    values = [getattr(record, field.name, None) for record in records]
+
+    # Nested records, e.g. the reviews of a location, are passed as tuples in schema order
+    if pa.types.is_list(field.type) and pa.types.is_struct(field.type.value_type):
+        values = [
+            None
+            if items is None
+            else [item if isinstance(item, dict) else item.astuple() for item in items]
+            for items in values
+        ]
+    return pa.array(values, type=field.type)
+
+
+def build_table(records: Iterable, schema: pa.Schema) -> pa.Table:
+    """
+    Build an Arrow table from records with a registry schema, one column at a time. Missing
+    fields are null and fields outside the schema are dropped.
+
+    Args:
+        records (Iterable): Records of `tripadvisor.records` or dictionaries, e.g. scraped
+                            locations or reviews.
+        schema (pa.Schema): One of the schemas of this module.
+    """
+    records = list(records)
+    if not records or isinstance(records[0], dict):
+        return pa.Table.from_pylist(records, schema=schema)
+
+    return pa.Table.from_arrays(
+        [_column(records, field) for field in schema], schema=schema
+    )
+
+
+def _bigquery_field(field: pa.Field) -> bigquery.SchemaField:
+    mode = "NULLABLE" if field.nullable else "REQUIRED"
+    field_type = field.type
+
+    if pa.types.is_list(field_type) or pa.types.is_large_list(field_type):
+        mode = "REPEATED"
+        field_type = field_type.value_type
+
+    if pa.types.is_struct(field_type):
+        return bigquery.SchemaField(
+            field.name,
+            "RECORD",
+            mode=mode,
+            fields=[_bigquery_field(child) for child in field_type],
+        )
+    if pa.types.is_timestamp(field_type):
+        return bigquery.SchemaField(field.name, "TIMESTAMP", mode=mode)
+
+    return bigquery.SchemaField(field.name, BIGQUERY_TYPES[field_type], mode=mode)
+
+
+def bigquery_schema(schema: pa.Schema) -> List[bigquery.SchemaField]:
+    """
+    Convert a registry schema to the BigQuery schema of its table.
+
+    Args:
+        schema (pa.Schema): One of the schemas of this module.
+    """
+    return [_bigquery_field(field) for field in schema]
+
+
+"""
+Migration of tables loaded before the registry. Autodetected Parquet loads stored list columns
+as `col.list[].element` records and review dates as strings; the SELECT built here rewrites a
+table into the registry layout, keeping its columns outside the registry as they are.
+"""
+
+# Legacy names returned by the BigQuery API for the standard SQL types
+_BIGQUERY_TYPE_ALIASES = {
+    "INTEGER": "INT64",
+    "FLOAT": "FLOAT64",
+    "BOOLEAN": "BOOL",
+    "STRUCT": "RECORD",
+}
+
+
+def _type_name(field: bigquery.SchemaField) -> str:
+    return _BIGQUERY_TYPE_ALIASES.get(field.field_type, field.field_type)
+
+
+def _fields_match(
+    existing: bigquery.SchemaField, expected: bigquery.SchemaField
+) -> bool:
+    if _type_name(existing) != _type_name(expected):
+        return False
+    if (existing.mode == "REPEATED") != (expected.mode == "REPEATED"):
+        return False
+
+    children = {child.name: child for child in existing.fields}
+    return all(
+        child.name in children and _fields_match(children[child.name], child)
+        for child in expected.fields
+    )
+
+
+def schema_matches(table_schema: List[bigquery.SchemaField], schema: pa.Schema) -> bool:
+    """
+    Whether a table holds every field of a registry schema, in the registry layout.
+
+    Args:
+        table_schema (list): The schema of the BigQuery table.
+        schema (pa.Schema): One of the schemas of this module.
+    """
+    columns = {field.name: field for field in table_schema}
+    return all(
+        expected.name in columns and _fields_match(columns[expected.name], expected)
+        for expected in bigquery_schema(schema)
+    )
+
+
+def _sql_type(data_type: pa.DataType) -> str:
+    if pa.types.is_list(data_type):
+        return f"ARRAY<{_sql_type(data_type.value_type)}>"
+    if pa.types.is_struct(data_type):
+        return f"STRUCT<{', '.join(f'`{child.name}` {_sql_type(child.type)}' for child in data_type)}>"
+    if pa.types.is_timestamp(data_type):
+        return "TIMESTAMP"
+    return BIGQUERY_TYPES[data_type]
+
+
+def _null(data_type: pa.DataType) -> str:
+    return f"CAST(NULL AS {_sql_type(data_type)})"
+
+
+def _is_legacy_list(field: bigquery.SchemaField) -> bool:
+    return (
+        _type_name(field) == "RECORD"
+        and field.mode != "REPEATED"
+        and len(field.fields) == 1
+        and field.fields[0].name == "list"
+        and field.fields[0].mode == "REPEATED"
+        and [child.name for child in field.fields[0].fields] == ["element"]
+    )
+
+
+def _converted(
+    expression: str, existing: bigquery.SchemaField, field: pa.Field, depth: int = 0
+) -> str:
+    """SQL converting `expression`, of the `existing` field, to the registry `field`."""
+    data_type = field.type
+    item = f"item_{depth}"
+
+    if pa.types.is_list(data_type):
+        if existing.mode == "REPEATED":
+            source, value = f"UNNEST({expression})", item
+            element = bigquery.SchemaField(
+                existing.name, existing.field_type, fields=existing.fields
+            )
+        elif _is_legacy_list(existing):
+            source, value = f"UNNEST({expression}.list)", f"{item}.element"
+            element = existing.fields[0].fields[0]
+        else:
+            return _null(data_type)
+
+        value_field = pa.field(field.name, data_type.value_type)
+        return (
+            f"ARRAY(SELECT {_converted(value, element, value_field, depth + 1)} "
+            f"FROM {source} AS {item} WITH OFFSET AS position_{depth} "
+            f"WHERE {value} IS NOT NULL ORDER BY position_{depth})"
+        )
+
+    if existing.mode == "REPEATED":
+        return _null(data_type)
+
+    if pa.types.is_struct(data_type):
+        if _type_name(existing) != "RECORD":
+            return _null(data_type)
+
+        children = {child.name: child for child in existing.fields}
+        values = ", ".join(
+            (
+                _converted(
+                    f"{expression}.`{child.name}`", children[child.name], child, depth
+                )
+                if child.name in children
+                else _null(child.type)
+            )
+            + f" AS `{child.name}`"
+            for child in data_type
+        )
+        return f"IF({expression} IS NULL, NULL, STRUCT({values}))"
+
+    target = _sql_type(data_type)
+    if _type_name(existing) == target:
+        converted = expression
+    elif target == "DATE" and _type_name(existing) == "STRING":
+        # Scraped review dates, e.g. "January 5, 2024", or RapidAPI ISO dates
+        converted = (
+            f"COALESCE(SAFE.PARSE_DATE('%Y-%m-%d', {expression}), "
+            f"SAFE.PARSE_DATE('%B %d, %Y', {expression}))"
+        )
+    else:
+        converted = f"SAFE_CAST({expression} AS {target})"
+
+    if field.name == "rating":
+        # Reviews scraped without a rating were stored as -1, now null as in `Review.from_dict`
+        return f"IF({converted} < 0, NULL, {converted})"
+    return converted
+
+
+def migration_select(
+    full_table_id: str, table_schema: List[bigquery.SchemaField], schema: pa.Schema
+) -> str:
+    """
+    Build the SELECT rewriting a table into the layout of a registry schema. Registry fields
+    missing from the table are null, columns outside the registry are kept as they are.
+
+    Args:
+        full_table_id (str): The table to rewrite.
+        table_schema (list): The schema of the BigQuery table.
+        schema (pa.Schema): One of the schemas of this module.
+    """
+    columns = {field.name: field for field in table_schema}
+    select = [
+        (
+            _converted(f"source.`{field.name}`", columns[field.name], field)
+            if field.name in columns
+            else _null(field.type)
+        )
+        + f" AS `{field.name}`"
+        for field in schema
+    ]
+    select.extend(f"source.`{name}`" for name in columns if name not in schema.names)
+    return f"SELECT {', '.join(select)} FROM `{full_table_id}` AS source"
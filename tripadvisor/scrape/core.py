@@ -1,150 +1,328 @@
 import asyncio
+import hashlib
 import json
 import re
-from typing import Dict, List
+from contextlib import aclosing
+from dataclasses import asdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
+import pyarrow as pa
+import pyarrow.compute as pc
 from loguru import logger as log
 
-from tripadvisor._constants import SCRAPE_DELAY, SCRAPE_MAX_REVIEWS
+from tripadvisor._constants import (
+    BASE_URL,
+    SCRAPE_MAX_REVIEWS,
+    SCRAPE_REFRESH_KNOWN_REVIEWS,
+)
+from tripadvisor.records import REVIEW_FIELDS, Review, ScrapeInfo
+from tripadvisor.retry import Blocked
 from tripadvisor.scrape.utils import (
-    fetch_soup_from_url,
-    get_httpx_client,
+    FetchError,
+    LocationNotFound,
+    ScrapeSession,
+    fetch_html,
+    normalize_date_array,
     normalize_float,
+    normalize_float_array,
     normalize_int,
-    normalize_text,
+    normalize_text_array,
+    prefetch_html,
 )
 
 
-async def parse_reviews(url, count):
-    """Parse the reviews of a restaurant and return the parsed information
+def extract_reviews(soup) -> List[Review]:
+    """Extract the review cards of a review page. The raw strings of the cards are collected
+    first, then normalized one column at a time by `normalize_review_columns`.
+
+    Args:
+        soup (BeautifulSoup): The parsed review page, from any parser backend.
+    """
+    raw = {name: [] for name in REVIEW_FIELDS}
+
+    for review in soup.select("div[data-automation='reviewCard']"):
+        try:
+            review_tag = review.select_one("a[target*='_self']")
+            review_href = review_tag.get("href")
+            review_username = review_tag.select_one("img").get("alt")
+
+        except:
+            review_href = None
+            review_username = None
+
+        try:
+            user_country_tag = review.select_one("div.biGQs._P.pZUbB.osNWb span")
+            review_usercountry = user_country_tag.get_text(strip=True)
+        except:
+            review_usercountry = None
+
+        try:
+            review_title = review.select_one(
+                "div[data-test-target='review-title'] a"
+            ).get_text(strip=True)
+        except:
+            review_title = None
+
+        try:
+            review_text = " ".join(
+                span.get_text(strip=True)
+                for span in review.select("div[data-test-target='review-body'] span")
+            )
+        except:
+            review_text = None
+
+        try:
+            rating = review.select_one("div[class*='OSBmi'] svg title").get_text(
+                strip=True
+            )
+        except:
+            rating = None
+
+        try:
+            review_date = review.select_one(
+                "div[class*='neAPm'] div[class*='biGQs _P pZUbB ncFvv osNWb']"
+            ).get_text()
+        except:
+            review_date = None
+
+        try:
+            review_type = review.select_one(
+                "div[class*='aVuQn'] span[class*='DlAxN']"
+            ).get_text(strip=True)
+        except:
+            review_type = None
+
+        for name, value in zip(
+            REVIEW_FIELDS,
+            (
+                review_href,
+                review_username,
+                review_usercountry,
+                review_title,
+                review_text,
+                rating,
+                review_date,
+                review_type,
+            ),
+        ):
+            raw[name].append(value)
+
+    if not raw["user"]:
+        return []
+    columns = normalize_review_columns(raw)
+    return [Review(*values) for values in zip(*columns)]
+
+
+def normalize_review_columns(raw: Dict[str, list]) -> List[list]:
+    """Normalize the raw strings of a page of reviews, one vectorized pass per field
+
+    Args:
+        raw (dict): Review field -> raw strings of the page, as collected by `extract_reviews`.
+
+    Returns:
+        list: The normalized values of every field, in the order of REVIEW_FIELDS.
+    """
+    column = {name: pa.array(values, pa.string()) for name, values in raw.items()}
+
+    # The user ID is the last segment of the profile link
+    column["user"] = normalize_text_array(
+        pc.replace_substring_regex(column["user"], r"^.*/", "")
+    )
+    # The country slot holds the contribution count when the user has no country
+    column["country"] = pc.if_else(
+        pc.fill_null(pc.match_substring(column["country"], "contribution"), False),
+        pa.scalar(None, pa.string()),
+        column["country"],
+    )
+    column["title"] = normalize_text_array(column["title"])
+    column["text"] = pc.utf8_trim_whitespace(
+        pc.replace_substring(normalize_text_array(column["text"]), "Read more", "")
+    )
+    column["rating"] = normalize_float_array(column["rating"])
+    column["review_date"] = normalize_date_array(column["review_date"])
+    column["review_type"] = normalize_text_array(pc.utf8_upper(column["review_type"]))
+
+    return [column[name].to_pylist() for name in REVIEW_FIELDS]
+
+
+def review_fingerprint(review: Review) -> str:
+    """Return a stable fingerprint of a review from its user, date and a hash of its title
+
+    Args:
+        review (Review): A review as returned by `extract_reviews`.
+    """
+    title_hash = hashlib.sha1((review.title or "").encode("utf-8")).hexdigest()
+    # Dates are written as they used to be scraped, so fingerprints stored by earlier runs match
+    review_date = review.review_date
+    if review_date is not None:
+        review_date = f"{review_date:%B} {review_date.day}, {review_date.year}"
+    return f"{review.user}|{review_date}|{title_hash[:16]}"
+
+
+class ReviewHistory(NamedTuple):
+    """What the last run stored for a location: its review count and the fingerprints of
+    its newest reviews."""
+
+    review_count: int
+    fingerprints: Set[str]
+
+    @classmethod
+    def from_reviews(
+        cls,
+        review_count: int,
+        reviews: Iterable[Review],
+        newest: int = SCRAPE_REFRESH_KNOWN_REVIEWS,
+    ) -> "ReviewHistory":
+        """Build the history of a location from its stored reviews, newest first
+
+        Args:
+            review_count (int): The review count of the landing page at the last run.
+            reviews (list): The stored reviews, in the newest-first order they were scraped.
+            newest (int): Number of newest reviews to fingerprint. Default: SCRAPE_REFRESH_KNOWN_REVIEWS.
+        """
+        fingerprints = set()
+        for review in reviews or []:
+            if len(fingerprints) >= newest:
+                break
+            fingerprints.add(review_fingerprint(review))
+        return cls(review_count or 0, fingerprints)
+
+
+def merge_reviews(new_reviews: List[Review], old_reviews: List[Review]) -> List[Review]:
+    """Put newly scraped reviews in front of the stored ones, dropping duplicates
+
+    Args:
+        new_reviews (list): Reviews of an incremental pass, newest first.
+        old_reviews (list): Reviews stored by the previous runs, newest first.
+    """
+    merged, seen = [], set()
+    for review in [*new_reviews, *(old_reviews or [])]:
+        fingerprint = review_fingerprint(review)
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            merged.append(review)
+    return merged
+
+
+async def parse_reviews(
+    url,
+    count,
+    session: ScrapeSession,
+    first_page: Optional[List[Review]] = None,
+    known: Optional[Set[str]] = None,
+    sink: Optional[Callable[[List[Review]], None]] = None,
+) -> List[Review]:
+    """Parse the reviews of a restaurant and return the parsed information.
+    Requests are paced by the session rate limiter only; extraction runs at full speed.
+
     Args:
         url (str): The URL of the restaurant.
         count (int): The number of all reviews in that page for cross-checking.
+        session (ScrapeSession): The run-scoped session used to fetch review pages.
+        first_page (list): Reviews already extracted from the restaurant page. The first
+                           review page is the restaurant page itself, so it is not fetched again.
+        known (set): Fingerprints of reviews stored by a previous run. Only unknown reviews are
+                     returned and paging stops at the first page holding known reviews only.
+        sink (Callable): Called with the new reviews of each page as soon as it is parsed.
+                         The reviews are then handed to the sink instead of being returned.
     """
     if count <= 0:
         log.warning("There are no reviews to parse. Skipping...")
         return []
 
+    def _new_reviews(page_reviews: List[Review]) -> List[Review]:
+        if not known:
+            return page_reviews
+        return [
+            review for review in page_reviews if review_fingerprint(review) not in known
+        ]
+
     if not url.endswith("#REVIEWS"):
         url += "#REVIEWS"
 
     max_reviews = min(count, SCRAPE_MAX_REVIEWS)
     reviews = []
+    scraped = 0
     page_increment = 15
 
-    for start in range(0, max_reviews, page_increment):
-        if start > 0:
-            review_page_url = url.replace("-Reviews-", f"-Reviews-or{start}-")
-        else:
-            review_page_url = url
-        log.info(f"Parsing: {review_page_url}")
+    def _emit(new_reviews: List[Review]):
+        nonlocal scraped
+        scraped += len(new_reviews)
+        if sink is None:
+            reviews.extend(new_reviews)
+        elif new_reviews:
+            sink(new_reviews)
+
+    page_urls = [
+        url.replace("-Reviews-", f"-Reviews-or{start}-") if start > 0 else url
+        for start in range(0, max_reviews, page_increment)
+    ]
 
-        async with get_httpx_client(follow_redirects=False) as client:
-            soup = await fetch_soup_from_url(client=client, url=review_page_url)
+    if first_page is not None:
+        if not first_page:
+            log.warning("No reviewCard found. Skipping...")
+            return reviews
+
+        new_reviews = _new_reviews(first_page)
+        _emit(new_reviews)
+        page_urls = page_urls[1:]
+        if not new_reviews:
+            log.info(f"No new reviews on the first page of {url}")
+            return reviews
+
+    # Keep a window of review pages in flight; pages are still parsed in page order.
+    # A refresh expects to stop within a page or two, so it fetches one page at a time.
+    async with aclosing(
+        prefetch_html(
+            session,
+            page_urls,
+            follow_redirects=False,
+            prefetch_pages=1 if known else None,
+        )
+    ) as pages:
+        async for review_page_url, content in pages:
+            log.info(f"Parsing: {review_page_url}")
 
-        review_blocks = soup.select("div[data-automation='reviewCard']")
+            page_reviews = await session.extract(extract_reviews, content)
 
-        if not review_blocks:
-            log.warning("No reviewCard found. Skipping...")
-            break
-
-        for review in review_blocks:
-            try:
-                review_tag = review.select_one("a[target*='_self']")
-                review_userid = normalize_text(review_tag.get("href").split("/")[-1])
-                review_username = review_tag.select_one("img").get("alt")
-
-            except:
-                review_userid = None
-                review_username = None
-
-            try:
-                user_country_tag = review.select_one("div.biGQs._P.pZUbB.osNWb span")
-                review_usercountry = user_country_tag.get_text(strip=True)
-                if "contribution" in review_usercountry:
-                    review_usercountry = None
-            except:
-                review_usercountry = None
-
-            try:
-                review_title = normalize_text(
-                    review.select_one(
-                        "div[data-test-target='review-title'] a"
-                    ).get_text(strip=True)
-                )
-            except:
-                review_title = None
-
-            try:
-                review_text = normalize_text(
-                    " ".join(
-                        span.get_text(strip=True)
-                        for span in review.select(
-                            "div[data-test-target='review-body'] span"
-                        )
-                    )
-                )
-            except:
-                review_text = None
-
-            try:
-                rating_element = review.select_one("div[class*='OSBmi'] svg title")
-                rating = (
-                    normalize_float(rating_element.get_text(strip=True).split(" ")[0])
-                    if rating_element
-                    else -1
-                )
-            except:
-                rating = -1
-
-            try:
-                review_date = (
-                    review.select_one(
-                        "div[class*='neAPm'] div[class*='biGQs _P pZUbB ncFvv osNWb']"
-                    )
-                    .get_text()
-                    .split(" ")[1:-1]
-                )
-                review_date = normalize_text(" ".join(review_date))
-            except:
-                review_date = None
-
-            try:
-                review_type = normalize_text(
-                    review.select_one("div[class*='aVuQn'] span[class*='DlAxN']")
-                    .get_text(strip=True)
-                    .upper()
-                )
-            except:
-                review_type = None
-
-            reviews.append(
-                {
-                    "user": review_userid,
-                    "username": review_username,
-                    "country": review_usercountry,
-                    "title": review_title,
-                    "text": review_text.replace("Read more", "").strip(),
-                    "rating": rating,
-                    "review_date": review_date,
-                    "review_type": review_type,
-                }
-            )
+            if not page_reviews:
+                log.warning("No reviewCard found. Skipping...")
+                break
 
-            await asyncio.sleep(SCRAPE_DELAY / 2)
+            new_reviews = _new_reviews(page_reviews)
+            _emit(new_reviews)
 
-        if len(reviews) >= max_reviews:
-            break
+            if not new_reviews:
+                log.info(f"Reached known reviews at {review_page_url}")
+                break
+
+            if scraped >= max_reviews:
+                break
 
     return reviews
 
 
-async def parse_source_page(url, soup) -> Dict:
-    """Parse the source page and return the parsed information
+class IncompletePage(Exception):
+    """Raised when a restaurant page was served without its overview or detail blocks."""
+
+
+def is_source_page(soup) -> bool:
+    """Check that a restaurant page was fully served, with its overview and detail blocks
 
     Args:
-        url (str): The URL of the source page.
-        soup (BeautifulSoup): The BeautifulSoup object of the source
+        soup (BeautifulSoup): The parsed restaurant page, from any parser backend.
+    """
+    return (
+        soup.find("div", {"data-automation": "reviewsOverviewSections"}) is not None
+        and soup.find("div", {"data-test-target": "restaurant-detail-info"}) is not None
+    )
+
+
+def extract_source_info(soup) -> ScrapeInfo:
+    """Extract the restaurant details of a source page, without its reviews
+
+    Args:
+        soup (BeautifulSoup): The parsed source page, from any parser backend.
     """
 
     info_div = soup.find("div", {"data-test-target": "restaurant-detail-info"})
@@ -231,61 +409,143 @@ async def parse_source_page(url, soup) -> Dict:
     except:
         open_hour = None
 
-    reviews = await parse_reviews(url, review_count)
-
-    return {
-        "url": url,
-        "tel": tel,
-        "open_hour": open_hour,
-        "address_from_url": address_from_url,
-        "google_maps_link": google_maps_link,
-        "lat": float(lat.strip().replace(",", "")),
-        "long": float(long.strip().replace(",", "")),
-        "price_range": price_range,
-        "cuisine": cuisine,
-        "ranking": ranking,
-        "rating": rating_number,
-        "review_count": review_count,
-        "review_count_scraped": len(reviews),
-        "reviews": reviews,
-    }
-
-
-async def scrape_url(url: str) -> List[Dict]:
-    """Scrape a URL and return the parsed information from the url.
+    return ScrapeInfo(
+        tel=tel,
+        open_hour=open_hour,
+        address_from_url=address_from_url,
+        google_maps_link=google_maps_link,
+        lat=float(lat.strip().replace(",", "")),
+        long=float(long.strip().replace(",", "")),
+        price_range=price_range,
+        cuisine=cuisine,
+        ranking=ranking,
+        rating=rating_number,
+        review_count=review_count,
+    )
+
+
+def extract_source_page(soup) -> Optional[Tuple[ScrapeInfo, List[Review]]]:
+    """Extract the restaurant details and the first review page of a source page,
+    or None if the page is incomplete
 
     Args:
-        url (str): The URL to scrape.
+        soup (BeautifulSoup): The parsed source page, from any parser backend.
     """
+    if not is_source_page(soup):
+        return None
 
-    attempt, retries = 0, 100
-    while attempt < retries:
-        try:
-            log.info(f"Fetching URL: {url} for attempt {attempt + 1}/{retries}...")
+    return extract_source_info(soup), extract_reviews(soup)
+
+
+async def parse_source_page(
+    url,
+    source_info: ScrapeInfo,
+    session: ScrapeSession,
+    first_page: Optional[List[Review]] = None,
+    history: Optional[ReviewHistory] = None,
+    sink: Optional[Callable[[List[Review]], None]] = None,
+) -> ScrapeInfo:
+    """Parse the reviews of a source page and return the parsed information, completing
+    `source_info` in place
+
+    Args:
+        url (str): The URL of the source page.
+        source_info (ScrapeInfo): The restaurant details from `extract_source_page`.
+        session (ScrapeSession): The run-scoped session used to fetch review pages.
+        first_page (list): The reviews already extracted from the source page.
+        history (ReviewHistory): What the last run stored for the location. The reviews are
+                                 then only the new ones, and the review pass is skipped when
+                                 the review count did not change.
+        sink (Callable): Receives the reviews page by page instead, see `parse_reviews`.
+    """
+    if history is not None and source_info.review_count == history.review_count:
+        log.info(f"Review count unchanged, skipping the review pass of {url}")
+        reviews = []
+    else:
+        reviews = await parse_reviews(
+            url,
+            source_info.review_count,
+            session,
+            first_page=first_page,
+            known=history.fingerprints if history is not None else None,
+            sink=sink,
+        )
 
-            async with get_httpx_client(follow_redirects=True) as client:
-                soup = await fetch_soup_from_url(client=client, url=url)
+    source_info.url = url
+    source_info.review_count_scraped = len(reviews)
+    source_info.reviews = reviews
+    return source_info
 
-            if (
-                soup.find("div", {"data-automation": "reviewsOverviewSections"})
-                is not None
-                and soup.find("div", {"data-test-target": "restaurant-detail-info"})
-                is not None
-            ):
-                parsed_info = await parse_source_page(url, soup)
-                return parsed_info
 
-            log.info("Retrying fetch for overview tab...")
-            attempt += 1
+async def resolve_location_url(
+    location_id, session: ScrapeSession
+) -> Tuple[str, Optional[bytes]]:
+    """Follow the redirect of a location ID to its restaurant page. The page body is returned
+    with the canonical URL so it can be scraped without downloading it again.
 
-        except Exception as e:
-            log.info(f"Error on attempt {attempt + 1}/{retries}: {e}")
-            log.info(f"Retrying in {SCRAPE_DELAY * 2} seconds...")
-            attempt += 1
-        except AssertionError:
-            raise AssertionError("Get blocked by TripAdvisor. Not trying again.")
-        finally:
-            await asyncio.sleep(SCRAPE_DELAY * 2)
+    Args:
+        location_id (str): Location ID on TripAdvisor.
+        session (ScrapeSession): The run-scoped session shared by every page request.
+    """
+    response = await session.get(f"{BASE_URL}/{location_id}", follow_redirects=True)
+    if response.status_code == 403:
+        raise Blocked(f"Blocked by TripAdvisor: {location_id}")
+    if response.status_code == 404:
+        raise LocationNotFound(f"Location not found: {location_id}")
+
+    content = response.content if response.status_code == 200 else None
+    return str(response.url), content
+
+
+async def scrape_url(
+    url: str,
+    session: ScrapeSession,
+    content: Optional[bytes] = None,
+    history: Optional[ReviewHistory] = None,
+    sink: Optional[Callable[[List[Review]], None]] = None,
+) -> ScrapeInfo:
+    """Scrape a URL and return the parsed information from the url.
+    Incomplete pages and transient errors of the landing page are retried with the session
+    retry policy; review pages are retried one by one by the same policy, so a failing review
+    page does not fetch the landing page again. A missing location, a cache miss in replay
+    mode or a stopped run are raised at once.
+
+    Args:
+        url (str): The URL to scrape.
+        session (ScrapeSession): The run-scoped session shared by every page request.
+        content (bytes): The page source if it was already downloaded, e.g. while resolving
+                         the location URL. It is used for the first attempt only.
+        history (ReviewHistory): What the last run stored for the location, to only scrape
+                                 the reviews posted since. See `parse_source_page`.
+        sink (Callable): Receives the reviews page by page instead, see `parse_reviews`.
+    """
+    pages = [content]
+
+    async def _attempt() -> Tuple[ScrapeInfo, List[Review]]:
+        page = pages.pop() if pages else None
+        if page is None:
+            log.info(f"Fetching URL: {url}...")
+            # One request per attempt, the attempts are counted by this policy only
+            page = await fetch_html(session, url)
+            if page is None:
+                raise FetchError(f"Failed to fetch: {url}")
+
+        source_page = await session.extract(extract_source_page, page)
+        if source_page is None:
+            raise IncompletePage(f"Overview tab missing: {url}")
+        return source_page
+
+    source_info, first_page = await session.retry_policy.run(
+        _attempt, name=f"scrape {url}"
+    )
+    return await parse_source_page(
+        url,
+        source_info,
+        session,
+        first_page=first_page,
+        history=history,
+        sink=sink,
+    )
 
 
 if __name__ == "__main__":
@@ -294,10 +554,13 @@ if __name__ == "__main__":
     ]
 
     async def run():
-        for URL in TEST_URLS:
-            parsed_info = await scrape_url(URL)
-            sink_file_path = f"data/TEST_{URL.split('Reviews-')[1].split('-')[0]}.json"
-            with open(sink_file_path, "w") as f:
-                json.dump(parsed_info, f, indent=4)
+        async with ScrapeSession() as session:
+            for URL in TEST_URLS:
+                parsed_info = await scrape_url(URL, session)
+                sink_file_path = (
+                    f"data/TEST_{URL.split('Reviews-')[1].split('-')[0]}.json"
+                )
+                with open(sink_file_path, "w") as f:
+                    json.dump(asdict(parsed_info), f, indent=4)
 
     asyncio.run(run())
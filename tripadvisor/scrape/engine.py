@@ -0,0 +1,54 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Tuple
+
+from loguru import logger as log
+
+from tripadvisor._constants import SCRAPE_CONCURRENCY
+
+
+class ScrapeEngine:
+    """
+    Bounded-concurrency runner for scraping many locations at once.
+    At most `concurrency` workers are in flight; request pacing is left to the rate limiter
+    of the ScrapeSession the workers share.
+    """
+
+    def __init__(self, concurrency: int = SCRAPE_CONCURRENCY):
+        """
+        Initialize the ScrapeEngine.
+
+        Args:
+            concurrency (int): Maximum number of locations scraped at the same time.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+
+        self.concurrency = concurrency
+
+    async def map(
+        self, items: Iterable[Any], worker: Callable[[Any], Awaitable[Any]]
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        """
+        Run `worker` over every item and yield `(item, result)` pairs as they complete.
+        Outstanding workers are cancelled if the consumer stops early or a worker raises.
+
+        Args:
+            items (Iterable): The items to process, e.g. location IDs.
+            worker (Callable): Coroutine function called with one item.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _run(item):
+            async with semaphore:
+                return item, await worker(item)
+
+        tasks = [asyncio.create_task(_run(item)) for item in items]
+        log.info(f"Scraping {len(tasks)} items with concurrency={self.concurrency}")
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
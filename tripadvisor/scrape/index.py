@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import time
+from typing import Iterable, Optional, Tuple
+
+from loguru import logger as log
+
+from tripadvisor._constants import LOCATION_INDEX_PATH, LOCATION_INDEX_TTL
+
+
+class LocationIndex:
+    """
+    Persistent SQLite index mapping a location ID to its canonical `Restaurant_Review-...` URL,
+    so repeat runs do not need a redirect request to find where a location lives.
+    Entries expire after `ttl` seconds and are invalidated when their URL returns 404.
+    """
+
+    def __init__(
+        self, path: str = LOCATION_INDEX_PATH, ttl: float = LOCATION_INDEX_TTL
+    ):
+        """
+        Initialize the LocationIndex.
+
+        Args:
+            path (str): Path to the SQLite file. Default: LOCATION_INDEX_PATH.
+            ttl (float): Seconds before an entry must be resolved again. Default: LOCATION_INDEX_TTL.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS location_url (
+                location_id TEXT PRIMARY KEY,
+                location_url TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+            """
+        )
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM location_url").fetchone()[
+            0
+        ]
+
+    def get(self, location_id) -> Optional[str]:
+        """
+        Return the indexed URL of a location, or None if it is unknown or expired.
+
+        Args:
+            location_id (str): Location ID on TripAdvisor.
+        """
+        row = self.connection.execute(
+            "SELECT location_url FROM location_url WHERE location_id = ? AND resolved_at > ?",
+            (str(location_id), time.time() - self.ttl),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, location_id, location_url: str) -> None:
+        """
+        Store the URL a location redirected to.
+
+        Args:
+            location_id (str): Location ID on TripAdvisor.
+            location_url (str): The canonical URL of the location.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO location_url VALUES (?, ?, ?)",
+            (str(location_id), location_url, time.time()),
+        )
+        self.connection.commit()
+
+    def put_many(self, rows: Iterable[Tuple[str, str]]) -> int:
+        """
+        Seed the index with known `(location_id, location_url)` pairs, e.g. previous scrape rows.
+        Entries already in the index are kept. Returns the number of new entries.
+
+        Args:
+            rows (Iterable): The `(location_id, location_url)` pairs.
+        """
+        before = len(self)
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO location_url VALUES (?, ?, ?)",
+            ((str(location_id), url, now) for location_id, url in rows if url),
+        )
+        self.connection.commit()
+        return len(self) - before
+
+    def invalidate(self, location_id) -> None:
+        """
+        Remove a location whose URL is no longer valid.
+
+        Args:
+            location_id (str): Location ID on TripAdvisor.
+        """
+        self.connection.execute(
+            "DELETE FROM location_url WHERE location_id = ?", (str(location_id),)
+        )
+        self.connection.commit()
+        log.info(f"Invalidated location URL index entry: {location_id}")
+
+    def close(self) -> None:
+        self.connection.close()
@@ -1,17 +1,115 @@
 import asyncio
-import unicodedata
-from typing import Optional
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 import httpx
+import pyarrow as pa
+import pyarrow.compute as pc
 from bs4 import BeautifulSoup
 from loguru import logger as log
 
 from tripadvisor._constants import (
     BASE_HEADERS,
-    SCRAPE_DELAY,
+    SCRAPE_BURST,
     SCRAPE_ENCODING,
+    SCRAPE_PARSE_WORKERS,
+    SCRAPE_PARSER_BACKEND,
+    SCRAPE_PREFETCH_PAGES,
+    SCRAPE_REQUESTS_PER_SECOND,
     SCRAPE_TIMEOUT,
 )
+from tripadvisor.cache import CacheMiss, ResponseCache
+from tripadvisor.ratelimit import AdaptiveRateLimiter, TokenBucket
+from tripadvisor.retry import Blocked, CircuitBreaker, CircuitOpen, RetryPolicy
+
+PARSER_BACKENDS = ("html.parser", "lxml", "lexbor")
+
+
+class LocationNotFound(Exception):
+    """Raised when TripAdvisor answers 404 for a location or one of its pages."""
+
+
+class FetchError(Exception):
+    """Raised when a page could not be fetched, worth retrying."""
+
+
+class LexborSoup:
+    """
+    BeautifulSoup-compatible wrapper around a selectolax (lexbor) node. It covers the
+    subset of the BeautifulSoup API used by the extractors in `scrape/core.py`.
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    @staticmethod
+    def _to_css(name: str, attrs: Optional[Dict] = None) -> str:
+        return name + "".join(
+            f'[{key}="{value}"]' for key, value in (attrs or {}).items()
+        )
+
+    def select(self, selector: str) -> List["LexborSoup"]:
+        return [LexborSoup(node) for node in self.node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional["LexborSoup"]:
+        node = self.node.css_first(selector)
+        return LexborSoup(node) if node is not None else None
+
+    def find(self, name: str, attrs: Optional[Dict] = None) -> Optional["LexborSoup"]:
+        return self.select_one(self._to_css(name, attrs))
+
+    def find_all(self, name: str, attrs: Optional[Dict] = None) -> List["LexborSoup"]:
+        return self.select(self._to_css(name, attrs))
+
+    def get(self, key: str, default=None):
+        return self.node.attributes.get(key, default)
+
+    def get_text(self, strip: bool = False) -> str:
+        return self.node.text(deep=True, strip=strip)
+
+
+def make_soup(markup, backend: str = SCRAPE_PARSER_BACKEND):
+    """Parse an HTML page with the given parser backend
+
+    Args:
+        markup (str | bytes): The page source.
+        backend (str): One of PARSER_BACKENDS. 'html.parser' and 'lxml' build a BeautifulSoup
+                       tree; 'lexbor' uses selectolax and needs the optional `selectolax` package.
+    """
+    if backend == "lexbor":
+        from selectolax.lexbor import LexborHTMLParser
+
+        return LexborSoup(LexborHTMLParser(markup))
+
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend: {backend}. Use one of {PARSER_BACKENDS}"
+        )
+
+    return BeautifulSoup(markup, backend)
+
+
+def parse_and_extract(
+    extractor: Callable, markup, backend: str = SCRAPE_PARSER_BACKEND
+):
+    """Parse a raw page and run an extractor on it. Runs in-loop or in a parse worker process.
+
+    Args:
+        extractor (Callable): Module-level function taking the parsed page, e.g. `extract_reviews`.
+        markup (bytes | str): The raw page source, bytes are decoded with SCRAPE_ENCODING.
+        backend (str): The parser backend, see `make_soup`.
+    """
+    if markup is None:
+        raise ValueError("No page content to parse")
+
+    if isinstance(markup, bytes):
+        markup = markup.decode(SCRAPE_ENCODING, errors="replace")
+
+    return extractor(make_soup(markup, backend))
 
 
 def get_httpx_client(
@@ -35,39 +133,359 @@ def get_httpx_client(
     )
 
 
-async def fetch_soup_from_url(
-    client: httpx.AsyncClient, url: str
-) -> Optional[BeautifulSoup]:
+class ScrapeSession:
+    """
+    Run-scoped HTTP/2 client pool shared by every page fetched during a scrape run.
+    Connections to TripAdvisor stay open between pages so each request can be multiplexed
+    on an existing connection instead of paying for a new TLS handshake. Every request goes
+    through the same token bucket, so the politeness budget holds across concurrent workers.
     """
-    Fetch a URL and return the page source as a BeautifulSoup object.
+
+    def __init__(
+        self,
+        http2_enabled: bool = True,
+        max_connections: int = 5,
+        rate_limiter: Optional[TokenBucket] = None,
+        prefetch_pages: int = SCRAPE_PREFETCH_PAGES,
+        parser_backend: str = SCRAPE_PARSER_BACKEND,
+        parse_workers: int = SCRAPE_PARSE_WORKERS,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize the ScrapeSession.
+
+        Args:
+            http2_enabled (bool): Whether to enable HTTP/2.
+            max_connections (int): The maximum number of connections to keep in the pool.
+            rate_limiter (TokenBucket): Limiter shared by every request to TripAdvisor.
+                                        Default: SCRAPE_REQUESTS_PER_SECOND with SCRAPE_BURST.
+            prefetch_pages (int): Number of review pages kept in flight per location.
+            parser_backend (str): HTML parser backend used for every page, see `make_soup`.
+            parse_workers (int): Number of worker processes parsing pages off the event loop.
+                                 Default: SCRAPE_PARSE_WORKERS, 0 parses on the event loop.
+            cache (ResponseCache): Optional on-disk response cache, used for record/replay.
+            retry_policy (RetryPolicy): Retries of the pages of a location. Default: RetryPolicy
+                                        with the SCRAPE_RETRY_* settings.
+            breaker (CircuitBreaker): Run-wide breaker pausing every request on repeated 403s.
+        """
+        if parser_backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {parser_backend}")
+
+        self.client = get_httpx_client(
+            follow_redirects=True,
+            http2_enabled=http2_enabled,
+            max_connections=max_connections,
+        )
+        self.rate_limiter = rate_limiter or TokenBucket(
+            SCRAPE_REQUESTS_PER_SECOND, SCRAPE_BURST
+        )
+        self.prefetch_pages = max(prefetch_pages, 1)
+        self.parser_backend = parser_backend
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy(
+            permanent=(LocationNotFound, CacheMiss)
+        )
+        self.breaker = breaker or CircuitBreaker()
+        self.executor = (
+            ProcessPoolExecutor(
+                max_workers=parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            if parse_workers > 0
+            else None
+        )
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        # Seconds spent waiting on the scheduler (rate limiter, open circuit), on the network and
+        # on parsing, summed over concurrent requests, so pacing is never mistaken for slow parsing
+        self.schedule_wait = 0.0
+        self.network_time = 0.0
+        self.parse_time = 0.0
+        self.pages_parsed = 0
+
+    async def _trace(self, event_name: str, info: Dict) -> None:
+        """Count wire-level events reported by httpcore for every request of the session."""
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event_name.endswith(".send_request_headers.started"):
+            self.requests_sent += 1
+
+    async def throttle(self) -> float:
+        """
+        Wait for a token of the shared rate limiter. Call it before any request to TripAdvisor
+        that does not go through `get`. Returns the time spent waiting.
+        """
+        return await self.rate_limiter.acquire()
+
+    def feedback(self, status_code: Optional[int], latency: float) -> None:
+        """
+        Report the outcome of a request to TripAdvisor to the circuit breaker and to an
+        adaptive rate limiter.
+
+        Args:
+            status_code (int): HTTP status of the response, None if the request failed.
+            latency (float): Seconds spent waiting for the response.
+        """
+        self.breaker.record(status_code)
+        if isinstance(self.rate_limiter, AdaptiveRateLimiter):
+            self.rate_limiter.record(status_code, latency)
+
+    async def get(self, url: str, follow_redirects: bool = True) -> httpx.Response:
+        """
+        Send a rate-limited GET request through the shared client. With a response cache,
+        cached pages are served from disk without a request and successful responses are stored.
+
+        Args:
+            url (str): The URL to fetch.
+            follow_redirects (bool): Whether to follow redirects for this request.
+
+        Raises:
+            CacheMiss: If the session replays from the cache and the URL is not cached.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return httpx.Response(
+                    cached.status_code,
+                    content=cached.content,
+                    request=httpx.Request("GET", cached.url),
+                )
+
+        scheduled = time.monotonic()
+        await self.breaker.wait()
+        await self.throttle()
+        started = time.monotonic()
+        self.schedule_wait += started - scheduled
+        try:
+            response = await self.client.get(
+                url,
+                follow_redirects=follow_redirects,
+                extensions={"trace": self._trace},
+            )
+        except httpx.HTTPError:
+            self.network_time += time.monotonic() - started
+            self.feedback(None, time.monotonic() - started)
+            raise
+        latency = time.monotonic() - started
+        self.network_time += latency
+        self.feedback(response.status_code, latency)
+
+        if self.cache is not None and response.status_code == 200:
+            final_url = str(response.url)
+            self.cache.put(url, response.status_code, final_url, response.content)
+            if final_url != url:
+                self.cache.put(
+                    final_url, response.status_code, final_url, response.content
+                )
+
+        return response
+
+    async def extract(self, extractor: Callable, markup):
+        """
+        Parse a raw page with the session parser backend and return what `extractor` returns.
+        With parse workers the page bytes go to the process pool and only plain records come
+        back, so the event loop keeps serving network I/O while pages are parsed.
+
+        Args:
+            extractor (Callable): Module-level function taking the parsed page.
+            markup (bytes | str): The raw page source.
+        """
+        started = time.monotonic()
+        try:
+            if self.executor is None:
+                return parse_and_extract(extractor, markup, self.parser_backend)
+
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, parse_and_extract, extractor, markup, self.parser_backend
+            )
+        finally:
+            self.parse_time += time.monotonic() - started
+            self.pages_parsed += 1
+
+    @property
+    def connections_reused(self) -> int:
+        """Number of requests sent over an already open connection."""
+        return max(self.requests_sent - self.connections_opened, 0)
+
+    def stats(self) -> Dict:
+        """Return the connection-reuse counters and the scheduler, network and parse timings."""
+        stats = {
+            "requests_sent": self.requests_sent,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "tls_handshakes": self.tls_handshakes,
+            "request_rate": round(self.rate_limiter.rate, 3),
+            "schedule_wait_s": round(self.schedule_wait, 1),
+            "network_s": round(self.network_time, 1),
+            "parse_s": round(self.parse_time, 1),
+            "pages_parsed": self.pages_parsed,
+        }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    async def aclose(self) -> None:
+        """Close every pooled connection and parse worker, then log the connection-reuse counters."""
+        await self.client.aclose()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        log.info("Closed scrape session: {}", self.stats())
+
+    async def __aenter__(self) -> "ScrapeSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+async def fetch_html(
+    session: ScrapeSession, url: str, follow_redirects: bool = True
+) -> Optional[bytes]:
+    """
+    Fetch a URL and return the raw page source, to be parsed with `session.extract`.
 
     Args:
-        client (httpx.AsyncClient): async client create with httpx
+        session (ScrapeSession): run-scoped session holding the shared httpx client
         url (str): The URL to fetch.
+        follow_redirects (bool): Whether to follow redirects.
 
     Returns:
-        Optional[BeautifulSoup]: The parsed page source, or None if the fetch fails.
+        Optional[bytes]: The raw page source, or None if the request fails.
+
+    Raises:
+        LocationNotFound: If the page does not exist anymore.
+        Blocked: If TripAdvisor answers 403.
+        httpx.HTTPStatusError: On any other status outside 2xx, so the retry policy can tell
+                               permanent from transient errors.
+        CircuitOpen: If the run stopped after repeated blocking.
+        CacheMiss: If the session replays from the cache and the page is not cached.
     """
 
     try:
-        response = await client.get(url)
-        assert response.status_code != 403, "Blocked by TripAdvisor"
+        response = await session.get(url, follow_redirects=follow_redirects)
+        if response.status_code == 403:
+            raise Blocked(f"Blocked by TripAdvisor: {url}")
+        if response.status_code == 404:
+            raise LocationNotFound(f"Page not found: {url}")
         response.raise_for_status()
-        response.encoding = "utf-8"
-        return BeautifulSoup(response.text, "html.parser")
+        return response.content
+    except (LocationNotFound, Blocked, CircuitOpen, CacheMiss, httpx.HTTPStatusError):
+        raise
     except Exception as e:
         log.error(f"Unexpected err fetching URL: {url} | Error: {e}")
+
+
+async def fetch_html_with_retry(
+    session: ScrapeSession, url: str, follow_redirects: bool = True
+) -> bytes:
+    """
+    Fetch a URL with the session retry policy and return the raw page source.
+
+    Args:
+        session (ScrapeSession): run-scoped session holding the shared httpx client
+        url (str): The URL to fetch.
+        follow_redirects (bool): Whether to follow redirects.
+
+    Raises:
+        FetchError: If the request kept failing within the retry policy.
+        httpx.HTTPStatusError: If the page kept answering a transient status, or answered
+                               a permanent one, raised without a retry.
+    """
+
+    async def _attempt() -> bytes:
+        content = await fetch_html(session, url, follow_redirects)
+        if content is None:
+            raise FetchError(f"Failed to fetch: {url}")
+        return content
+
+    return await session.retry_policy.run(_attempt, name=f"fetch {url}")
+
+
+async def prefetch_html(
+    session: ScrapeSession,
+    urls: List[str],
+    follow_redirects: bool = True,
+    prefetch_pages: Optional[int] = None,
+) -> AsyncIterator[Tuple[str, bytes]]:
+    """
+    Fetch pages ahead of the consumer and yield `(url, content)` pairs in the order of `urls`.
+    Up to `prefetch_pages` pages are in flight at once; requests still draw from the
+    session rate limiter and failed pages are retried with the session retry policy.
+    Pages not consumed yet are cancelled when the generator is closed.
+
+    Args:
+        session (ScrapeSession): run-scoped session holding the shared httpx client
+        urls (List[str]): The URLs to fetch, in the order they should be yielded.
+        follow_redirects (bool): Whether to follow redirects.
+        prefetch_pages (int): Pages in flight at once. Default: `session.prefetch_pages`.
+    """
+    window = max(prefetch_pages or session.prefetch_pages, 1)
+    pending = {}
+
+    def _schedule(index):
+        if index < len(urls) and index not in pending:
+            pending[index] = asyncio.create_task(
+                fetch_html_with_retry(session, urls[index], follow_redirects)
+            )
+
+    try:
+        for index, url in enumerate(urls):
+            for ahead in range(index, index + window):
+                _schedule(ahead)
+            yield url, await pending.pop(index)
     finally:
-        await asyncio.sleep(SCRAPE_DELAY / 2)
+        for task in pending.values():
+            task.cancel()
+        await asyncio.gather(*pending.values(), return_exceptions=True)
 
 
-def normalize_text(text):
-    """Normalize a string value.
+def normalize_text_array(values: pa.Array) -> pa.Array:
+    """Normalize a string column, only its non-ASCII values go through NFKC.
 
     Args:
-        text (str): The string to normalize.
+        values (pa.Array): The strings to normalize, nulls are kept.
+    """
+    non_ascii = pc.invert(pc.fill_null(pc.string_is_ascii(values), True))
+    if not pc.any(non_ascii).as_py():
+        return values
+
+    return pc.replace_with_mask(
+        values, non_ascii, pc.utf8_normalize(pc.filter(values, non_ascii), "NFKC")
+    )
+
+
+def normalize_float_array(values: pa.Array) -> pa.Array:
+    """Parse the number leading each string of a column, null where there is none.
+
+    Args:
+        values (pa.Array): The strings to parse, e.g. "4.5 of 5 bubbles".
+    """
+    number = pc.struct_field(
+        pc.extract_regex(values, r"^\s*#?(?P<number>[0-9][0-9,]*(?:\.[0-9]+)?)"),
+        "number",
+    )
+    return pc.cast(pc.replace_substring(number, ",", ""), pa.float64())
+
+
+def normalize_date_array(values: pa.Array, date_format: str = "%B %d, %Y") -> pa.Array:
+    """Parse the date found in each string of a column, null where there is none.
+
+    Args:
+        values (pa.Array): The strings to parse, e.g. "Written January 5, 2024".
+        date_format (str): strptime format of the date. Default: "%B %d, %Y".
     """
-    return unicodedata.normalize("NFKC", text) if text else ""
+    date_text = pc.struct_field(
+        pc.extract_regex(values, r"(?P<date>[A-Z][a-z]+ \d{1,2}, \d{4})"), "date"
+    )
+    return pc.cast(
+        pc.strptime(date_text, format=date_format, unit="s", error_is_null=True),
+        pa.date32(),
+    )
 
 
 def normalize_int(text: str) -> int: